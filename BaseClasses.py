@@ -5,6 +5,7 @@ import functools
 import logging
 import random
 import secrets
+import threading
 import warnings
 from argparse import Namespace
 from collections import Counter, deque, defaultdict
@@ -87,6 +88,8 @@ class MultiWorld():
     progression_balancing: Dict[int, Options.ProgressionBalancing]
     completion_condition: Dict[int, Callable[[CollectionState], bool]]
     indirect_connections: Dict[Region, Set[Entrance]]
+    item_indexes: Dict[int, ItemIndex]
+    """item name interning for the ItemCounters of each player's CollectionState.prog_items"""
     exclude_locations: Dict[int, Options.ExcludeLocations]
     priority_locations: Dict[int, Options.PriorityLocations]
     start_inventory: Dict[int, Options.StartInventory]
@@ -166,8 +169,11 @@ class MultiWorld():
         self.early_items = {player: {} for player in self.player_ids}
         self.local_early_items = {player: {} for player in self.player_ids}
         self.indirect_connections = {}
+        self.item_indexes = {}
         self.start_inventory_from_pool: Dict[int, Options.StartInventoryPool] = {}
         self.plando_item_blocks = {}
+        self._sphere_search: Optional[Tuple[Tuple[Any, ...], Tuple[SphereSearch, bool]]] = None
+        self._sphere_search_lock = threading.Lock()
 
         for player in range(1, players + 1):
             def set_player_attr(attr: str, val) -> None:
@@ -589,24 +595,11 @@ class MultiWorld():
         locations is followed by an empty set, and then a set of all of the
         unreachable locations.
         """
-        state = CollectionState(self)
-        locations = set(self.get_filled_locations())
-
-        while locations:
-            sphere: Set[Location] = set()
-
-            for location in locations:
-                if location.can_reach(state):
-                    sphere.add(location)
-            yield sphere
-            if not sphere:
-                if locations:
-                    yield locations  # unreachable locations
-                break
-
-            for location in sphere:
-                state.collect(location.item, True, location)
-            locations -= sphere
+        search = SphereSearch(CollectionState(self), self.get_filled_locations())
+        yield from search
+        if search.remaining:
+            yield set()
+            yield search.remaining  # unreachable locations
 
     def get_sendable_spheres(self) -> Iterator[Set[Location]]:
         """
@@ -615,46 +608,51 @@ class MultiWorld():
         If there are unreachable locations, the last sphere of reachable locations is followed by an empty set,
         and then a set of all of the unreachable locations.
         """
-        state = CollectionState(self)
-        locations: Set[Location] = set()
-        events: Set[Location] = set()
-        for location in self.get_filled_locations():
-            if type(location.item.code) is int and type(location.address) is int:
-                locations.add(location)
-            else:
-                events.add(location)
-
-        while locations:
-            sphere: Set[Location] = set()
-
-            # cull events out
-            done_events: Set[Union[Location, None]] = {None}
-            while done_events:
-                done_events = set()
-                for event in events:
-                    if event.can_reach(state):
-                        state.collect(event.item, True, event)
-                        done_events.add(event)
-                events -= done_events
-
-            for location in locations:
-                if location.can_reach(state):
-                    sphere.add(location)
-
-            yield sphere
+        search, _ = self._get_sendable_sphere_search()
+        locations = {location for location in self.get_filled_locations()
+                     if type(location.item.code) is int and type(location.address) is int}
+        for sphere in search.spheres:
+            if not locations:
+                return
+            sphere = {location for location in sphere if location in locations}
             if not sphere:
-                if locations:
-                    yield locations  # unreachable locations
                 break
-
-            for location in sphere:
-                state.collect(location.item, True, location)
+            yield sphere
             locations -= sphere
+        if locations:
+            yield set()
+            yield locations  # unreachable locations
+
+    def _get_sendable_sphere_search(self) -> Tuple[SphereSearch, bool]:
+        """
+        Returns a finished search of the sendable locations' spheres, that also tests all empty locations, and whether
+        its final state has beaten the game. The search is shared by get_sendable_spheres and fulfills_accessibility,
+        until the items placed in the multiworld change.
+        """
+        placements = (tuple(location.item for location in self.get_locations()),
+                      tuple(len(items) for items in self.precollected_items.values()))
+        with self._sphere_search_lock:
+            if self._sphere_search and self._sphere_search[0] == placements:
+                return self._sphere_search[1]
+            locations: List[Location] = []
+            events: List[Location] = []
+            for location in self.get_locations():
+                if not location.item or type(location.item.code) is int and type(location.address) is int:
+                    locations.append(location)
+                else:
+                    events.append(location)
+            search = SphereSearch(CollectionState(self), locations, events)
+            for _ in search:
+                pass
+            result = search, self.has_beaten_game(search.state)
+            self._sphere_search = placements, result
+            return result
 
     def fulfills_accessibility(self, state: Optional[CollectionState] = None):
-        """Check if accessibility rules are fulfilled with current or supplied state."""
-        if not state:
-            state = CollectionState(self)
+        """
+        Check if accessibility rules are fulfilled with current or supplied state.
+        Without a state, the spheres of get_sendable_spheres are reused.
+        """
         players: Dict[str, Set[int]] = {
             "minimal": set(),
             "items": set(),
@@ -663,8 +661,6 @@ class MultiWorld():
         for player, world in self.worlds.items():
             players[world.options.accessibility.current_key].add(player)
 
-        beatable_fulfilled = False
-
         def location_condition(location: Location) -> bool:
             """Determine if this location has to be accessible, location is already filtered by location_relevant"""
             return location.player in players["full"] or \
@@ -674,85 +670,468 @@ class MultiWorld():
             """Determine if this location is relevant to sweep."""
             return location.player in players["full"] or location.advancement
 
-        def all_done() -> bool:
-            """Check if all access rules are fulfilled"""
-            if not beatable_fulfilled:
-                return False
-            if any(location_condition(location) for location in locations):
-                return False  # still locations required to be collected
+        if state:
+            search = SphereSearch(state, [location for location in self.get_locations() if location_relevant(location)])
+            for _ in search:
+                pass
+            beatable_fulfilled = self.has_beaten_game(state)
+            locations = search.remaining
+        else:
+            search, beatable_fulfilled = self._get_sendable_sphere_search()
+            locations = {location for location in search.remaining | search.remaining_events
+                         if location_relevant(location)}
+
+        if beatable_fulfilled and not any(location_condition(location) for location in locations):
             return True
+        if locations:
+            if __debug__:
+                from Fill import FillError
+                raise FillError(
+                    f"Could not access required locations for accessibility check. Missing: {locations}",
+                    multiworld=self,
+                )
+            # ran out of places and did not finish yet, quit
+            logging.warning(f"Could not access required locations for accessibility check."
+                            f" Missing: {locations}")
+        return False
 
-        locations = [location for location in self.get_locations() if location_relevant(location)]
 
-        while locations:
-            sphere: List[Location] = []
-            for n in range(len(locations) - 1, -1, -1):
-                if locations[n].can_reach(state):
-                    sphere.append(locations.pop(n))
+PathValue = Tuple[str, Optional["PathValue"]]
 
-            if not sphere:
-                if __debug__:
-                    from Fill import FillError
-                    raise FillError(
-                        f"Could not access required locations for accessibility check. Missing: {locations}",
-                        multiworld=self,
-                    )
-                # ran out of places and did not finish yet, quit
-                logging.warning(f"Could not access required locations for accessibility check."
-                                f" Missing: {locations}")
-                return False
 
-            for location in sphere:
-                if location.item:
-                    state.collect(location.item, True, location)
+class CopyOnAccessDict(dict):
+    """
+    Per-player dict of containers that can be shared between CollectionStates. A player's container is copied from the
+    shared ones the first time it is looked up, so a copied state only pays for the players it actually uses.
+    Any lookup hands out a private container, so it can be mutated freely.
+    """
+    __slots__ = ("shared", "copy_value")
+
+    shared: Dict[int, Any]
+    copy_value: Optional[Callable[[Any], Any]]
+
+    def __init__(self, values: Mapping[int, Any], copy_value: Optional[Callable[[Any], Any]] = None) -> None:
+        super().__init__(values)
+        self.shared = {}
+        self.copy_value = copy_value
+
+    def __missing__(self, key: int) -> Any:
+        value = self.shared[key]
+        value = self.copy_value(value) if self.copy_value else value.copy()
+        dict.__setitem__(self, key, value)
+        return value
+
+    def share(self) -> CopyOnAccessDict:
+        """Hands all containers over to the shared pool and returns a new dict that shares them with this one."""
+        if dict.__len__(self):
+            # only the owned containers, going through keys() would copy all shared ones first
+            self.shared = {**self.shared, **dict(dict.items(self))}
+            dict.clear(self)
+        ret = CopyOnAccessDict((), self.copy_value)
+        ret.shared = self.shared
+        return ret
 
-            if self.has_beaten_game(state):
-                beatable_fulfilled = True
+    def materialize(self) -> None:
+        for key in self.shared:
+            if not dict.__contains__(self, key):
+                self.__missing__(key)
 
-            if all_done():
-                return True
+    def __contains__(self, key: object) -> bool:
+        return dict.__contains__(self, key) or key in self.shared
+
+    def get(self, key: int, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def __iter__(self) -> Iterator[int]:
+        self.materialize()
+        return dict.__iter__(self)
+
+    def __len__(self) -> int:
+        self.materialize()
+        return dict.__len__(self)
+
+    def __eq__(self, other: object) -> bool:
+        self.materialize()
+        return dict.__eq__(self, other)
+
+    def __repr__(self) -> str:
+        self.materialize()
+        return dict.__repr__(self)
+
+    def keys(self):
+        self.materialize()
+        return dict.keys(self)
+
+    def values(self):
+        self.materialize()
+        return dict.values(self)
+
+    def items(self):
+        self.materialize()
+        return dict.items(self)
+
+    def copy(self) -> Dict[int, Any]:
+        self.materialize()
+        return dict.copy(self)
+
+
+class CopyOnWriteDict(dict):
+    """
+    Per-player dict of containers that can be shared between CollectionStates. Lookups return the container as is, so
+    reading never copies. Code mutating a player's container has to fetch it through own() first, which copies it if
+    it is still shared. Assigning a new container is always fine.
+    """
+    __slots__ = ("borrowed",)
+
+    borrowed: Set[int]
+
+    def __init__(self, values: Mapping[int, Any]) -> None:
+        super().__init__(values)
+        self.borrowed = set()
+
+    def own(self, key: int) -> Any:
+        """Returns the container for key, copying it first if it is shared with another state."""
+        if key in self.borrowed:
+            self.borrowed.remove(key)
+            value = self[key].copy()
+            dict.__setitem__(self, key, value)
+            return value
+        return self[key]
+
+    def share(self) -> CopyOnWriteDict:
+        """Marks all containers as shared and returns a new dict that shares them with this one."""
+        self.borrowed = set(dict.keys(self))
+        ret = CopyOnWriteDict(self)
+        ret.borrowed = set(self.borrowed)
+        return ret
+
+    def __setitem__(self, key: int, value: Any) -> None:
+        self.borrowed.discard(key)
+        dict.__setitem__(self, key, value)
+
+
+class LayeredDict(dict):
+    """
+    dict that falls back to a chain of older layers shared with other CollectionStates. New entries always go into the
+    dict itself; sharing freezes them into a new layer, so copying only costs the entries added since the last copy.
+    """
+    __slots__ = ("layers",)
+
+    max_layers: ClassVar[int] = 8
+    """chains of layers longer than this get flattened into a single layer when shared"""
+
+    layers: Tuple[Dict[Any, Any], ...]
+
+    def __init__(self, values: Mapping[Any, Any] = (), layers: Tuple[Dict[Any, Any], ...] = ()) -> None:
+        super().__init__(values)
+        self.layers = layers
+
+    def __missing__(self, key: Any) -> Any:
+        for layer in reversed(self.layers):
+            if key in layer:
+                return layer[key]
+        raise KeyError(key)
 
+    def __contains__(self, key: object) -> bool:
+        if dict.__contains__(self, key):
+            return True
+        for layer in self.layers:
+            if key in layer:
+                return True
         return False
 
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self[key] if key in self else default
+
+    def flatten(self) -> Dict[Any, Any]:
+        flat: Dict[Any, Any] = {}
+        for layer in self.layers:
+            flat.update(layer)
+        flat.update(dict.items(self))
+        return flat
+
+    def share(self) -> LayeredDict:
+        """Freezes all entries into a layer shared by this dict and the returned new one."""
+        if dict.__len__(self):
+            if len(self.layers) >= self.max_layers:
+                self.layers = (self.flatten(),)
+            else:
+                # only the entries of this dict, dict(self) would flatten all layers into the new one
+                self.layers = (*self.layers, dict(dict.items(self)))
+            dict.clear(self)
+        return LayeredDict((), self.layers)
 
-PathValue = Tuple[str, Optional["PathValue"]]
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.flatten())
+
+    def __len__(self) -> int:
+        return len(self.flatten())
+
+    def __eq__(self, other: object) -> bool:
+        return self.flatten() == other
+
+    def __repr__(self) -> str:
+        return repr(self.flatten())
+
+    def keys(self):
+        return self.flatten().keys()
+
+    def values(self):
+        return self.flatten().values()
+
+    def items(self):
+        return self.flatten().items()
+
+    def copy(self) -> Dict[Any, Any]:
+        return self.flatten()
+
+
+class ItemIndex:
+    """
+    Interns a player's item names to bits, shared by the ItemCounters of all CollectionStates of a multiworld.
+    Names get a bit the first time they are counted, so the bits stay as few as the names that ever get collected.
+    New bits are assigned under a lock, as states of the same multiworld may collect items from several threads.
+    """
+    __slots__ = ("bits", "names", "group_masks", "lock")
+
+    bits: Dict[str, int]
+    names: List[str]
+    """item names by bit position"""
+    group_masks: Dict[str, Tuple[AbstractSet[str], int]]
+    """item name group -> names in the group and the mask of their bits"""
+    lock: threading.Lock
+    """guards assigning bits and updating group_masks"""
+
+    def __init__(self) -> None:
+        self.bits = {}
+        self.names = []
+        self.group_masks = {}
+        self.lock = threading.Lock()
+
+    def __getstate__(self) -> Tuple[Dict[str, int], List[str], Dict[str, Tuple[AbstractSet[str], int]]]:
+        return self.bits, self.names, self.group_masks
+
+    def __setstate__(self, state: Tuple[Dict[str, int], List[str], Dict[str, Tuple[AbstractSet[str], int]]]) -> None:
+        self.bits, self.names, self.group_masks = state
+        self.lock = threading.Lock()
+
+    def bit(self, item: str) -> int:
+        bit = self.bits.get(item)
+        if bit is None:
+            with self.lock:
+                bit = self.bits.get(item)
+                if bit is None:
+                    bit = 1 << len(self.names)
+                    self.names.append(item)
+                    for group, (names, mask) in self.group_masks.items():
+                        if item in names:
+                            self.group_masks[group] = names, mask | bit
+                    # published last, so a thread that sees the bit also sees its name and group masks
+                    self.bits[item] = bit
+        return bit
+
+    def group_mask(self, group: str, names: AbstractSet[str]) -> int:
+        """Returns the mask of all bits of item names in group, with names being the item names of group."""
+        cached = self.group_masks.get(group)
+        if cached is not None and cached[0] is names:
+            return cached[1]
+        with self.lock:
+            mask = 0
+            for item, bit in self.bits.items():
+                if item in names:
+                    mask |= bit
+            self.group_masks[group] = names, mask
+        return mask
+
+    def iter_names(self, mask: int) -> Iterator[str]:
+        """Yields the item names of all bits set in mask."""
+        names = self.names
+        while mask:
+            lowest = mask & -mask
+            yield names[lowest.bit_length() - 1]
+            mask ^= lowest
+
+
+class ItemCounter(Counter):
+    """
+    Counter of a player's items in a CollectionState, that also tracks which items have a count above 0 as a bitmask,
+    so item group checks don't have to look up every item name of the group.
+    """
+    __slots__ = ("index", "mask")
+
+    index: ItemIndex
+    mask: int
+    """bits, according to index, of items with a count above 0"""
+
+    def __init__(self, index: ItemIndex, iterable: Any = None, /, **kwargs: int) -> None:
+        self.index = index
+        self.mask = 0
+        super().__init__(iterable, **kwargs)
+
+    def _update_mask(self) -> None:
+        bit = self.index.bit
+        mask = 0
+        for item, count in dict.items(self):
+            if count > 0:
+                mask |= bit(item)
+        self.mask = mask
+
+    def __setitem__(self, item: str, count: int) -> None:
+        dict.__setitem__(self, item, count)
+        bit = self.index.bits.get(item) or self.index.bit(item)
+        if count > 0:
+            self.mask |= bit
+        else:
+            self.mask &= ~bit
+
+    def __delitem__(self, item: str) -> None:
+        # like Counter, ignores missing items
+        if item in self:
+            dict.__delitem__(self, item)
+            self.mask &= ~self.index.bit(item)
+
+    def update(self, iterable: Any = None, /, **kwargs: int) -> None:
+        super().update(iterable, **kwargs)
+        self._update_mask()
+
+    def pop(self, item: str, *default: Any) -> Any:
+        ret = dict.pop(self, item, *default)
+        self._update_mask()
+        return ret
+
+    def popitem(self) -> Tuple[str, int]:
+        ret = dict.popitem(self)
+        self._update_mask()
+        return ret
+
+    def setdefault(self, item: str, default: int = 0) -> int:
+        if item not in self:
+            self[item] = default
+        return self[item]
+
+    def clear(self) -> None:
+        dict.clear(self)
+        self.mask = 0
+
+    def copy(self) -> ItemCounter:
+        ret = ItemCounter(self.index)
+        dict.update(ret, self)
+        ret.mask = self.mask
+        return ret
+
+    __copy__ = copy
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return self.__class__, (self.index, dict(self))
+
+
+class ItemReadRecorder:
+    """
+    Stands in for a player's `prog_items` Counter while an entrance rule is evaluated in incremental reachability mode,
+    recording which item names the rule looked at. Any access that can't be attributed to single item names, such as
+    iterating the counter, marks the rule as depending on everything.
+    """
+    __slots__ = ("counter", "reads", "read_all")
+
+    counter: Counter[str]
+    reads: Set[str]
+    read_all: bool
+
+    def __init__(self, counter: Counter[str]) -> None:
+        self.counter = counter
+        self.reads = set()
+        self.read_all = False
+
+    def __getitem__(self, item: str) -> int:
+        self.reads.add(item)
+        return self.counter[item]
+
+    def __contains__(self, item: object) -> bool:
+        self.reads.add(item)
+        return item in self.counter
+
+    def get(self, item: str, default: Any = None) -> Any:
+        self.reads.add(item)
+        return self.counter.get(item, default)
+
+    def __iter__(self) -> Iterator[str]:
+        self.read_all = True
+        return iter(self.counter)
+
+    def __len__(self) -> int:
+        self.read_all = True
+        return len(self.counter)
+
+    def __getattr__(self, name: str) -> Any:
+        # keys(), items(), values(), total(), ... all depend on the whole counter
+        self.read_all = True
+        return getattr(self.counter, name)
 
 
 class CollectionState():
     prog_items: Dict[int, Counter[str]]
+    """an ItemCounter per player, plain Counters assigned from outside keep working but skip the item group bitmasks"""
     multiworld: MultiWorld
     reachable_regions: Dict[int, Set[Region]]
+    """copy on write, use reachable_regions.own(player) before mutating a player's set"""
     blocked_connections: Dict[int, Set[Entrance]]
+    """copy on write, use blocked_connections.own(player) before mutating a player's set"""
     advancements: Set[Location]
     path: Dict[Union[Region, Entrance], PathValue]
     locations_checked: Set[Location]
     stale: Dict[int, bool]
     allow_partial_entrances: bool
+    changed_items: Dict[int, Set[str]]
+    """item names added to each player's prog_items since their regions were last updated"""
+    dependent_entrances: Dict[int, Dict[str, Set[Entrance]]]
+    """for incremental reachability, item name -> blocked entrances whose access rule read that item name"""
+    retest_entrances: Dict[int, Set[Entrance]]
+    """for incremental reachability, blocked entrances that have to be tested on every update"""
     additional_init_functions: List[Callable[[CollectionState, MultiWorld], None]] = []
     additional_copy_functions: List[Callable[[CollectionState, CollectionState], CollectionState]] = []
 
     def __init__(self, parent: MultiWorld, allow_partial_entrances: bool = False):
         assert parent.worlds, "CollectionState created without worlds initialized in parent"
-        self.prog_items = {player: Counter() for player in parent.get_all_ids()}
+        item_indexes = parent.item_indexes
+        self.prog_items = CopyOnAccessDict({player: ItemCounter(item_indexes.setdefault(player, ItemIndex()))
+                                            for player in parent.get_all_ids()})
         self.multiworld = parent
-        self.reachable_regions = {player: set() for player in parent.get_all_ids()}
-        self.blocked_connections = {player: set() for player in parent.get_all_ids()}
+        self.reachable_regions = CopyOnWriteDict({player: set() for player in parent.get_all_ids()})
+        self.blocked_connections = CopyOnWriteDict({player: set() for player in parent.get_all_ids()})
         self.advancements = set()
-        self.path = {}
+        self.path = LayeredDict()
         self.locations_checked = set()
         self.stale = {player: True for player in parent.get_all_ids()}
         self.allow_partial_entrances = allow_partial_entrances
+        self.changed_items = CopyOnAccessDict({player: set() for player in parent.get_all_ids()})
+        self.dependent_entrances = CopyOnAccessDict({player: {} for player in parent.get_all_ids()},
+                                                    self._copy_dependent_entrances)
+        self.retest_entrances = CopyOnAccessDict({player: set() for player in parent.get_all_ids()})
         for function in self.additional_init_functions:
             function(self, parent)
         for items in parent.precollected_items.values():
             for item in items:
                 self.collect(item, True)
 
-    def update_reachable_regions(self, player: int):
+    def update_reachable_regions(self, player: int, connections: Optional[Iterable[Entrance]] = None):
+        """
+        Updates the reachable regions and blocked connections of player.
+
+        :param connections: Only search onward from these connections, instead of all blocked ones. Only valid if they
+         are the only thing that may have changed since the last update, like entrances that were just connected.
+        """
         self.stale[player] = False
         world: AutoWorld.World = self.multiworld.worlds[player]
-        reachable_regions = self.reachable_regions[player]
-        queue = deque(self.blocked_connections[player])
+        reachable_regions = self.reachable_regions.own(player)
+        blocked_connections = self.blocked_connections.own(player)
+        incremental = world.incremental_reachability and world.explicit_indirect_conditions
+        if connections is not None:
+            queue = deque(connection for connection in connections if connection in blocked_connections)
+        elif incremental:
+            queue = self._get_incremental_queue(player)
+        else:
+            queue = deque(self.blocked_connections[player])
+            self.changed_items[player].clear()
         start: Region = world.get_region(world.origin_region_name)
 
         # init on first call - this can't be done on construction since the regions don't exist yet
@@ -761,11 +1140,75 @@ class CollectionState():
             self.blocked_connections[player].update(start.exits)
             queue.extend(start.exits)
 
-        if world.explicit_indirect_conditions:
+        if incremental:
+            self._update_reachable_regions_incremental(player, queue)
+        elif world.explicit_indirect_conditions:
             self._update_reachable_regions_explicit_indirect_conditions(player, queue)
         else:
             self._update_reachable_regions_auto_indirect_conditions(player, queue)
 
+    def _get_incremental_queue(self, player: int) -> deque:
+        """Collect the blocked connections whose access rules may have changed outcome since the last update."""
+        changed_items = self.changed_items[player]
+        dependent_entrances = self.dependent_entrances[player]
+        retest = self.retest_entrances[player]
+        self.retest_entrances[player] = set()
+        for item_name in changed_items:
+            entrances = dependent_entrances.pop(item_name, None)
+            if entrances:
+                retest |= entrances
+        changed_items.clear()
+        if not retest:
+            return deque()
+        # keep the order of a full re-scan, so the resulting path is identical to non-incremental mode
+        return deque(connection for connection in self.blocked_connections[player] if connection in retest)
+
+    def _update_reachable_regions_incremental(self, player: int, queue: deque):
+        reachable_regions = self.reachable_regions[player]
+        blocked_connections = self.blocked_connections[player]
+        dependent_entrances = self.dependent_entrances[player]
+        retest_entrances = self.retest_entrances[player]
+        prog_items = self.prog_items[player]
+        recorder = ItemReadRecorder(prog_items)
+        # run BFS on the connections that could have changed, and remember which items blocked connections depend on
+        while queue:
+            connection = queue.popleft()
+            new_region = connection.connected_region
+            if new_region in reachable_regions:
+                blocked_connections.remove(connection)
+                continue
+            reads = recorder.reads = set()
+            recorder.read_all = False
+            self.prog_items[player] = recorder
+            try:
+                reached = connection.can_reach(self)
+            finally:
+                self.prog_items[player] = prog_items
+            if reached:
+                if self.allow_partial_entrances and not new_region:
+                    retest_entrances.add(connection)
+                    continue
+                assert new_region, f"tried to search through an Entrance \"{connection}\" with no connected Region"
+                reachable_regions.add(new_region)
+                blocked_connections.remove(connection)
+                blocked_connections.update(new_region.exits)
+                queue.extend(new_region.exits)
+                self.path[new_region] = (new_region.name, self.path.get(connection, None))
+
+                # Retry connections if the new region can unblock them
+                for new_entrance in self.multiworld.indirect_connections.get(new_region, set()):
+                    if new_entrance in blocked_connections and new_entrance not in queue:
+                        queue.append(new_entrance)
+            elif recorder.read_all:
+                retest_entrances.add(connection)
+            else:
+                for item_name in reads:
+                    entrances = dependent_entrances.get(item_name)
+                    if entrances is None:
+                        dependent_entrances[item_name] = {connection}
+                    else:
+                        entrances.add(connection)
+
     def _update_reachable_regions_explicit_indirect_conditions(self, player: int, queue: deque):
         reachable_regions = self.reachable_regions[player]
         blocked_connections = self.blocked_connections[player]
@@ -816,20 +1259,42 @@ class CollectionState():
             queue.extend(blocked_connections)
 
     def copy(self) -> CollectionState:
-        ret = CollectionState(self.multiworld)
-        ret.prog_items = {player: counter.copy() for player, counter in self.prog_items.items()}
-        ret.reachable_regions = {player: region_set.copy() for player, region_set in
-                                 self.reachable_regions.items()}
-        ret.blocked_connections = {player: entrance_set.copy() for player, entrance_set in
-                                   self.blocked_connections.items()}
+        """
+        Creates a copy of this state. Per-player containers and the path are shared between both states until one of
+        them needs its own version, see CopyOnAccessDict, CopyOnWriteDict and LayeredDict.
+        """
+        multiworld = self.multiworld
+        ret = CollectionState.__new__(CollectionState)
+        ret.multiworld = multiworld
+        ret.prog_items = self._share("prog_items", CopyOnAccessDict)
+        ret.reachable_regions = self._share("reachable_regions", CopyOnWriteDict)
+        ret.blocked_connections = self._share("blocked_connections", CopyOnWriteDict)
         ret.advancements = self.advancements.copy()
-        ret.path = self.path.copy()
+        ret.path = self._share("path", LayeredDict)
         ret.locations_checked = self.locations_checked.copy()
+        ret.stale = self.stale.copy()
         ret.allow_partial_entrances = self.allow_partial_entrances
+        ret.changed_items = self._share("changed_items", CopyOnAccessDict)
+        ret.dependent_entrances = self._share("dependent_entrances", CopyOnAccessDict)
+        ret.retest_entrances = self._share("retest_entrances", CopyOnAccessDict)
+        for function in self.additional_init_functions:
+            function(ret, multiworld)
         for function in self.additional_copy_functions:
             ret = function(self, ret)
         return ret
 
+    @staticmethod
+    def _copy_dependent_entrances(dependents: Dict[str, Set[Entrance]]) -> Dict[str, Set[Entrance]]:
+        return {item_name: entrances.copy() for item_name, entrances in dependents.items()}
+
+    def _share(self, attribute: str, container_type: type) -> Any:
+        container = getattr(self, attribute)
+        if not isinstance(container, container_type):
+            # replaced from outside, e.g. by tests
+            container = container_type(container)
+            setattr(self, attribute, container)
+        return container.share()
+
     def can_reach(self,
                   spot: Union[Location, Entrance, Region, str],
                   resolution_hint: Optional[str] = None,
@@ -989,53 +1454,54 @@ class CollectionState():
             return None
 
     # item name related
+    # prog_items are looked up with get() instead of [], as Counter.__missing__ makes misses a lot slower
     def has(self, item: str, player: int, count: int = 1) -> bool:
-        return self.prog_items[player][item] >= count
+        return self.prog_items[player].get(item, 0) >= count
 
     # for loops are specifically used in all/any/count methods, instead of all()/any()/sum(), to avoid the overhead of
     # creating and iterating generator instances. In `return all(player_prog_items[item] for item in items)`, the
     # argument to all() would be a new generator instance, for example.
     def has_all(self, items: Iterable[str], player: int) -> bool:
         """Returns True if each item name of items is in state at least once."""
-        player_prog_items = self.prog_items[player]
+        get = self.prog_items[player].get
         for item in items:
-            if not player_prog_items[item]:
+            if not get(item, 0):
                 return False
         return True
 
     def has_any(self, items: Iterable[str], player: int) -> bool:
         """Returns True if at least one item name of items is in state at least once."""
-        player_prog_items = self.prog_items[player]
+        get = self.prog_items[player].get
         for item in items:
-            if player_prog_items[item]:
+            if get(item, 0):
                 return True
         return False
 
     def has_all_counts(self, item_counts: Mapping[str, int], player: int) -> bool:
         """Returns True if each item name is in the state at least as many times as specified."""
-        player_prog_items = self.prog_items[player]
+        get = self.prog_items[player].get
         for item, count in item_counts.items():
-            if player_prog_items[item] < count:
+            if get(item, 0) < count:
                 return False
         return True
 
     def has_any_count(self, item_counts: Mapping[str, int], player: int) -> bool:
         """Returns True if at least one item name is in the state at least as many times as specified."""
-        player_prog_items = self.prog_items[player]
+        get = self.prog_items[player].get
         for item, count in item_counts.items():
-            if player_prog_items[item] >= count:
+            if get(item, 0) >= count:
                 return True
         return False
 
     def count(self, item: str, player: int) -> int:
-        return self.prog_items[player][item]
+        return self.prog_items[player].get(item, 0)
 
     def has_from_list(self, items: Iterable[str], player: int, count: int) -> bool:
         """Returns True if the state contains at least `count` items matching any of the item names from a list."""
         found: int = 0
-        player_prog_items = self.prog_items[player]
+        get = self.prog_items[player].get
         for item_name in items:
-            found += player_prog_items[item_name]
+            found += get(item_name, 0)
             if found >= count:
                 return True
         return False
@@ -1044,35 +1510,54 @@ class CollectionState():
         """Returns True if the state contains at least `count` items matching any of the item names from a list.
         Ignores duplicates of the same item."""
         found: int = 0
-        player_prog_items = self.prog_items[player]
+        get = self.prog_items[player].get
         for item_name in items:
-            found += player_prog_items[item_name] > 0
+            found += get(item_name, 0) > 0
             if found >= count:
                 return True
         return False
 
     def count_from_list(self, items: Iterable[str], player: int) -> int:
         """Returns the cumulative count of items from a list present in state."""
-        player_prog_items = self.prog_items[player]
+        get = self.prog_items[player].get
         total = 0
         for item_name in items:
-            total += player_prog_items[item_name]
+            total += get(item_name, 0)
         return total
 
     def count_from_list_unique(self, items: Iterable[str], player: int) -> int:
         """Returns the cumulative count of items from a list present in state. Ignores duplicates of the same item."""
-        player_prog_items = self.prog_items[player]
+        get = self.prog_items[player].get
         total = 0
         for item_name in items:
-            if player_prog_items[item_name] > 0:
+            if get(item_name, 0) > 0:
                 total += 1
         return total
 
     # item name group related
+    def _group_mask(self, player_prog_items: ItemCounter, item_name_group: str, player: int) -> int:
+        """Returns the bits of items of item_name_group that player_prog_items has."""
+        names = self.multiworld.worlds[player].item_name_groups[item_name_group]
+        return player_prog_items.mask & player_prog_items.index.group_mask(item_name_group, names)
+
+    def _count_group(self, player_prog_items: ItemCounter, item_name_group: str, player: int) -> int:
+        mask = self._group_mask(player_prog_items, item_name_group, player)
+        if not mask:
+            return 0
+        get = player_prog_items.get
+        total = 0
+        for item_name in player_prog_items.index.iter_names(mask):
+            total += get(item_name)
+        return total
+
     def has_group(self, item_name_group: str, player: int, count: int = 1) -> bool:
         """Returns True if the state contains at least `count` items present in a specified item group."""
-        found: int = 0
         player_prog_items = self.prog_items[player]
+        if type(player_prog_items) is ItemCounter and count > 0:
+            if count == 1:
+                return bool(self._group_mask(player_prog_items, item_name_group, player))
+            return self._count_group(player_prog_items, item_name_group, player) >= count
+        found: int = 0
         for item_name in self.multiworld.worlds[player].item_name_groups[item_name_group]:
             found += player_prog_items[item_name]
             if found >= count:
@@ -1083,8 +1568,10 @@ class CollectionState():
         """Returns True if the state contains at least `count` items present in a specified item group.
         Ignores duplicates of the same item.
         """
-        found: int = 0
         player_prog_items = self.prog_items[player]
+        if type(player_prog_items) is ItemCounter and count > 0:
+            return self._group_mask(player_prog_items, item_name_group, player).bit_count() >= count
+        found: int = 0
         for item_name in self.multiworld.worlds[player].item_name_groups[item_name_group]:
             found += player_prog_items[item_name] > 0
             if found >= count:
@@ -1094,6 +1581,8 @@ class CollectionState():
     def count_group(self, item_name_group: str, player: int) -> int:
         """Returns the cumulative count of items from an item group present in state."""
         player_prog_items = self.prog_items[player]
+        if type(player_prog_items) is ItemCounter:
+            return self._count_group(player_prog_items, item_name_group, player)
         return sum(
             player_prog_items[item_name]
             for item_name in self.multiworld.worlds[player].item_name_groups[item_name_group]
@@ -1103,6 +1592,8 @@ class CollectionState():
         """Returns the cumulative count of items from an item group present in state.
         Ignores duplicates of the same item."""
         player_prog_items = self.prog_items[player]
+        if type(player_prog_items) is ItemCounter:
+            return self._group_mask(player_prog_items, item_name_group, player).bit_count()
         return sum(
             player_prog_items[item_name] > 0
             for item_name in self.multiworld.worlds[player].item_name_groups[item_name_group]
@@ -1132,6 +1623,7 @@ class CollectionState():
         """
         assert count > 0
         self.prog_items[player][item] += count
+        self.changed_items[player].add(item)
 
     def remove(self, item: Item):
         changed = self.multiworld.worlds[item.player].remove(self, item)
@@ -1139,6 +1631,8 @@ class CollectionState():
             # invalidate caches, nothing can be trusted anymore now
             self.reachable_regions[item.player] = set()
             self.blocked_connections[item.player] = set()
+            self.dependent_entrances[item.player] = {}
+            self.retest_entrances[item.player] = set()
             self.stale[item.player] = True
 
     def remove_item(self, item: str, player: int, count: int = 1) -> None:
@@ -1167,6 +1661,248 @@ class CollectionState():
             del (self.prog_items[player][item])
         else:
             self.prog_items[player][item] = count
+            self.changed_items[player].add(item)
+
+
+class SphereSearch:
+    """
+    Searches the logical spheres of `locations`, starting from `state`. Iterating yields each sphere after its items
+    were collected into `state`, the locations left in `remaining` afterwards are unreachable. `events` are collected
+    as soon as they are reachable, before each sphere is searched and after the last one, and are not part of any
+    sphere. Like in a sweep, they are added to the advancements of `state`.
+
+    Instead of testing every remaining location for every sphere, a location waits in its region until that region
+    becomes reachable. For worlds with incremental_reachability, a location whose access rule failed is only tested
+    again once an item name its rule read was collected or its player reached new regions. Locations of other worlds
+    are tested again whenever items were collected.
+
+    Instead of iterating, `reach` and `collect` can be used to only collect some of the items of a sphere, or to
+    collect items of locations that are not part of the search.
+    """
+    __slots__ = ("state", "remaining", "remaining_events", "spheres", "_incremental_players", "_plain_types",
+                 "_candidates", "_retest", "_rule_only", "_pending", "_dependents", "_region_dependents",
+                 "_region_counts")
+
+    state: CollectionState
+    remaining: Set[Location]
+    """locations that are not part of a sphere yet"""
+    remaining_events: Set[Location]
+    """events that were not collected yet"""
+    spheres: List[Set[Location]]
+    """the spheres yielded so far"""
+    _incremental_players: Set[int]
+    _plain_types: Dict[Tuple[type, type], bool]
+    """whether a location and region type pair uses the default can_reach of both"""
+    _candidates: Set[Location]
+    """locations to test in the next pass"""
+    _retest: Set[Location]
+    """locations to test again whenever items were collected"""
+    _rule_only: Set[Location]
+    """locations in _retest that only need their access rule tested, as their region is reachable"""
+    _pending: Dict[int, Dict[Region, List[Location]]]
+    """player -> unreachable region -> locations in it"""
+    _dependents: Dict[int, Dict[str, Set[Location]]]
+    """player -> item name -> locations whose access rule read that item name"""
+    _region_dependents: Dict[int, Set[Location]]
+    """player -> locations to test again once the player reached new regions"""
+    _region_counts: Dict[int, int]
+    """number of reachable regions of each player when its pending locations were last looked at"""
+
+    def __init__(self, state: CollectionState, locations: Iterable[Location],
+                 events: Iterable[Location] = ()) -> None:
+        self.state = state
+        self.remaining = set(locations)
+        self.remaining_events = set(events)
+        self.spheres = []
+        self._incremental_players = {player for player, world in state.multiworld.worlds.items()
+                                     if world.incremental_reachability and world.explicit_indirect_conditions}
+        self._plain_types = {}
+        self._candidates = self.remaining | self.remaining_events
+        self._retest = set()
+        self._rule_only = set()
+        self._pending = {}
+        self._dependents = {}
+        self._region_dependents = {}
+        self._region_counts = {}
+
+    def __iter__(self) -> Iterator[Set[Location]]:
+        candidates = self._candidates
+        while True:
+            while self.remaining_events:
+                # like a sweep, collect events right away, so chains of them don't need a pass each
+                tested = candidates & self.remaining_events
+                candidates -= tested
+                changed: Dict[int, Set[str]] = {}
+                for event in tested:
+                    if self._test(event):
+                        self.remaining_events.remove(event)
+                        self.state.advancements.add(event)
+                        self._collect(event, changed)
+                if not changed:
+                    break
+                self._schedule(changed)
+            if not self.remaining:
+                break
+
+            sphere = self.reach()
+            if not sphere:
+                break
+            self.collect(sphere)
+            self.spheres.append(sphere)
+            yield sphere
+
+    def reach(self, locations: Optional[Set[Location]] = None) -> Set[Location]:
+        """
+        Tests the remaining locations that may have become reachable since they were last tested, or only those of
+        them that are in `locations`. The reachable ones are removed from `remaining` and returned, without collecting
+        their items.
+        """
+        candidates = self._candidates
+        # candidates that were reached already, but were also filed under other item names, are dropped here
+        tested = candidates & self.remaining
+        if locations is not None:
+            tested &= locations
+        candidates -= tested
+        state = self.state
+        rule_only = self._rule_only
+        retest = self._retest
+        reached = set()
+        for location in tested:
+            # the common case of _test, inlined as it runs for every location that failed its access rule before
+            if location in rule_only:
+                if location.access_rule(state):
+                    reached.add(location)
+                else:
+                    retest.add(location)
+            elif self._test(location):
+                reached.add(location)
+        self.remaining -= reached
+        return reached
+
+    def collect(self, locations: Iterable[Location]) -> None:
+        """Collects the items of `locations` into `state`, making the locations that may now be reachable candidates."""
+        changed: Dict[int, Set[str]] = {}
+        for location in locations:
+            self._collect(location, changed)
+        if changed:
+            self._schedule(changed)
+
+    def update(self) -> None:
+        """
+        Makes the locations that may have become reachable since the region graph changed, like entrance randomization
+        connecting entrances, candidates of the next pass.
+        """
+        self._schedule({})
+
+    def copy(self) -> SphereSearch:
+        """Creates a copy of this search and its state, that can continue independently of this one."""
+        ret = SphereSearch.__new__(SphereSearch)
+        ret.state = self.state.copy()
+        ret.remaining = self.remaining.copy()
+        ret.remaining_events = self.remaining_events.copy()
+        ret.spheres = self.spheres.copy()
+        ret._incremental_players = self._incremental_players
+        ret._plain_types = self._plain_types
+        ret._candidates = self._candidates.copy()
+        ret._retest = self._retest.copy()
+        ret._rule_only = self._rule_only.copy()
+        ret._pending = {player: {region: locations.copy() for region, locations in pending.items()}
+                        for player, pending in self._pending.items()}
+        ret._dependents = {player: {item_name: locations.copy() for item_name, locations in dependents.items()}
+                           for player, dependents in self._dependents.items()}
+        ret._region_dependents = {player: locations.copy() for player, locations in self._region_dependents.items()}
+        ret._region_counts = self._region_counts.copy()
+        return ret
+
+    def _test(self, location: Location) -> bool:
+        """Tests whether location is reachable, and if it isn't, files it to be tested again once it may be."""
+        state = self.state
+        if location in self._rule_only:
+            if location.access_rule(state):
+                return True
+            self._retest.add(location)
+            return False
+        region = location.parent_region
+        types = type(location), type(region)
+        plain = self._plain_types.get(types)
+        if plain is None:
+            plain = self._plain_types[types] = \
+                types[0].can_reach is Location.can_reach and types[1].can_reach is Region.can_reach
+        if not plain:
+            if location.can_reach(state):
+                return True
+            self._retest.add(location)
+            return False
+        if not region.can_reach(state):
+            self._pending.setdefault(region.player, {}).setdefault(region, []).append(location)
+            return False
+        player = location.player
+        if player not in self._incremental_players:
+            if location.access_rule(state):
+                return True
+            self._retest.add(location)
+            self._rule_only.add(location)
+            return False
+
+        prog_items = state.prog_items[player]
+        recorder = ItemReadRecorder(prog_items)
+        state.prog_items[player] = recorder
+        try:
+            reached = location.access_rule(state)
+        finally:
+            state.prog_items[player] = prog_items
+        if reached:
+            return True
+        self._region_dependents.setdefault(player, set()).add(location)
+        if recorder.read_all:
+            self._retest.add(location)
+        else:
+            dependents = self._dependents.setdefault(player, {})
+            for item_name in recorder.reads:
+                locations = dependents.get(item_name)
+                if locations is None:
+                    dependents[item_name] = {location}
+                else:
+                    locations.add(location)
+        return False
+
+    def _collect(self, location: Location, changed: Dict[int, Set[str]]) -> None:
+        """Collects the item of location, recording its player and the item names that changed in changed."""
+        item = location.item
+        if item:
+            self.state.collect(item, True, location)
+            # read right away, as updating the player's regions clears changed_items
+            item_names = changed.setdefault(item.player, set())
+            if item.player in self._dependents:
+                item_names |= self.state.changed_items[item.player]
+
+    def _schedule(self, changed: Dict[int, Set[str]]) -> None:
+        """Makes the locations that may have become reachable by the changed items candidates of the next pass."""
+        state = self.state
+        candidates = self._candidates
+        candidates |= self._retest
+        self._retest.clear()
+        for player, item_names in changed.items():
+            dependents = self._dependents.get(player)
+            if dependents:
+                for item_name in item_names:
+                    locations = dependents.pop(item_name, None)
+                    if locations:
+                        candidates |= locations
+        for player in self._pending.keys() | self._region_dependents.keys():
+            if state.stale[player]:
+                state.update_reachable_regions(player)
+            reachable_regions = state.reachable_regions[player]
+            if len(reachable_regions) == self._region_counts.get(player):
+                continue
+            self._region_counts[player] = len(reachable_regions)
+            pending = self._pending.get(player)
+            if pending:
+                for region in [region for region in pending if region in reachable_regions]:
+                    candidates.update(pending.pop(region))
+            region_dependents = self._region_dependents.pop(player, None)
+            if region_dependents:
+                candidates |= region_dependents
 
 
 class EntranceType(IntEnum):
@@ -1698,55 +2434,34 @@ class Spoiler:
         state_cache: List[Optional[CollectionState]] = [None]
         collection_spheres: List[Set[Location]] = []
         state = CollectionState(multiworld)
-        sphere_candidates = set(prog_locations)
+        search = SphereSearch(state, prog_locations)
         logging.debug('Building up collection spheres.')
-        while sphere_candidates:
-
-            # build up spheres of collection radius.
-            # Everything in each sphere is independent from each other in dependencies and only depends on lower spheres
-
-            sphere = {location for location in sphere_candidates if state.can_reach(location)}
-
-            for location in sphere:
-                state.collect(location.item, True, location)
-
-            sphere_candidates -= sphere
+        # build up spheres of collection radius.
+        # Everything in each sphere is independent from each other in dependencies and only depends on lower spheres
+        for sphere in search:
             collection_spheres.append(sphere)
             state_cache.append(state.copy())
 
             logging.debug('Calculated sphere %i, containing %i of %i progress items.', len(collection_spheres),
                           len(sphere),
                           len(prog_locations))
-            if not sphere:
-                logging.debug('The following items could not be reached: %s', ['%s (Player %d) at %s (Player %d)' % (
-                    location.item.name, location.item.player, location.name, location.player) for location in
-                                                                               sphere_candidates])
-                if not multiworld.has_beaten_game(state):
-                    raise RuntimeError("During playthrough generation, the game was determined to be unbeatable. "
-                                       "Something went terribly wrong here. "
-                                       f"Unreachable progression items: {sphere_candidates}")
-                else:
-                    self.unreachables = sphere_candidates
-                    break
+        if search.remaining:
+            logging.debug('The following items could not be reached: %s', ['%s (Player %d) at %s (Player %d)' % (
+                location.item.name, location.item.player, location.name, location.player) for location in
+                                                                           search.remaining])
+            if not multiworld.has_beaten_game(state):
+                raise RuntimeError("During playthrough generation, the game was determined to be unbeatable. "
+                                   "Something went terribly wrong here. "
+                                   f"Unreachable progression items: {search.remaining}")
+            else:
+                self.unreachables = search.remaining
 
         # in the second phase, we cull each sphere such that the game is still beatable,
         # reducing each range of influence to the bare minimum required inside it
         required_locations = {location for sphere in collection_spheres for location in sphere}
         for num, sphere in reversed(tuple(enumerate(collection_spheres))):
-            to_delete: Set[Location] = set()
-            for location in sphere:
-                # we remove the location from required_locations to sweep from, and check if the game is still beatable
-                logging.debug('Checking if %s (Player %d) is required to beat the game.', location.item.name,
-                              location.item.player)
-                required_locations.remove(location)
-                if multiworld.can_beat_game(state_cache[num], required_locations):
-                    to_delete.add(location)
-                else:
-                    # still required, got to keep it around
-                    required_locations.add(location)
-
             # cull entries in spheres for spoiler walkthrough at end
-            sphere -= to_delete
+            sphere -= self._cull_sphere(state_cache[num], sphere, required_locations)
 
         # second phase, sphere 0
         removed_precollected: List[Item] = []
@@ -1774,21 +2489,16 @@ class Spoiler:
 
         required_locations = {item for sphere in collection_spheres for item in sphere}
         state = CollectionState(multiworld)
+        search = SphereSearch(state, required_locations)
         collection_spheres = []
-        while required_locations:
-            sphere = set(filter(state.can_reach, required_locations))
-
-            for location in sphere:
-                state.collect(location.item, True, location)
-
+        for sphere in search:
             collection_spheres.append(sphere)
 
             logging.debug('Calculated final sphere %i, containing %i of %i progress items.', len(collection_spheres),
-                          len(sphere), len(required_locations))
+                          len(sphere), len(search.remaining) + len(sphere))
 
-            required_locations -= sphere
-            if not sphere:
-                raise RuntimeError(f'Not all required items reachable. Unreachable locations: {required_locations}')
+        if search.remaining:
+            raise RuntimeError(f'Not all required items reachable. Unreachable locations: {search.remaining}')
 
         # we can finally output our playthrough
         self.playthrough = {"0": sorted([self.multiworld.get_name_string_for_object(item) for item in
@@ -1805,6 +2515,78 @@ class Spoiler:
         for item in removed_precollected:
             multiworld.push_precollected(item)
 
+    def _cull_sphere(self, state: Optional[CollectionState], sphere: Set[Location],
+                     required_locations: Set[Location]) -> Set[Location]:
+        """
+        Removes each location of `sphere` from `required_locations`, in order, if the game can still be beaten from
+        `state` without it, and returns the removed locations.
+
+        Every location of the sphere is reachable from `state`, so instead of finding them again in the first sweep of
+        every check, the items of the other required locations of the sphere are collected up front. The sphere is
+        split in halves recursively, so that each item gets collected into only one state per level.
+
+        While few locations of the sphere turned out to be required, whole ranges are tested at once. Beating the game
+        only gets harder with fewer locations, so removing a range that can be removed as a whole gives the same result
+        as removing its locations one at a time. Otherwise, the range is split and its halves are tested.
+        """
+        candidates = list(sphere)
+        to_delete: Set[Location] = set()
+        # kept and removed locations of the sphere so far, starting from even odds
+        counts = [1, 1]
+
+        def beatable_without(group: List[Location], group_state: CollectionState) -> bool:
+            """Tests removing group, sweeping group_state, which has the items of all other required locations of the
+            sphere."""
+            required_locations.difference_update(group)
+            if self._can_beat_game_from(group_state, required_locations):
+                to_delete.update(group)
+                counts[1] += len(group)
+                return True
+            required_locations.update(group)
+            return False
+
+        def cull(start: int, end: int, range_state: CollectionState, known_required: bool) -> None:
+            """Culls candidates[start:end]. range_state has the items of all required locations of the sphere outside
+            of the range and is used up by this."""
+            if end - start == 1:
+                location = candidates[start]
+                logging.debug('Checking if %s (Player %d) is required to beat the game.', location.item.name,
+                              location.item.player)
+                if known_required or not beatable_without([location], range_state):
+                    counts[0] += 1
+                return
+            chance_removable = (counts[1] / (counts[0] + counts[1])) ** (end - start)
+            if not known_required and chance_removable >= 0.5:
+                if beatable_without(candidates[start:end], range_state.copy()):
+                    return
+                known_required = True
+
+            middle = (start + end) // 2
+            first_state = range_state.copy()
+            for location in candidates[middle:end]:
+                first_state.collect(location.item, True, location)
+            cull(start, middle, first_state, False)
+            first_required = [location for location in candidates[start:middle] if location not in to_delete]
+            for location in first_required:
+                range_state.collect(location.item, True, location)
+            # if none of the first half was required, something of the second half has to be
+            cull(middle, end, range_state, known_required and not first_required)
+
+        if candidates:
+            cull(0, len(candidates), state.copy() if state else CollectionState(self.multiworld), False)
+        return to_delete
+
+    def _can_beat_game_from(self, state: CollectionState, locations: Set[Location]) -> bool:
+        """Like MultiWorld.can_beat_game, but sweeps state itself instead of a copy of it."""
+        multiworld = self.multiworld
+        if multiworld.has_beaten_game(state):
+            return True
+        for _ in state.sweep_for_advancements(locations, yield_each_sweep=True,
+                                              checked_locations=state.locations_checked):
+            if multiworld.has_beaten_game(state):
+                return True
+        return False
+
     def create_paths(self, state: CollectionState, collection_spheres: List[Set[Location]]) -> None:
         from itertools import zip_longest
         multiworld = self.multiworld
@@ -1814,32 +2596,43 @@ class Spoiler:
                 region_or_entrance, path_value = path_value
                 yield region_or_entrance
 
+        region_paths: Dict[Region, List[Union[Tuple[str, str], Tuple[str, None]]]] = {}
+
         def get_path(state: CollectionState, region: Region) -> List[Union[Tuple[str, str], Tuple[str, None]]]:
-            reversed_path_as_flist: PathValue = state.path.get(region, (str(region), None))
-            string_path_flat = reversed(list(map(str, flist_to_iter(reversed_path_as_flist))))
-            # Now we combine the flat string list into (region, exit) pairs
-            pathsiter = iter(string_path_flat)
-            pathpairs = zip_longest(pathsiter, pathsiter)
-            return list(pathpairs)
+            path = region_paths.get(region)
+            if path is None:
+                reversed_path_as_flist: PathValue = state.path.get(region, (str(region), None))
+                string_path_flat = reversed(list(map(str, flist_to_iter(reversed_path_as_flist))))
+                # Now we combine the flat string list into (region, exit) pairs
+                pathsiter = iter(string_path_flat)
+                pathpairs = zip_longest(pathsiter, pathsiter)
+                path = region_paths[region] = list(pathpairs)
+            # paths are shared between locations of the same region, so each gets its own list
+            return path.copy()
+
+        def has_pyramid_fairy_exit(path: List[Union[Tuple[str, str], Tuple[str, None]]]) -> bool:
+            return any(exit_path == 'Pyramid Fairy' for (_, exit_path) in path)
 
         self.paths = {}
+        # whether any path so far goes through the Pyramid Fairy exit, kept up to date instead of searching all paths
+        pyramid_fairy_needed = False
         topology_worlds = (player for player in multiworld.player_ids if multiworld.worlds[player].topology_present)
         for player in topology_worlds:
-            self.paths.update(
-                {str(location): get_path(state, location.parent_region)
-                 for sphere in collection_spheres for location in sphere
-                 if location.player == player})
+            player_paths = {str(location): get_path(state, location.parent_region)
+                            for sphere in collection_spheres for location in sphere
+                            if location.player == player}
+            self.paths.update(player_paths)
+            pyramid_fairy_needed = pyramid_fairy_needed or any(map(has_pyramid_fairy_exit, player_paths.values()))
             if player in multiworld.get_game_players("A Link to the Past"):
                 # If Pyramid Fairy Entrance needs to be reached, also path to Big Bomb Shop
                 # Maybe move the big bomb over to the Event system instead?
-                if any(exit_path == 'Pyramid Fairy' for path in self.paths.values()
-                       for (_, exit_path) in path):
+                if pyramid_fairy_needed:
                     if multiworld.worlds[player].options.mode != 'inverted':
-                        self.paths[str(multiworld.get_region('Big Bomb Shop', player))] = \
-                            get_path(state, multiworld.get_region('Big Bomb Shop', player))
+                        big_bomb_shop = multiworld.get_region('Big Bomb Shop', player)
                     else:
-                        self.paths[str(multiworld.get_region('Inverted Big Bomb Shop', player))] = \
-                            get_path(state, multiworld.get_region('Inverted Big Bomb Shop', player))
+                        big_bomb_shop = multiworld.get_region('Inverted Big Bomb Shop', player)
+                    big_bomb_shop_path = self.paths[str(big_bomb_shop)] = get_path(state, big_bomb_shop)
+                    pyramid_fairy_needed = pyramid_fairy_needed or has_pyramid_fairy_exit(big_bomb_shop_path)
 
     def to_file(self, filename: str) -> None:
         from itertools import chain
@@ -4,7 +4,8 @@ import logging
 import typing
 from collections import Counter, deque
 
-from BaseClasses import CollectionState, Item, Location, LocationProgressType, MultiWorld, PlandoItemBlock
+from BaseClasses import CollectionState, Item, Location, LocationProgressType, MultiWorld, PlandoItemBlock, \
+    SphereSearch
 from Options import Accessibility
 
 from worlds.AutoWorld import call_all
@@ -33,6 +34,81 @@ def sweep_from_pool(base_state: CollectionState, itempool: typing.Sequence[Item]
     return new_state
 
 
+class _LocationCandidates:
+    """
+    Index over the locations of a fill_restrictive call, for finding the first location that can take an item.
+
+    Locations are bucketed by player, by whether they are excluded and by whether their region is reachable in the
+    current sweep state, so placing an item only calls can_fill on locations that could accept it. Buckets keep the
+    order of `locations`, so the chosen location is the same as scanning the whole list, and are filled lazily, so no
+    more of `locations` is looked at than a scan would.
+    """
+    __slots__ = ("locations", "state", "snapshot", "removed", "buckets")
+
+    locations: typing.List[Location]
+    state: CollectionState
+    snapshot: typing.List[Location]
+    removed: typing.Set[Location]
+    buckets: typing.Dict[typing.Tuple[typing.Optional[int], bool, bool],
+                         typing.Tuple[typing.List[Location], typing.List[int]]]
+
+    def __init__(self, locations: typing.List[Location]) -> None:
+        self.locations = locations
+
+    def update(self, state: CollectionState) -> None:
+        """Start a new batch of placements using the sweep `state`. `locations` may have changed since the last one."""
+        self.state = state
+        self.snapshot = self.locations.copy()
+        self.removed = set()
+        self.buckets = {}
+
+    @staticmethod
+    def _can_skip(location: Location, state: CollectionState, skip_excluded: bool, check_access: bool) -> bool:
+        """Whether `location.can_fill` is known to be False for all items of a bucket."""
+        if type(location).can_fill is not Location.can_fill or type(location).can_reach is not Location.can_reach \
+                or location.always_allow is not Location.always_allow:
+            return False
+        if skip_excluded and location.progress_type == LocationProgressType.EXCLUDED:
+            return True
+        return check_access and not location.parent_region.can_reach(state)
+
+    def find(self, item: Item, single_player_placement: bool, check_access: bool) -> typing.Optional[Location]:
+        """Remove and return the first location of `locations` that can be filled with `item`."""
+        state = self.state
+        removed = self.removed
+        skip_excluded = item.advancement or item.useful
+        bucket_key = (item.player if single_player_placement else None, skip_excluded, check_access)
+        bucket = self.buckets.get(bucket_key)
+        if bucket is None:
+            bucket = self.buckets[bucket_key] = ([], [0])
+        candidates, scanned = bucket
+
+        spot_to_fill: typing.Optional[Location] = None
+        for location in candidates:
+            if location not in removed and location.can_fill(state, item, check_access):
+                spot_to_fill = location
+                break
+        else:
+            snapshot = self.snapshot
+            for i in range(scanned[0], len(snapshot)):
+                location = snapshot[i]
+                if location in removed or (single_player_placement and location.player != item.player) \
+                        or self._can_skip(location, state, skip_excluded, check_access):
+                    continue
+                candidates.append(location)
+                if location.can_fill(state, item, check_access):
+                    spot_to_fill = location
+                    scanned[0] = i + 1
+                    break
+            else:
+                scanned[0] = len(snapshot)
+
+        if spot_to_fill is not None:
+            removed.add(spot_to_fill)
+            self.locations.remove(spot_to_fill)
+        return spot_to_fill
+
+
 def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locations: typing.List[Location],
                      item_pool: typing.List[Item], single_player_placement: bool = False, lock: bool = False,
                      swap: bool = True, on_place: typing.Optional[typing.Callable[[Location], None]] = None,
@@ -59,6 +135,8 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
     for item in item_pool:
         reachable_items.setdefault(item.player, deque()).append(item)
 
+    candidates = _LocationCandidates(locations)
+
     # for progress logging
     total = min(len(item_pool), len(locations))
     placed = 0
@@ -87,6 +165,7 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
             if single_player_placement else None)
 
         has_beaten_game = multiworld.has_beaten_game(maximum_exploration_state)
+        candidates.update(maximum_exploration_state)
 
         while items_to_place:
             # if we have run out of locations to fill,break out of this loop
@@ -95,8 +174,6 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
                 break
             item_to_place = items_to_place.pop(0)
 
-            spot_to_fill: typing.Optional[Location] = None
-
             # if minimal accessibility, only check whether location is reachable if game not beatable
             if multiworld.worlds[item_to_place.player].options.accessibility == Accessibility.option_minimal:
                 perform_access_check = not multiworld.has_beaten_game(maximum_exploration_state,
@@ -105,15 +182,9 @@ def fill_restrictive(multiworld: MultiWorld, base_state: CollectionState, locati
             else:
                 perform_access_check = True
 
-            for i, location in enumerate(locations):
-                if (not single_player_placement or location.player == item_to_place.player) \
-                        and location.can_fill(maximum_exploration_state, item_to_place, perform_access_check):
-                    # popping by index is faster than removing by content,
-                    spot_to_fill = locations.pop(i)
-                    # skipping a scan for the element
-                    break
-
-            else:
+            spot_to_fill: typing.Optional[Location] = candidates.find(item_to_place, single_player_placement,
+                                                                      perform_access_check)
+            if spot_to_fill is None:
                 # we filled all reachable spots.
                 if swap:
                     # Keep a cache of previous safe swap states that might be usable to sweep from to produce the next
@@ -737,6 +808,9 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
     # Define a threshold value based on the player with the most available locations.
     # If other players are below the threshold value, swap progression in this sphere into earlier spheres,
     #   which gives more locations available by this sphere.
+    # Spheres are searched incrementally with a SphereSearch, so each sphere only tests the locations that may have
+    #   become reachable, and a candidate swap is validated from the state of the current sphere, stopping as soon as
+    #   its result is known.
     balanceable_players: typing.Dict[int, float] = {
         player: multiworld.worlds[player].options.progression_balancing / 100
         for player in multiworld.player_ids
@@ -747,9 +821,11 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
     else:
         logging.info(f"Balancing multiworld progression for {len(balanceable_players)} Players.")
         logging.debug(balanceable_players)
-        state: CollectionState = CollectionState(multiworld)
+        search = SphereSearch(CollectionState(multiworld), multiworld.get_locations())
+        state: CollectionState = search.state
         checked_locations: typing.Set[Location] = set()
-        unchecked_locations: typing.Set[Location] = set(multiworld.get_locations())
+        # locations leave search.remaining once they are found to be reachable
+        unchecked_locations: typing.Set[Location] = search.remaining
 
         total_locations_count: typing.Counter[int] = Counter(
             location.player
@@ -769,13 +845,26 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
         sphere_num: int = 1
         moved_item_count: int = 0
 
-        def get_sphere_locations(sphere_state: CollectionState,
-                                 locations: typing.Set[Location]) -> typing.Set[Location]:
-            return {loc for loc in locations if sphere_state.can_reach(loc)}
-
         def item_percentage(player: int, num: int) -> float:
             return num / total_locations_count[player]
 
+        def is_required(player: int, reducing_search: SphereSearch, beaten: bool) -> bool:
+            """
+            Searches the locations of reducing_search until the game is beaten, or if balancing didn't need to beat the
+            game, until player reaches its threshold. Spheres can only grow, so the search stops as soon as that's
+            the case, otherwise the items that were left out of reducing_search are required.
+            """
+            reducing_state = reducing_search.state
+            reachable = reachable_locations_count[player]
+            while not (multiworld.has_beaten_game(reducing_state) if beaten
+                       else item_percentage(player, reachable) >= threshold_percentages[player]):
+                reduced_sphere = reducing_search.reach()
+                if not reduced_sphere:
+                    return True
+                reachable += len(reduced_sphere)
+                reducing_search.collect(location for location in reduced_sphere if location.advancement)
+            return False
+
         # If there are no locations that aren't locked, there's no point in attempting to balance progression.
         if len(total_locations_count) == 0:
             return
@@ -784,9 +873,8 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
             # Gather non-locked locations.
             # This ensures that only shuffled locations get counted for progression balancing,
             #   i.e. the items the players will be checking.
-            sphere_locations = get_sphere_locations(state, unchecked_locations)
+            sphere_locations = search.reach()
             for location in sphere_locations:
-                unchecked_locations.remove(location)
                 if not location.locked:
                     reachable_locations_count[location.player] += 1
 
@@ -814,27 +902,27 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                         and item_percentage(player, reachables) < threshold_percentages[player])
                 }
                 if balancing_players:
-                    balancing_state = state.copy()
-                    balancing_unchecked_locations = unchecked_locations.copy()
+                    balancing_search = search.copy()
+                    balancing_state = balancing_search.state
+                    balancing_unchecked_locations = balancing_search.remaining
                     balancing_reachables = reachable_locations_count.copy()
-                    balancing_sphere = sphere_locations.copy()
+                    balancing_sphere = sphere_locations
                     candidate_items: typing.Dict[int, typing.Set[Location]] = collections.defaultdict(set)
                     while True:
                         # Check locations in the current sphere and gather progression items to swap earlier
+                        balancing_advancements = [location for location in balancing_sphere if location.advancement]
+                        for location in balancing_advancements:
+                            player = location.item.player
+                            # only replace items that end up in another player's world
+                            if (not location.locked and not location.item.skip_in_prog_balancing and
+                                    player in balancing_players and
+                                    location.player != player and
+                                    location.progress_type != LocationProgressType.PRIORITY):
+                                candidate_items[player].add(location)
+                                logging.debug(f"Candidate item: {location.name}, {location.item.name}")
+                        balancing_search.collect(balancing_advancements)
+                        balancing_sphere = balancing_search.reach()
                         for location in balancing_sphere:
-                            if location.advancement:
-                                balancing_state.collect(location.item, True, location)
-                                player = location.item.player
-                                # only replace items that end up in another player's world
-                                if (not location.locked and not location.item.skip_in_prog_balancing and
-                                        player in balancing_players and
-                                        location.player != player and
-                                        location.progress_type != LocationProgressType.PRIORITY):
-                                    candidate_items[player].add(location)
-                                    logging.debug(f"Candidate item: {location.name}, {location.item.name}")
-                        balancing_sphere = get_sphere_locations(balancing_state, balancing_unchecked_locations)
-                        for location in balancing_sphere:
-                            balancing_unchecked_locations.remove(location)
                             if not location.locked:
                                 balancing_reachables[location.player] += 1
                         if multiworld.has_beaten_game(balancing_state) or all(
@@ -850,6 +938,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                         if l not in balancing_unchecked_locations:
                             unlocked_locations[l.player].add(l)
                     items_to_replace: typing.List[Location] = []
+                    balancing_beaten = multiworld.has_beaten_game(balancing_state)
                     for player in balancing_players:
                         locations_to_test = unlocked_locations[player]
                         items_to_test = list(candidate_items[player])
@@ -857,23 +946,13 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                         multiworld.random.shuffle(items_to_test)
                         while items_to_test:
                             testing = items_to_test.pop()
-                            reducing_state = state.copy()
-                            for location in itertools.chain((
+                            reducing_search = SphereSearch(state.copy(), locations_to_test)
+                            reducing_search.collect(itertools.chain((
                                     l for l in items_to_replace
                                     if l.item.player == player
-                            ), items_to_test):
-                                reducing_state.collect(location.item, True, location)
-
-                            reducing_state.sweep_for_advancements(locations=locations_to_test)
-
-                            if multiworld.has_beaten_game(balancing_state):
-                                if not multiworld.has_beaten_game(reducing_state):
-                                    items_to_replace.append(testing)
-                            else:
-                                reduced_sphere = get_sphere_locations(reducing_state, locations_to_test)
-                                p = item_percentage(player, reachable_locations_count[player] + len(reduced_sphere))
-                                if p < threshold_percentages[player]:
-                                    items_to_replace.append(testing)
+                            ), items_to_test))
+                            if is_required(player, reducing_search, balancing_beaten):
+                                items_to_replace.append(testing)
 
                     old_moved_item_count = moved_item_count
 
@@ -895,7 +974,7 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                                 logging.debug(f"Progression balancing moved {new_location.item} to {new_location}, "
                                               f"displacing {old_location.item} into {old_location}")
                                 moved_item_count += 1
-                                state.collect(new_location.item, True, new_location)
+                                search.collect((new_location,))
                                 break
                         else:
                             logging.warning(f"Could not Progression Balance {old_location.item}")
@@ -903,15 +982,12 @@ def balance_multiworld_progression(multiworld: MultiWorld) -> None:
                     if old_moved_item_count < moved_item_count:
                         logging.debug(f"Moved {moved_item_count} items so far\n")
                         unlocked = {fresh for player in balancing_players for fresh in unlocked_locations[player]}
-                        for location in get_sphere_locations(state, unlocked):
-                            unchecked_locations.remove(location)
+                        for location in search.reach(unlocked):
                             if not location.locked:
                                 reachable_locations_count[location.player] += 1
                             sphere_locations.add(location)
 
-            for location in sphere_locations:
-                if location.advancement:
-                    state.collect(location.item, True, location)
+            search.collect(location for location in sphere_locations if location.advancement)
             checked_locations |= sphere_locations
 
             if multiworld.has_beaten_game(state):
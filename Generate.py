@@ -3,15 +3,18 @@ from __future__ import annotations
 import argparse
 import copy
 import logging
+import multiprocessing
 import os
 import random
 import string
 import sys
+import time
+import traceback
 import urllib.parse
 import urllib.request
 from collections import Counter
 from itertools import chain
-from typing import Any
+from typing import Any, NamedTuple
 
 import ModuleUpdate
 
@@ -57,12 +60,28 @@ def mystery_argparse(argv: list[str] | None = None):
     parser.add_argument("--spoiler_only", action="store_true",
                         help="Skips generation assertion and multidata, outputting only a spoiler log. "
                              "Intended for debugging and testing purposes.")
+    parser.add_argument("--profile_generation", "--profile-generation", action="store_true",
+                        help="Record time, rule evaluations, sweeps, state copies and peak memory per generation "
+                             "step and per world, and write them next to the output as json and as folded stacks "
+                             "for flame graphs. Makes generation slower.")
+    parser.add_argument("--batch", type=int, default=0,
+                        help="Generate this many multiworlds in worker processes that keep worlds imported between "
+                             "generations. Uses consecutive seeds starting at --seed if it is given.")
+    parser.add_argument("--jobs", type=int, default=0,
+                        help="Number of worker processes for --batch. Defaults to the number of CPUs.")
+    parser.add_argument("--batch_sets", default=None,
+                        help="Folder with one folder of player files per multiworld. Each of them is generated "
+                             "--batch times instead of --player_files_path.")
     args = parser.parse_args(argv)
 
     if args.skip_output and args.spoiler_only:
         parser.error("Cannot mix --skip_output and --spoiler_only")
     elif args.spoiler == 0 and args.spoiler_only:
         parser.error("Cannot use --spoiler_only when --spoiler=0. Use --skip_output or set --spoiler to a different value")
+    if args.batch < 0 or args.jobs < 0:
+        parser.error("--batch and --jobs cannot be negative")
+    elif args.batch_sets and not args.batch:
+        parser.error("Cannot use --batch_sets without --batch")
 
     if not os.path.isabs(args.weights_file_path):
         args.weights_file_path = os.path.join(args.player_files_path, args.weights_file_path)
@@ -79,7 +98,7 @@ def get_seed_name(random_source) -> str:
 
 def main(args=None) -> tuple[argparse.Namespace, int]:
     # __name__ == "__main__" check so unittests that already imported worlds don't trip this.
-    if __name__ == "__main__" and "worlds" in sys.modules:
+    if __name__ == "__main__" and "worlds" in sys.modules and _parsed_weights is None:
         raise Exception("Worlds system should not be loaded before logging init.")
 
     if not args:
@@ -291,7 +310,109 @@ def main(args=None) -> tuple[argparse.Namespace, int]:
     return args, seed
 
 
+class BatchResult(NamedTuple):
+    seed: int
+    player_files_path: str
+    seed_name: str | None
+    seconds: float
+    log_file: str | None
+    error: str | None
+
+
+# parsed player files by path, with the size and modification time they were parsed at; only used by batch workers
+_parsed_weights: dict[str, tuple[tuple[int, int], tuple[Any, ...]]] | None = None
+
+
+def _init_batch_worker() -> None:
+    global _parsed_weights
+    _parsed_weights = {}
+    # results are reported by the batch process, each generation still logs to its own file
+    sys.stdout = open(os.devnull, "w", encoding="utf-8")
+    import worlds  # noqa: F401  # forked workers already have it
+
+
+def _batch_generate(args: argparse.Namespace, seed: int) -> BatchResult:
+    start = time.perf_counter()
+    seed_name = None
+    try:
+        args.seed = seed
+        erargs, seed = main(args)
+        seed_name = erargs.outputname
+        from Main import main as ERmain
+        ERmain(erargs, seed)
+        error = None
+    except Exception:
+        error = traceback.format_exc()
+        logging.exception(f"Generation of seed {seed} failed")
+    log_file = next((handler.baseFilename for handler in logging.getLogger().handlers
+                     if isinstance(handler, logging.FileHandler)), None)
+    return BatchResult(seed, args.player_files_path, seed_name, time.perf_counter() - start, log_file, error)
+
+
+def batch_main(args: argparse.Namespace) -> list[BatchResult]:
+    """
+    Generates args.batch multiworlds, for each player files folder of args.batch_sets if given, in a pool of args.jobs
+    worker processes that keep imported worlds and parsed player files between generations.
+    Results are logged as they complete. Returns the failed generations.
+    """
+    Utils.init_logging("Generate_Batch", loglevel=args.log_level, add_timestamp=args.log_time)
+    # imported before the pool is created, so forked workers start with the world index loaded
+    import worlds  # noqa: F401
+
+    if args.seed is None:
+        seeds = [get_seed() for _ in range(args.batch)]
+    else:
+        seeds = [args.seed + offset for offset in range(args.batch)]
+    if args.batch_sets:
+        player_files_paths = sorted(entry.path for entry in os.scandir(args.batch_sets) if entry.is_dir())
+    else:
+        player_files_paths = [args.player_files_path]
+
+    tasks: list[tuple[argparse.Namespace, int]] = []
+    for player_files_path in player_files_paths:
+        set_args = copy.copy(args)
+        set_args.player_files_path = player_files_path
+        for attribute in ("weights_file_path", "meta_file_path"):
+            path = getattr(args, attribute)
+            if path and os.path.dirname(path) == args.player_files_path:
+                setattr(set_args, attribute, os.path.join(player_files_path, os.path.basename(path)))
+        tasks.extend((set_args, seed) for seed in seeds)
+
+    jobs = min(args.jobs or os.cpu_count() or 1, len(tasks))
+    logging.info(f"Generating {len(tasks)} multiworlds in {jobs} worker process{'es' if jobs > 1 else ''}.")
+    start = time.perf_counter()
+    failures: list[BatchResult] = []
+    with multiprocessing.Pool(jobs, initializer=_init_batch_worker) as pool:
+        for done, result in enumerate(pool.imap_unordered(_star_batch_generate, tasks), 1):
+            if result.error:
+                failures.append(result)
+                logging.error(f"[{done}/{len(tasks)}] {result.player_files_path} seed {result.seed} failed after "
+                              f"{result.seconds:.2f} seconds, see {result.log_file}:\n{result.error}")
+            else:
+                logging.info(f"[{done}/{len(tasks)}] {result.player_files_path} seed {result.seed} generated "
+                             f"{result.seed_name} in {result.seconds:.2f} seconds.")
+    logging.info(f"Generated {len(tasks) - len(failures)} of {len(tasks)} multiworlds "
+                 f"in {time.perf_counter() - start:.2f} seconds.")
+    return failures
+
+
+def _star_batch_generate(task: tuple[argparse.Namespace, int]) -> BatchResult:
+    return _batch_generate(*task)
+
+
 def read_weights_yamls(path) -> tuple[Any, ...]:
+    if _parsed_weights is not None and os.path.isfile(path):
+        stat = os.stat(path)
+        version = stat.st_size, stat.st_mtime_ns
+        cached = _parsed_weights.get(path)
+        if not cached or cached[0] != version:
+            cached = _parsed_weights[path] = version, _read_weights_yamls(path)
+        # rolling and meta options modify the parsed documents
+        return copy.deepcopy(cached[1])
+    return _read_weights_yamls(path)
+
+
+def _read_weights_yamls(path) -> tuple[Any, ...]:
     try:
         if urllib.parse.urlparse(path).scheme in ('https', 'file'):
             yaml = str(urllib.request.urlopen(path).read(), "utf-8-sig")
@@ -651,8 +772,14 @@ def roll_alttp_settings(ret: argparse.Namespace, weights):
 
 if __name__ == '__main__':
     import atexit
+    multiprocessing.freeze_support()
     confirmation = atexit.register(input, "Press enter to close.")
-    erargs, seed = main()
+    args = mystery_argparse()
+    if args.batch:
+        failed = batch_main(args)
+        atexit.unregister(confirmation)
+        sys.exit(1 if failed else 0)
+    erargs, seed = main(args)
     from Main import main as ERmain
     multiworld = ERmain(erargs, seed)
     if __debug__:
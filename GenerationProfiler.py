@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, TypeVar, TYPE_CHECKING
+
+from BaseClasses import CollectionState, Entrance, Location
+
+if TYPE_CHECKING:
+    from BaseClasses import MultiWorld
+
+__all__ = ["GenerationProfiler", "ProfileSection", "active_profiler", "profile_section", "profiled"]
+
+RetType = TypeVar("RetType")
+
+active_profiler: Optional[GenerationProfiler] = None
+"""the profiler currently recording, if any"""
+
+
+class ProfileSection:
+    """Measurements of one step of generation, nested into the step it ran in."""
+    __slots__ = ("name", "player", "children", "calls", "time", "rule_evaluations", "rule_time", "sweeps",
+                 "state_copies", "peak_memory")
+
+    name: str
+    player: Optional[int]
+    """the player whose world this section ran for, if it ran for a single world"""
+    children: Dict[str, ProfileSection]
+    calls: int
+    time: float
+    """wall time in seconds, including children"""
+    rule_evaluations: Dict[int, int]
+    """per player, number of location and entrance reachability checks, which evaluate their access rules"""
+    rule_time: Dict[int, float]
+    """per player, time spent in reachability checks, excluding children"""
+    sweeps: int
+    state_copies: int
+    peak_memory: Optional[int]
+    """
+    peak resident memory of the process in bytes while this section ran. Only recorded on Linux and for sections of the
+    thread that started profiling.
+    """
+
+    def __init__(self, name: str, player: Optional[int] = None) -> None:
+        self.name = name
+        self.player = player
+        self.children = {}
+        self.calls = 0
+        self.time = 0.0
+        self.rule_evaluations = defaultdict(int)
+        self.rule_time = defaultdict(float)
+        self.sweeps = 0
+        self.state_copies = 0
+        self.peak_memory = None
+
+    def child(self, name: str, player: Optional[int] = None) -> ProfileSection:
+        section = self.children.get(name)
+        if section is None:
+            section = self.children.setdefault(name, ProfileSection(name, player))
+        return section
+
+    @property
+    def self_time(self) -> float:
+        return max(self.time - sum(child.time for child in self.children.values()), 0.0)
+
+
+def _peak_rss() -> int:
+    """Peak resident set size of this process since the last reset, in bytes."""
+    with open("/proc/self/status", "rb") as f:
+        for line in f:
+            if line.startswith(b"VmHWM:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def _reset_peak_rss() -> None:
+    with open("/proc/self/clear_refs", "w") as f:
+        f.write("5")
+
+
+class _ThreadState(threading.local):
+    stack: List[ProfileSection]
+    rule_depth: int
+
+    def __init__(self, root: ProfileSection) -> None:
+        # sections of other threads, like the output threads, are nested directly into the root section
+        self.stack = [root]
+        self.rule_depth = 0
+
+
+class GenerationProfiler:
+    """
+    Records wall time, rule evaluations, sweeps, state copies and peak memory of generation, per section and per world.
+
+    While active, it wraps Location.can_reach, Entrance.can_reach, CollectionState.copy and
+    CollectionState.sweep_for_advancements to count into the innermost section of the calling thread. Sections are
+    opened with profile_section, which AutoWorld does for each world's stage method.
+    """
+    root: ProfileSection
+    track_memory: bool
+
+    _local: _ThreadState
+    _owner: int
+    _peaks: List[int]
+    _start: float
+    _originals: Dict[Any, Dict[str, Callable[..., Any]]]
+
+    def __init__(self, track_memory: bool = True) -> None:
+        self.root = ProfileSection("generation")
+        self.track_memory = track_memory
+        self._originals = {}
+
+    def __enter__(self) -> GenerationProfiler:
+        self.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        global active_profiler
+        assert active_profiler is None, "Only one GenerationProfiler can be active at a time."
+        self._local = _ThreadState(self.root)
+        self._owner = threading.get_ident()
+        self._peaks = [0]
+        if self.track_memory:
+            try:
+                _reset_peak_rss()
+            except OSError:
+                logging.debug("Peak memory can't be tracked on this platform.")
+                self.track_memory = False
+        self._patch(Location, "can_reach", self._wrap_rule)
+        self._patch(Entrance, "can_reach", self._wrap_rule)
+        self._patch(CollectionState, "copy", self._wrap_counter("state_copies"))
+        self._patch(CollectionState, "sweep_for_advancements", self._wrap_counter("sweeps"))
+        active_profiler = self
+        self._start = time.perf_counter()
+
+    def stop(self) -> None:
+        global active_profiler
+        self.root.time += time.perf_counter() - self._start
+        self.root.calls += 1
+        active_profiler = None
+        for cls, originals in self._originals.items():
+            for name, original in originals.items():
+                setattr(cls, name, original)
+        self._originals.clear()
+        if self.track_memory:
+            self.root.peak_memory = max(self._peaks[0], _peak_rss())
+
+    def _patch(self, cls: type, name: str, wrap: Callable[[Callable[..., Any]], Callable[..., Any]]) -> None:
+        original = cls.__dict__[name]
+        self._originals.setdefault(cls, {})[name] = original
+        setattr(cls, name, functools.wraps(original)(wrap(original)))
+
+    def _wrap_rule(self, original: Callable[[Any, CollectionState], bool]) -> Callable[[Any, CollectionState], bool]:
+        local = self._local
+        perf_counter = time.perf_counter
+
+        def can_reach(spot: Any, state: CollectionState) -> bool:
+            if local.rule_depth:
+                # rules checking other spots are timed as part of the outermost check
+                local.stack[-1].rule_evaluations[spot.player] += 1
+                return original(spot, state)
+            local.rule_depth = 1
+            start = perf_counter()
+            try:
+                return original(spot, state)
+            finally:
+                section = local.stack[-1]
+                section.rule_evaluations[spot.player] += 1
+                section.rule_time[spot.player] += perf_counter() - start
+                local.rule_depth = 0
+
+        return can_reach
+
+    def _wrap_counter(self, counter: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        local = self._local
+
+        def wrap(original: Callable[..., Any]) -> Callable[..., Any]:
+            def counted(*args: Any, **kwargs: Any) -> Any:
+                section = local.stack[-1]
+                setattr(section, counter, getattr(section, counter) + 1)
+                return original(*args, **kwargs)
+
+            return counted
+
+        return wrap
+
+    @contextlib.contextmanager
+    def section(self, name: str, player: Optional[int] = None) -> Iterator[ProfileSection]:
+        """
+        Record everything run inside as a section named `name`, nested in the current section of this thread.
+        If `player` is given, an additional section for that player is nested into it.
+        """
+        stack = self._local.stack
+        sections = [stack[-1].child(name)]
+        if player is not None:
+            sections.append(sections[0].child(f"Player {player}", player))
+        track_memory = self.track_memory and threading.get_ident() == self._owner
+        if track_memory:
+            peaks = self._peaks
+            peaks[-1] = max(peaks[-1], _peak_rss())
+            _reset_peak_rss()
+            peaks.append(0)
+        stack.extend(sections)
+        start = time.perf_counter()
+        try:
+            yield sections[-1]
+        finally:
+            taken = time.perf_counter() - start
+            del stack[-len(sections):]
+            if track_memory:
+                peak = max(peaks.pop(), _peak_rss())
+                peaks[-1] = max(peaks[-1], peak)
+            for section in sections:
+                section.calls += 1
+                section.time += taken
+                if track_memory:
+                    section.peak_memory = max(section.peak_memory or 0, peak)
+
+    def _player_label(self, multiworld: MultiWorld, player: int) -> str:
+        return f"{multiworld.get_player_name(player)} ({multiworld.game[player]})"
+
+    def to_dict(self, multiworld: MultiWorld) -> Dict[str, Any]:
+        """The recorded sections as a flat list, and totals per world, for the json report."""
+        sections: List[Dict[str, Any]] = []
+        worlds: Dict[int, Dict[str, Any]] = {
+            player: {"name": multiworld.get_player_name(player), "game": multiworld.game[player], "time": 0.0,
+                     "rule_evaluations": 0, "rule_time": 0.0}
+            for player in multiworld.player_ids
+        }
+
+        def add(section: ProfileSection, path: List[str]) -> None:
+            path = path + [section.name]
+            sections.append({
+                "path": path,
+                "player": section.player,
+                "calls": section.calls,
+                "time": section.time,
+                "self_time": section.self_time,
+                "rule_evaluations": {str(player): count for player, count in section.rule_evaluations.items()},
+                "rule_time": {str(player): taken for player, taken in section.rule_time.items()},
+                "sweeps": section.sweeps,
+                "state_copies": section.state_copies,
+                "peak_memory": section.peak_memory,
+            })
+            if section.player in worlds:
+                worlds[section.player]["time"] += section.time
+            for player, count in section.rule_evaluations.items():
+                if player in worlds:
+                    worlds[player]["rule_evaluations"] += count
+                    worlds[player]["rule_time"] += section.rule_time[player]
+            for child in section.children.values():
+                add(child, path)
+
+        add(self.root, [])
+        return {
+            "seed": multiworld.seed_name,
+            "total_time": self.root.time,
+            "worlds": {str(player): data for player, data in worlds.items()},
+            "sections": sections,
+        }
+
+    def to_folded(self, multiworld: MultiWorld) -> List[str]:
+        """
+        The recorded sections as folded stacks with self time in microseconds, as read by flame graph tools.
+        Time spent in reachability checks is split out into a frame per player.
+        """
+        lines: List[str] = []
+
+        def frame_name(section: ProfileSection) -> str:
+            name = self._player_label(multiworld, section.player) if section.player in multiworld.player_ids \
+                else section.name
+            return name.replace(";", ":").replace("\n", " ")
+
+        def add(section: ProfileSection, stack: str) -> None:
+            stack = f"{stack};{frame_name(section)}" if stack else frame_name(section)
+            self_time = section.self_time
+            for player, taken in section.rule_time.items():
+                self_time -= taken
+                if int(taken * 1_000_000):
+                    label = self._player_label(multiworld, player).replace(";", ":").replace("\n", " ")
+                    lines.append(f"{stack};rules of {label} {int(taken * 1_000_000)}")
+            if int(self_time * 1_000_000) > 0:
+                lines.append(f"{stack} {int(self_time * 1_000_000)}")
+            for child in section.children.values():
+                add(child, stack)
+
+        add(self.root, "")
+        return lines
+
+    def write(self, multiworld: MultiWorld, base_path: str) -> None:
+        """Write the report to `base_path`.json and the folded stacks for flame graphs to `base_path`.folded."""
+        with open(f"{base_path}.json", "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(multiworld), f, indent=2)
+        with open(f"{base_path}.folded", "w", encoding="utf-8") as f:
+            f.write("\n".join(self.to_folded(multiworld)) + "\n")
+        logging.info(f"Wrote generation profile to {base_path}.json and {base_path}.folded")
+
+
+def profile_section(name: str, player: Optional[int] = None) -> ContextManager[Optional[ProfileSection]]:
+    """GenerationProfiler.section of the active profiler, does nothing when not profiling."""
+    if active_profiler is None:
+        return contextlib.nullcontext()
+    return active_profiler.section(name, player)
+
+
+def profiled(name: str, function: Callable[..., RetType], *args: Any) -> RetType:
+    """Call `function` inside profile_section(`name`), for functions that are run in a thread pool."""
+    with profile_section(name):
+        return function(*args)
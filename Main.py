@@ -3,19 +3,20 @@ from collections.abc import Mapping
 import concurrent.futures
 import logging
 import os
+import shutil
 import tempfile
 import time
 from typing import Any
 import zipfile
-import zlib
 
 import worlds
 from BaseClasses import CollectionState, Item, Location, LocationProgressType, MultiWorld
 from Fill import FillError, balance_multiworld_progression, distribute_items_restrictive, flood_items, \
     parse_planned_blocks, distribute_planned_blocks, resolve_early_locations_for_planned
+from GenerationProfiler import GenerationProfiler, profile_section, profiled
 from NetUtils import convert_to_base_types
 from Options import StartInventoryPool
-from Utils import __version__, output_path, restricted_dumps, version_tuple
+from Utils import ZlibWriter, __version__, output_path, restricted_dump, version_tuple
 from settings import get_settings
 from worlds import AutoWorld
 from worlds.generic.Rules import exclusion_rules, locality_rules
@@ -24,6 +25,27 @@ __all__ = ["main"]
 
 
 def main(args, seed=None, baked_server_options: dict[str, object] | None = None):
+    if not args.profile_generation:
+        return _main(args, seed, baked_server_options)
+
+    with GenerationProfiler() as profiler:
+        multiworld = _main(args, seed, baked_server_options)
+    profiler.write(multiworld, output_path(f"AP_{multiworld.seed_name}_profile"))
+    return multiworld
+
+
+def write_multidata_file(multidata: Mapping[str, Any], path: str) -> None:
+    """
+    Writes the .archipelago file. The pickle is compressed while it is written, so neither it nor its compressed form
+    are held in memory as a whole.
+    """
+    with open(path, 'wb') as f:
+        f.write(bytes([3]))  # version of format
+        with ZlibWriter(f, 9) as compressed:
+            restricted_dump(multidata, compressed)
+
+
+def _main(args, seed=None, baked_server_options: dict[str, object] | None = None):
     if not baked_server_options:
         baked_server_options = get_settings().server_options.as_dict()
     assert isinstance(baked_server_options, dict)
@@ -51,16 +73,19 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
     multiworld.state = CollectionState(multiworld)
     logger.info('Archipelago Version %s  -  Seed: %s\n', __version__, multiworld.seed)
 
-    logger.info(f"Found {len(AutoWorld.AutoWorldRegister.world_types)} World Types:")
-    longest_name = max(len(text) for text in AutoWorld.AutoWorldRegister.world_types)
+    # only the worlds that are played are listed, as listing every world would import all of them
+    used_world_types = {game: AutoWorld.AutoWorldRegister.world_types[game]
+                        for game in sorted(set(multiworld.game.values()))}
+    logger.info(f"Found {len(AutoWorld.AutoWorldRegister.world_types)} World Types, using {len(used_world_types)}:")
+    longest_name = max(len(text) for text in used_world_types)
 
-    world_classes = AutoWorld.AutoWorldRegister.world_types.values()
+    world_classes = used_world_types.values()
 
     version_count = max(len(cls.world_version.as_simple_string()) for cls in world_classes)
     item_count = len(str(max(len(cls.item_names) for cls in world_classes)))
     location_count = len(str(max(len(cls.location_names) for cls in world_classes)))
 
-    for name, cls in AutoWorld.AutoWorldRegister.world_types.items():
+    for name, cls in used_world_types.items():
         if not cls.hidden and len(cls.item_names) > 0:
             logger.info(f" {name:{longest_name}}: "
                         f"v{cls.world_version.as_simple_string():{version_count}} | "
@@ -185,9 +210,10 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
         multiworld._all_state = None
 
     logger.info("Running Item Plando.")
-    resolve_early_locations_for_planned(multiworld)
-    distribute_planned_blocks(multiworld, [x for player in multiworld.plando_item_blocks
-                                           for x in multiworld.plando_item_blocks[player]])
+    with profile_section("item plando"):
+        resolve_early_locations_for_planned(multiworld)
+        distribute_planned_blocks(multiworld, [x for player in multiworld.plando_item_blocks
+                                               for x in multiworld.plando_item_blocks[player]])
 
     logger.info('Running Pre Main Fill.')
 
@@ -195,15 +221,17 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
 
     logger.info(f'Filling the multiworld with {len(multiworld.itempool)} items.')
 
-    if multiworld.algorithm == 'flood':
-        flood_items(multiworld)  # different algo, biased towards early game progress items
-    elif multiworld.algorithm == 'balanced':
-        distribute_items_restrictive(multiworld, get_settings().generator.panic_method)
+    with profile_section("fill"):
+        if multiworld.algorithm == 'flood':
+            flood_items(multiworld)  # different algo, biased towards early game progress items
+        elif multiworld.algorithm == 'balanced':
+            distribute_items_restrictive(multiworld, get_settings().generator.panic_method)
 
     AutoWorld.call_all(multiworld, 'post_fill')
 
     if multiworld.players > 1 and not args.skip_prog_balancing:
-        balance_multiworld_progression(multiworld)
+        with profile_section("progression balancing"):
+            balance_multiworld_progression(multiworld)
     else:
         logger.info("Progression balancing skipped.")
 
@@ -220,30 +248,50 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
     if args.spoiler_only:
         if args.spoiler > 1:
             logger.info('Calculating playthrough.')
-            multiworld.spoiler.create_playthrough(create_paths=args.spoiler > 2)
+            with profile_section("playthrough"):
+                multiworld.spoiler.create_playthrough(create_paths=args.spoiler > 2)
 
-        multiworld.spoiler.to_file(output_path('%s_Spoiler.txt' % outfilebase))
+        with profile_section("spoiler"):
+            multiworld.spoiler.to_file(output_path('%s_Spoiler.txt' % outfilebase))
         logger.info('Done. Skipped multidata modification. Total time: %s', time.perf_counter() - start)
         return multiworld
 
     output = tempfile.TemporaryDirectory()
-    with output as temp_dir:
+    archive_path = os.path.join(output.name, "archive.zip")
+    with output as temp_dir, zipfile.ZipFile(archive_path, mode="w", compression=zipfile.ZIP_DEFLATED,
+                                             compresslevel=9) as archive:
+        # output files are moved into the archive as soon as the task that created them is done, so each task gets its
+        # own directory to tell its finished files apart from the ones other tasks are still writing
+        output_directories: dict[concurrent.futures.Future, str] = {}
+
+        def archive_output(directory: str) -> None:
+            with profile_section("archive"):
+                for file in os.scandir(directory):
+                    archive.write(file.path, arcname=file.name)
+                shutil.rmtree(directory)
+
         output_players = [player for player in multiworld.player_ids if AutoWorld.World.generate_output.__code__
                           is not multiworld.worlds[player].generate_output.__code__]
-        with concurrent.futures.ThreadPoolExecutor(len(output_players) + 2) as pool:
-            check_accessibility_task = pool.submit(multiworld.fulfills_accessibility)
+        with profile_section("output"), concurrent.futures.ThreadPoolExecutor(len(output_players) + 2) as pool:
+            def submit_output(function, *args) -> concurrent.futures.Future:
+                output_directory = tempfile.mkdtemp(dir=temp_dir)
+                future = pool.submit(function, *args, output_directory)
+                output_directories[future] = output_directory
+                return future
 
-            output_file_futures = [pool.submit(AutoWorld.call_stage, multiworld, "generate_output", temp_dir)]
+            check_accessibility_task = pool.submit(profiled, "fulfills_accessibility",
+                                                   multiworld.fulfills_accessibility)
+
+            output_file_futures = [submit_output(AutoWorld.call_stage, multiworld, "generate_output")]
             for player in output_players:
                 # skip starting a thread for methods that say "pass".
-                output_file_futures.append(
-                    pool.submit(AutoWorld.call_single, multiworld, "generate_output", player, temp_dir))
+                output_file_futures.append(submit_output(AutoWorld.call_single, multiworld, "generate_output", player))
 
             # collect ER hint info
             er_hint_data: dict[int, dict[int, str]] = {}
             AutoWorld.call_all(multiworld, 'extend_hint_information', er_hint_data)
 
-            def write_multidata():
+            def write_multidata(output_directory: str):
                 import NetUtils
                 from NetUtils import HintStatus
                 slot_data: dict[int, Mapping[str, Any]] = {}
@@ -350,13 +398,9 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
                 for key in ("slot_data", "er_hint_data"):
                     multidata[key] = convert_to_base_types(multidata[key])
 
-                serialized_multidata = zlib.compress(restricted_dumps(multidata), 9)
-
-                with open(os.path.join(temp_dir, f'{outfilebase}.archipelago'), 'wb') as f:
-                    f.write(bytes([3]))  # version of format
-                    f.write(serialized_multidata)
+                write_multidata_file(multidata, os.path.join(output_directory, f'{outfilebase}.archipelago'))
 
-            output_file_futures.append(pool.submit(write_multidata))
+            output_file_futures.append(submit_output(profiled, "write_multidata", write_multidata))
             if not check_accessibility_task.result():
                 if not multiworld.can_beat_game():
                     raise FillError("Game appears as unbeatable. Aborting.", multiworld=multiworld)
@@ -368,20 +412,23 @@ def main(args, seed=None, baked_server_options: dict[str, object] | None = None)
                 if i % 10 == 0 or i == len(output_file_futures):
                     logger.info(f'Generating output files ({i}/{len(output_file_futures)}).')
                 future.result()
+                archive_output(output_directories.pop(future))
 
         if args.spoiler > 1:
             logger.info('Calculating playthrough.')
-            multiworld.spoiler.create_playthrough(create_paths=args.spoiler > 2)
+            with profile_section("playthrough"):
+                multiworld.spoiler.create_playthrough(create_paths=args.spoiler > 2)
 
         if args.spoiler:
-            multiworld.spoiler.to_file(os.path.join(temp_dir, '%s_Spoiler.txt' % outfilebase))
+            with profile_section("spoiler"):
+                spoiler_directory = tempfile.mkdtemp(dir=temp_dir)
+                multiworld.spoiler.to_file(os.path.join(spoiler_directory, '%s_Spoiler.txt' % outfilebase))
+            archive_output(spoiler_directory)
 
+        archive.close()
         zipfilename = output_path(f"AP_{multiworld.seed_name}.zip")
         logger.info(f"Creating final archive at {zipfilename}")
-        with zipfile.ZipFile(zipfilename, mode="w", compression=zipfile.ZIP_DEFLATED,
-                             compresslevel=9) as zf:
-            for file in os.scandir(temp_dir):
-                zf.write(file.path, arcname=file.name)
+        shutil.move(archive_path, zipfilename)
 
     logger.info('Done. Enjoy. Total Time: %s', time.perf_counter() - start)
     return multiworld
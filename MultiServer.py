@@ -9,13 +9,16 @@ import datetime
 import functools
 import hashlib
 import inspect
+import io
 import itertools
 import logging
 import math
 import operator
+import os
 import pickle
 import random
 import shlex
+import struct
 import threading
 import time
 import typing
@@ -41,7 +44,7 @@ except ImportError:
 
 import NetUtils
 import Utils
-from Utils import version_tuple, restricted_loads, Version, async_start, get_intended_text
+from Utils import version_tuple, restricted_load, restricted_loads, Version, async_start, get_intended_text
 from NetUtils import Endpoint, ClientStatus, NetworkItem, decode, encode, NetworkPlayer, Permission, NetworkSlot, \
     SlotType, LocationStore, MultiData, Hint, HintStatus
 from BaseClasses import ItemClassification
@@ -131,6 +134,8 @@ modify_functions = {
     "pop": pop_from_container,
     "update": update_container_unique,
 }
+# operations that modify the value they are applied to, instead of returning a new value
+in_place_modify_functions = {"remove", "pop", "update"}
 
 
 def get_saving_second(seed_name: str, interval: int = 60) -> int:
@@ -139,6 +144,68 @@ def get_saving_second(seed_name: str, interval: int = 60) -> int:
     return int(hashlib.sha256(seed_name.encode()).hexdigest(), 16) % interval
 
 
+def coalesce_encoded_msgs(msgs: typing.List[str | bytes], frame_size: int) -> typing.Iterator[str | bytes]:
+    """
+    Joins encoded lists of messages into as few lists as possible that are at most frame_size long.
+    Lists that are longer than frame_size on their own are kept as they are, JSON and binary lists are not joined.
+    """
+    if len(msgs) == 1:
+        yield msgs[0]
+        return
+    frame: typing.List[str | bytes] = []
+    size = 0
+    for msg in msgs:
+        if NetUtils.is_empty_encoded_msgs(msg):
+            continue
+        if frame and (size + len(msg) > frame_size or type(msg) is not type(frame[0])):
+            yield frame[0] if len(frame) == 1 else NetUtils.join_encoded_msgs(frame)
+            frame = []
+            size = 0
+        frame.append(msg)
+        size += len(msg)
+    if frame:
+        yield frame[0] if len(frame) == 1 else NetUtils.join_encoded_msgs(frame)
+
+
+class SaveJournalBaseline(typing.NamedTuple):
+    """What was saved of the parts of a save that are journaled as changes, see Context.get_save_journal_record"""
+    received_items: typing.Dict[typing.Tuple[int, int, bool], int]
+    location_checks: typing.Dict[team_slot, int]
+    hints: typing.Dict[team_slot, typing.FrozenSet[Hint]]
+    random_state: typing.Any
+
+
+# generation of the snapshot the record belongs to, and size of the record
+save_journal_header = struct.Struct("<II")
+
+
+def read_save_journal(file: typing.BinaryIO, generation: int,
+                      logger: logging.Logger = logging.getLogger()) -> typing.Iterator[dict]:
+    """Yields the records of a journal file that were written after the snapshot of generation."""
+    while header := file.read(save_journal_header.size):
+        record_generation, size = save_journal_header.unpack(header) \
+            if len(header) == save_journal_header.size else (0, 0)
+        data = file.read(size)
+        if not size or len(data) != size:
+            logger.warning("Save journal ends in an incomplete record, it was likely interrupted while saving.")
+            return
+        if record_generation == generation:
+            yield restricted_loads(zlib.decompress(data))
+
+
+def apply_save_journal(save: dict, records: typing.Iterable[dict]) -> dict:
+    """Applies journal records to the save snapshot they were written after, in order."""
+    for record in records:
+        for key, (start, items) in record["received_items"].items():
+            save["received_items"].setdefault(key, [])[start:] = items
+        save["location_checks"].update(record["location_checks"])
+        save["hints"].update(record["hints"])
+        save["stored_data"].update(record["stored_data"])
+        save.update((key, value) for key, value in record.items()
+                    if key not in {"received_items", "location_checks", "hints", "stored_data"})
+    return save
+
+
 class Client(Endpoint):
     __slots__ = (
         "__weakref__",
@@ -155,6 +222,7 @@ class Client(Endpoint):
         "no_items",
         "no_locations",
         "no_text",
+        "notify_keys",
     )
 
     version: Version
@@ -170,6 +238,8 @@ class Client(Endpoint):
     no_items: bool
     no_locations: bool
     no_text: bool
+    notify_keys: set[str]
+    """data storage keys this client subscribed to with SetNotify"""
 
     def __init__(self, socket: "ServerConnection", ctx: Context) -> None:
         super().__init__(socket)
@@ -186,6 +256,7 @@ class Client(Endpoint):
         self.no_items = False
         self.no_locations = False
         self.no_text = False
+        self.notify_keys = set()
 
     @property
     def items_handling(self):
@@ -231,9 +302,13 @@ class Context:
     endpoints: list[Client]
     locations: LocationStore  # typing.Dict[int, typing.Dict[int, typing.Tuple[int, int, int]]]
     location_checks: typing.Dict[typing.Tuple[int, int], typing.Set[int]]
+    # (team, slot, remote) -> items received, see send_items_to
+    received_items: typing.Dict[typing.Tuple[int, int, bool], typing.List[NetworkItem]]
     hints_used: typing.Dict[typing.Tuple[int, int], int]
     groups: typing.Dict[int, typing.Set[int]]
     save_version = 2
+    save_filename: typing.Optional[str]
+    save_generation: int
     stored_data: typing.Dict[str, object]
     read_data: typing.Dict[str, object]
     stored_data_notification_clients: typing.Dict[str, typing.Set[Client]]
@@ -284,6 +359,13 @@ class Context:
         self.location_check_points = location_check_points
         self.hints_used = collections.defaultdict(int)
         self.hints: typing.Dict[team_slot, typing.Set[Hint]] = collections.defaultdict(set)
+        # the hints of each slot for its own locations, by location, see get_hint
+        self.hint_index: typing.Dict[team_slot, typing.Dict[int, Hint]] = collections.defaultdict(dict)
+        # (order, finding slot, location, item, receiving slot, flags) by item and receiving slot, see find_item
+        self.item_locations: typing.Optional[
+            typing.Dict[typing.Tuple[int, int], typing.List[typing.Tuple[int, int, int, int, int, int]]]] = None
+        # names of a game's items or locations and groups by their lower case version, see get_intended_name
+        self.lowered_names: typing.Dict[typing.Tuple[str, bool], typing.Dict[str, typing.List[str]]] = {}
         self.release_mode: str = release_mode
         self.remaining_mode: str = remaining_mode
         self.collect_mode: str = collect_mode
@@ -303,6 +385,16 @@ class Context:
         self.auto_save_interval = 60  # in seconds
         self.auto_saver_thread: typing.Optional[threading.Thread] = None
         self.save_dirty = False
+        # messages queued per endpoint, sent together once per event loop iteration, see queue_encoded_msgs
+        self.outbound: typing.Dict[Endpoint, typing.List[str]] = {}
+        self.outbound_flush: typing.Optional[asyncio.Handle] = None
+        # slots that received items since the last send_new_items
+        self.dirty_receivers: typing.Set[team_slot] = set()
+        # saves are a snapshot followed by a journal of what changed, see _save
+        self.save_generation = 0
+        self.save_journal_baseline: typing.Optional[SaveJournalBaseline] = None
+        self.save_snapshot_size = 0
+        self.save_journal_size = 0
         self.tags = ['AP']
         self.games: typing.Dict[int, str] = {}
         self.minimum_client_versions: typing.Dict[int, Version] = {}
@@ -311,7 +403,9 @@ class Context:
         self.group_collected: typing.Dict[int, typing.Set[int]] = {}
         self.random = random.Random()
         self.stored_data = {}
-        self.stored_data_notification_clients = collections.defaultdict(weakref.WeakSet)
+        self.changed_stored_data_keys: typing.Set[str] = set()
+        # clients are removed from the sets they subscribed to on disconnect, keys without subscribers are removed
+        self.stored_data_notification_clients = {}
         self.read_data = {}
         self.spheres = []
 
@@ -333,19 +427,22 @@ class Context:
     # Data package retrieval
     def _load_game_data(self):
         import worlds
-        self.gamespackage = worlds.network_data_package["games"]
-
-        self.item_name_groups = {world_name: world.item_name_groups for world_name, world in
-                                 worlds.AutoWorldRegister.world_types.items()}
-        self.location_name_groups = {world_name: world.location_name_groups for world_name, world in
-                                     worlds.AutoWorldRegister.world_types.items()}
-        for world_name, world in worlds.AutoWorldRegister.world_types.items():
-            self.non_hintable_names[world_name] = world.hint_blacklist
-
-        for game_package in self.gamespackage.values():
-            # remove groups from data sent to clients
-            del game_package["item_name_groups"]
-            del game_package["location_name_groups"]
+        games = worlds.network_data_package["games"]
+
+        # taken from the world index, so worlds don't have to be imported
+        self.item_name_groups = {world_name: {group: frozenset(names) for group, names in
+                                              game_package["item_name_groups"].items()}
+                                 for world_name, game_package in games.items()}
+        self.location_name_groups = {world_name: {group: frozenset(names) for group, names in
+                                                  game_package["location_name_groups"].items()}
+                                     for world_name, game_package in games.items()}
+        for world_name, entry in worlds.world_index.items():
+            self.non_hintable_names[world_name] = frozenset(entry["hint_blacklist"])
+
+        # remove groups from data sent to clients
+        self.gamespackage = {world_name: {key: value for key, value in game_package.items()
+                                          if key not in {"item_name_groups", "location_name_groups"}}
+                             for world_name, game_package in games.items()}
 
     def _init_game_data(self):
         for game_name, game_package in self.gamespackage.items():
@@ -374,28 +471,39 @@ class Context:
         return self.gamespackage[game]["location_name_to_id"] if game in self.gamespackage else None
 
     # General networking
+    outbound_frame_size = 64 * 1024  # close to the compression window of per-message deflate
+    outbound_write_limit = 1024 * 1024  # buffered bytes at which a client is too slow to send more to for now
+    outbound_retry_delay = 0.1  # seconds
+    # data storage quotas, Set commands that would exceed them are refused
+    stored_data_max_keys = 100_000
+    stored_data_max_length = 1_000_000  # of a str, list or dict value
+
+    def encode_msgs(self, msgs: typing.Iterable[dict], encoding: str) -> str | bytes:
+        """Encodes msgs for endpoints that use encoding, see Endpoint.encoding"""
+        return self.dumper(msgs) if encoding == "json" else NetUtils.encode_binary(msgs)
+
     async def send_msgs(self, endpoint: Endpoint, msgs: typing.Iterable[dict]) -> bool:
         if not endpoint.socket or not endpoint.socket.open:
             return False
-        msg = self.dumper(msgs)
-        try:
-            await endpoint.socket.send(msg)
-        except websockets.ConnectionClosed:
-            self.logger.exception(f"Exception during send_msgs, could not send {msg}")
-            await self.disconnect(endpoint)
-            return False
-        else:
-            if self.log_network:
-                self.logger.info(f"Outgoing message: {msg}")
-            return True
+        return await self.send_encoded_msgs(endpoint, self.encode_msgs(msgs, endpoint.encoding))
 
-    async def send_encoded_msgs(self, endpoint: Endpoint, msg: str) -> bool:
+    async def send_encoded_msgs(self, endpoint: Endpoint, msg: str | bytes) -> bool:
         if not endpoint.socket or not endpoint.socket.open:
             return False
+        queued = self.outbound.pop(endpoint, None)
+        if queued:
+            # anything queued for this endpoint goes out first, to keep the order messages were sent in
+            queued.append(msg)
+            frames = list(coalesce_encoded_msgs(queued, self.outbound_frame_size))
+            msg = frames.pop()
+        else:
+            frames = []
         try:
+            for frame in frames:
+                await endpoint.socket.send(frame)
             await endpoint.socket.send(msg)
         except websockets.ConnectionClosed:
-            self.logger.exception("Exception during send_encoded_msgs")
+            self.logger.exception(f"Exception during send_encoded_msgs, could not send {msg}")
             await self.disconnect(endpoint)
             return False
         else:
@@ -403,6 +511,63 @@ class Context:
                 self.logger.info(f"Outgoing message: {msg}")
             return True
 
+    def queue_msgs(self, endpoint: Endpoint, msgs: typing.Iterable[typing.Dict[str, typing.Any]]) -> None:
+        if endpoint.socket and endpoint.socket.open:
+            self.queue_encoded_msgs((endpoint,), self.encode_msgs(msgs, endpoint.encoding))
+
+    def queue_encoded_msgs(self, endpoints: typing.Iterable[Endpoint], msg: str | bytes) -> None:
+        """
+        Queues an encoded list of messages for each endpoint. Everything queued for an endpoint is sent in one frame
+        once the current event loop iteration is done, frames for multiple endpoints that are the same are only
+        compressed and written once per endpoint.
+        Endpoints that use another encoding than msg get it re-encoded, prefer broadcast for those.
+        """
+        outbound = self.outbound
+        encoding = "json" if isinstance(msg, str) else NetUtils.binary_encoding
+        reencoded: typing.Dict[str, str | bytes] = {}
+        for endpoint in endpoints:
+            if endpoint.socket and endpoint.socket.open:
+                if endpoint.encoding == encoding:
+                    endpoint_msg = msg
+                elif endpoint.encoding in reencoded:
+                    endpoint_msg = reencoded[endpoint.encoding]
+                else:
+                    endpoint_msg = reencoded[endpoint.encoding] = \
+                        self.encode_msgs(NetUtils.decode_frame(msg), endpoint.encoding)
+                queued = outbound.get(endpoint)
+                if queued is None:
+                    outbound[endpoint] = [endpoint_msg]
+                else:
+                    queued.append(endpoint_msg)
+        if outbound and not self.outbound_flush:
+            self.outbound_flush = asyncio.get_running_loop().call_soon(self.flush_outbound)
+
+    def flush_outbound(self) -> None:
+        """Sends everything queued by queue_encoded_msgs, except to clients that are still busy receiving."""
+        self.outbound_flush = None
+        outbound, self.outbound = self.outbound, {}
+        # the nth frame of each endpoint is sent with the nth frames of the other endpoints, to keep them in order
+        frame_rounds: typing.List[typing.Dict[str | bytes, typing.List[ServerConnection]]] = []
+        for endpoint, msgs in outbound.items():
+            socket = endpoint.socket
+            if not socket or not socket.open:
+                continue
+            if socket.transport.get_write_buffer_size() > self.outbound_write_limit:
+                self.outbound[endpoint] = msgs
+                continue
+            for frame_round, frame in enumerate(coalesce_encoded_msgs(msgs, self.outbound_frame_size)):
+                if frame_round == len(frame_rounds):
+                    frame_rounds.append({})
+                frame_rounds[frame_round].setdefault(frame, []).append(socket)
+        for frames in frame_rounds:
+            for frame, sockets in frames.items():
+                websockets.broadcast(sockets, frame)
+                if self.log_network:
+                    self.logger.info(f"Outgoing message to {len(sockets)} clients: {frame}")
+        if self.outbound:
+            self.outbound_flush = asyncio.get_running_loop().call_later(self.outbound_retry_delay,
+                                                                        self.flush_outbound)
+
     async def broadcast_send_encoded_msgs(self, endpoints: typing.Iterable[Endpoint], msg: str) -> bool:
         sockets = []
         for endpoint in endpoints:
@@ -420,13 +585,12 @@ class Context:
 
     def broadcast_all(self, msgs: typing.List[dict]):
         msg_is_text = all(msg["cmd"] == "PrintJSON" for msg in msgs)
-        data = self.dumper(msgs)
         endpoints = (
             endpoint
             for endpoint in self.endpoints
             if endpoint.auth and not (msg_is_text and endpoint.no_text)
         )
-        async_start(self.broadcast_send_encoded_msgs(endpoints, data))
+        self.broadcast(endpoints, msgs)
 
     def broadcast_text_all(self, text: str, additional_arguments: dict = {}):
         self.logger.info("Notice (all): %s" % text)
@@ -434,37 +598,56 @@ class Context:
 
     def broadcast_team(self, team: int, msgs: typing.List[dict]):
         msg_is_text = all(msg["cmd"] == "PrintJSON" for msg in msgs)
-        data = self.dumper(msgs)
         endpoints = (
             endpoint
             for endpoint in itertools.chain.from_iterable(self.clients[team].values())
             if not (msg_is_text and endpoint.no_text)
         )
-        async_start(self.broadcast_send_encoded_msgs(endpoints, data))
+        self.broadcast(endpoints, msgs)
 
-    def broadcast(self, endpoints: typing.Iterable[Client], msgs: typing.List[dict]):
-        msgs = self.dumper(msgs)
-        async_start(self.broadcast_send_encoded_msgs(endpoints, msgs))
+    def broadcast(self, endpoints: typing.Iterable[Endpoint],
+                  msgs: typing.List[typing.Dict[str, typing.Any]]) -> None:
+        """Queues msgs like queue_encoded_msgs, encoded once per encoding that is used by any of the endpoints."""
+        outbound = self.outbound
+        encoded: typing.Dict[str, str | bytes] = {}
+        for endpoint in endpoints:
+            if endpoint.socket and endpoint.socket.open:
+                msg = encoded.get(endpoint.encoding)
+                if msg is None:
+                    msg = encoded[endpoint.encoding] = self.encode_msgs(msgs, endpoint.encoding)
+                queued = outbound.get(endpoint)
+                if queued is None:
+                    outbound[endpoint] = [msg]
+                else:
+                    queued.append(msg)
+        if outbound and not self.outbound_flush:
+            self.outbound_flush = asyncio.get_running_loop().call_soon(self.flush_outbound)
 
     async def disconnect(self, endpoint: Client):
         if endpoint in self.endpoints:
             self.endpoints.remove(endpoint)
         if endpoint.slot and endpoint in self.clients[endpoint.team][endpoint.slot]:
             self.clients[endpoint.team][endpoint.slot].remove(endpoint)
+        for key in endpoint.notify_keys:
+            subscribers = self.stored_data_notification_clients.get(key)
+            if subscribers is not None:
+                subscribers.discard(endpoint)
+                if not subscribers:
+                    del self.stored_data_notification_clients[key]
+        endpoint.notify_keys.clear()
         await on_client_disconnected(self, endpoint)
 
     def notify_client(self, client: Client, text: str, additional_arguments: dict = {}):
         if not client.auth or client.no_text:
             return
         self.logger.info("Notice (Player %s in team %d): %s" % (client.name, client.team + 1, text))
-        async_start(self.send_msgs(client, [{"cmd": "PrintJSON", "data": [{ "text": text }], **additional_arguments}]))
+        self.queue_msgs(client, [{"cmd": "PrintJSON", "data": [{ "text": text }], **additional_arguments}])
 
     def notify_client_multiple(self, client: Client, texts: typing.List[str], additional_arguments: dict = {}):
         if not client.auth or client.no_text:
             return
-        async_start(self.send_msgs(client,
-                                   [{"cmd": "PrintJSON", "data": [{ "text": text }], **additional_arguments}
-                                    for text in texts]))
+        self.queue_msgs(client, [{"cmd": "PrintJSON", "data": [{ "text": text }], **additional_arguments}
+                                 for text in texts])
 
     # loading
     def load(self, multidatapath: str, use_embedded_server_options: bool = False):
@@ -473,23 +656,30 @@ class Context:
             with zipfile.ZipFile(multidatapath) as zf:
                 for file in zf.namelist():
                     if file.endswith(".archipelago"):
-                        data = zf.read(file)
+                        with zf.open(file) as f:
+                            decoded_obj = self.decompress(f)
                         break
                 else:
                     raise Exception("No .archipelago found in archive.")
         else:
             with open(multidatapath, 'rb') as f:
-                data = f.read()
+                decoded_obj = self.decompress(f)
 
-        self._load(self.decompress(data), {}, use_embedded_server_options)
+        self._load(decoded_obj, {}, use_embedded_server_options)
         self.data_filename = multidatapath
 
     @staticmethod
-    def decompress(data: bytes) -> dict:
-        format_version = data[0]
+    def decompress(data: typing.Union[bytes, typing.BinaryIO]) -> dict:
+        """
+        Loads multidata from its bytes, or from a binary file, which is decompressed and unpickled chunk by chunk
+        instead of being decompressed as a whole first.
+        """
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = io.BytesIO(data)
+        format_version = data.read(1)[0]
         if format_version > 3:
             raise Utils.VersionException("Incompatible multidata.")
-        return restricted_loads(zlib.decompress(data[1:]))
+        return restricted_load(io.BufferedReader(Utils.ZlibReader(data)))
 
     def _load(self, decoded_obj: MultiData, game_data_packages: typing.Dict[str, typing.Any],
               use_embedded_server_options: bool):
@@ -533,7 +723,10 @@ class Context:
         self.seed_name = decoded_obj["seed_name"]
         self.random.seed(self.seed_name)
         self.connect_names = decoded_obj['connect_names']
-        self.locations = LocationStore(decoded_obj.pop("locations"))  # pre-emptively free memory
+        locations = decoded_obj.pop("locations")  # pre-emptively free memory
+        # may already be a LocationStore shared with other Contexts of the same seed, which don't modify it
+        self.locations = locations if isinstance(locations, LocationStore) else LocationStore(locations)
+        self.item_locations = None
         self.slot_data = decoded_obj['slot_data']
         for slot, data in self.slot_data.items():
             self.read_data[f"slot_data_{slot}"] = lambda data=data: data
@@ -546,6 +739,7 @@ class Context:
 
         for slot, hints in decoded_obj["precollected_hints"].items():
             self.hints[0, slot].update(hints)
+            self.index_hints(0, slot)
 
         # declare slots that aren't players as done
         for slot, slot_info in self.slot_info.items():
@@ -591,29 +785,67 @@ class Context:
         return False
 
     def _save(self, exit_save: bool = False) -> bool:
+        """
+        Writes a snapshot of the full save if there is none yet, on exit, or once the journal has grown larger than
+        the snapshot. Otherwise appends only what changed since the last save to the journal.
+        """
         try:
-            # Does not use Utils.restricted_dumps because we'd rather make a save than not make one
-            encoded_save = pickle.dumps(self.get_save())
-            with open(self.save_filename, "wb") as f:
-                f.write(zlib.compress(encoded_save))
+            # taken before the save data, so changes made while saving are journaled again next time
+            baseline = self.get_save_journal_baseline()
+            if exit_save or self.save_journal_baseline is None or self.save_journal_size > self.save_snapshot_size:
+                self.changed_stored_data_keys.clear()
+                self.save_generation += 1
+                self.save_snapshot_size = self._write_save_snapshot(self.get_save())
+                self.save_journal_size = 0
+            else:
+                self.save_journal_size += self._append_save_journal(
+                    self.get_save_journal_record(self.save_journal_baseline))
+            self.save_journal_baseline = baseline
         except Exception as e:
+            self.save_journal_baseline = None  # journal may be missing changes, next save is a snapshot
             self.logger.exception(e)
             return False
         else:
             return True
 
+    @property
+    def save_journal_filename(self) -> str:
+        return self.save_filename + ".journal"
+
+    def _write_save_snapshot(self, save: dict) -> int:
+        """Writes the full save and discards the journal, returns the size written."""
+        # Does not use Utils.restricted_dumps because we'd rather make a save than not make one
+        encoded_save = zlib.compress(pickle.dumps(save))
+        with open(self.save_filename + ".tmp", "wb") as f:
+            f.write(encoded_save)
+        os.replace(self.save_filename + ".tmp", self.save_filename)
+        with open(self.save_journal_filename, "wb"):
+            pass
+        return len(encoded_save)
+
+    def _append_save_journal(self, record: dict) -> int:
+        """Appends a record to the journal of the current snapshot, returns the size written."""
+        encoded_record = zlib.compress(pickle.dumps(record))
+        with open(self.save_journal_filename, "ab") as f:
+            f.write(save_journal_header.pack(self.save_generation, len(encoded_record)))
+            f.write(encoded_record)
+        return save_journal_header.size + len(encoded_record)
+
     def init_save(self, enabled: bool = True):
         self.saving = enabled
         if self.saving:
             if not self.save_filename:
-                import os
                 name, ext = os.path.splitext(self.data_filename)
                 self.save_filename = name + '.apsave' if ext.lower() in ('.archipelago', '.zip') \
                     else self.data_filename + '_' + 'apsave'
             try:
                 with open(self.save_filename, 'rb') as f:
                     save_data = restricted_loads(zlib.decompress(f.read()))
-                    self.set_save(save_data)
+                if os.path.exists(self.save_journal_filename):
+                    with open(self.save_journal_filename, "rb") as f:
+                        apply_save_journal(save_data, read_save_journal(f, save_data.get("journal_generation", 0),
+                                                                        self.logger))
+                self.set_save(save_data)
             except FileNotFoundError:
                 self.logger.error('No save data found, starting a new game')
             except Exception as e:
@@ -651,34 +883,71 @@ class Context:
                 import atexit
                 atexit.register(self._save, True)  # make sure we save on exit too
 
-    def get_save(self) -> dict:
+    def get_save(self) -> typing.Dict[str, typing.Any]:
         self.recheck_hints()
         d = {
-            "version": self.save_version,
             "connect_names": self.connect_names,
             "received_items": self.received_items,
-            "hints_used": dict(self.hints_used),
             "hints": dict(self.hints),
             "location_checks": dict(self.location_checks),
+            "random_state": self.random.getstate(),
+            "stored_data": self.stored_data,
+            **self._get_save_state(),
+        }
+
+        return d
+
+    def _get_save_state(self) -> dict:
+        """The parts of a save that are small enough to be saved in full by every journal record as well."""
+        return {
+            "version": self.save_version,
+            "hints_used": dict(self.hints_used),
             "name_aliases": self.name_aliases,
             "client_game_state": dict(self.client_game_state),
             "client_activity_timers": tuple(
                 (key, value.timestamp()) for key, value in self.client_activity_timers.items()),
             "client_connection_timers": tuple(
                 (key, value.timestamp()) for key, value in self.client_connection_timers.items()),
-            "random_state": self.random.getstate(),
             "group_collected": dict(self.group_collected),
-            "stored_data": self.stored_data,
+            "journal_generation": self.save_generation,
             "game_options": {"hint_cost": self.hint_cost, "location_check_points": self.location_check_points,
                              "server_password": self.server_password, "password": self.password,
                              "release_mode": self.release_mode,
                              "remaining_mode": self.remaining_mode, "collect_mode": self.collect_mode,
                              "countdown_mode": self.countdown_mode,
                              "item_cheat": self.item_cheat, "compatibility": self.compatibility}
-
         }
 
-        return d
+    def get_save_journal_baseline(self) -> SaveJournalBaseline:
+        return SaveJournalBaseline(
+            {key: len(items) for key, items in self.received_items.items()},
+            {key: len(locations) for key, locations in self.location_checks.items()},
+            {key: frozenset(hints) for key, hints in self.hints.items()},
+            self.random.getstate(),
+        )
+
+    def get_save_journal_record(self, baseline: SaveJournalBaseline) -> dict:
+        """
+        Like get_save, but received items, location checks, hints and stored data are only what changed since
+        baseline, and the random state only if it changed. Records are applied with apply_save_journal.
+        """
+        self.recheck_hints()
+        changed_stored_data_keys, self.changed_stored_data_keys = self.changed_stored_data_keys, set()
+        record = {
+            "received_items": {
+                key: (baseline.received_items.get(key, 0), items[baseline.received_items.get(key, 0):])
+                for key, items in self.received_items.items() if len(items) != baseline.received_items.get(key, 0)
+            },
+            "location_checks": {key: locations for key, locations in self.location_checks.items()
+                                if len(locations) != baseline.location_checks.get(key, 0)},
+            "hints": {key: hints for key, hints in self.hints.items() if hints != baseline.hints.get(key)},
+            "stored_data": {key: self.stored_data[key] for key in changed_stored_data_keys if key in self.stored_data},
+            **self._get_save_state(),
+        }
+        random_state = self.random.getstate()
+        if random_state != baseline.random_state:
+            record["random_state"] = random_state
+        return record
 
     def set_save(self, savedata: dict):
         if self.connect_names != savedata["connect_names"]:
@@ -688,6 +957,8 @@ class Context:
         self.received_items = savedata["received_items"]
         self.hints_used.update(savedata["hints_used"])
         self.hints.update(savedata["hints"])
+        for team, slot in savedata["hints"]:
+            self.index_hints(team, slot)
 
         self.name_aliases.update(savedata["name_aliases"])
         self.client_game_state.update(savedata["client_game_state"])
@@ -717,6 +988,7 @@ class Context:
 
         if "stored_data" in savedata:
             self.stored_data = savedata["stored_data"]
+        self.save_generation = savedata.get("journal_generation", 0)
         # count items and slots from lists for items_handling = remote
         self.logger.info(
             f'Loaded save file with {sum([len(v) for k, v in self.received_items.items() if k[2]])} received items '
@@ -730,11 +1002,28 @@ class Context:
         return 0
 
     def recheck_hints(self, team: typing.Optional[int] = None, slot: typing.Optional[int] = None,
-                      changed: typing.Optional[typing.Set[team_slot]] = None) -> None:
+                      changed: typing.Optional[typing.Set[team_slot]] = None,
+                      locations: typing.Optional[typing.Iterable[int]] = None) -> None:
         """Refreshes the hints for the specified team/slot. Providing 'None' for either team or slot
         will refresh all teams or all slots respectively. If a set is passed for 'changed', each (team,slot)
         pair that has at least one hint modified will be added to the set.
+        If team, slot and 'locations' are passed, only the hints for these locations of the slot are refreshed,
+        as these are the only ones that can change when the slot checks them.
         """
+        if team is not None and slot is not None and locations is not None:
+            for location in locations:
+                hint = self.get_hint(team, slot, location)
+                if not hint:
+                    continue
+                new_hint = hint.re_check(self, team)
+                if hint == new_hint:
+                    continue
+                for player in self.slot_set(hint.receiving_player) | {hint.finding_player}:
+                    if changed is not None:
+                        changed.add((team, player))
+                    self.replace_hint(team, player, hint, new_hint)
+            return
+
         for hint_team, hint_slot in self.hints:
             if team != hint_team and team is not None:
                 continue  # Check specified team only, all if team is None
@@ -752,6 +1041,7 @@ class Context:
                     if slot is not None and slot != player:
                         self.replace_hint(hint_team, player, hint, new_hint)
             self.hints[hint_team, hint_slot] = new_hints
+            self.index_hints(hint_team, hint_slot)
 
     def get_rechecked_hints(self, team: int, slot: int):
         self.recheck_hints(team, slot)
@@ -823,6 +1113,7 @@ class Context:
                 # we can check once if hint already exists
                 if hint not in self.hints[team, hint.finding_player]:
                     self.hints[team, hint.finding_player].add(hint)
+                    self.hint_index[team, hint.finding_player].setdefault(hint.location, hint)
                     new_hint_events.add(hint.finding_player)
                     for player in self.slot_set(hint.receiving_player):
                         self.hints[team, player].add(hint)
@@ -837,19 +1128,58 @@ class Context:
                 if not clients:
                     continue
                 client_hints = [datum[1] for datum in sorted(hint_data, key=lambda x: x[0].finding_player != slot)]
-                for client in clients:
-                    async_start(self.send_msgs(client, client_hints))
+                self.broadcast(clients, client_hints)
 
     def get_hint(self, team: int, finding_player: int, seeked_location: int) -> typing.Optional[Hint]:
-        for hint in self.hints[team, finding_player]:
-            if hint.location == seeked_location and hint.finding_player == finding_player:
-                return hint
-        return None
+        return self.hint_index[team, finding_player].get(seeked_location, None)
+
+    def index_hints(self, team: int, slot: int) -> None:
+        """Rebuilds the index used by get_hint for a slot, after its set of hints was replaced."""
+        self.hint_index[team, slot] = {hint.location: hint for hint in self.hints[team, slot]
+                                       if hint.finding_player == slot}
     
     def replace_hint(self, team: int, slot: int, old_hint: Hint, new_hint: Hint) -> None:
         if old_hint in self.hints[team, slot]:
             self.hints[team, slot].remove(old_hint)
             self.hints[team, slot].add(new_hint)
+            if old_hint.finding_player == slot:
+                self.hint_index[team, slot][old_hint.location] = new_hint
+
+    def find_item(self, slots: typing.Set[int], seeked_item_id: int
+                  ) -> typing.List[typing.Tuple[int, int, int, int, int]]:
+        """Same as LocationStore.find_item, but looked up in an index that is built on first use."""
+        if self.item_locations is None:
+            item_locations = collections.defaultdict(list)
+            order = 0
+            for finding_player, check_data in self.locations.items():
+                for location_id, (item_id, receiving_player, item_flags) in check_data.items():
+                    item_locations[item_id, receiving_player].append(
+                        (order, finding_player, location_id, item_id, receiving_player, item_flags))
+                    order += 1
+            self.item_locations = dict(item_locations)
+        found = [entry for slot in slots for entry in self.item_locations.get((seeked_item_id, slot), ())]
+        if len(slots) > 1:
+            found.sort()  # in the order of the LocationStore
+        return [entry[1:] for entry in found]
+
+    def get_intended_name(self, input_text: str, game: str, for_location: bool) -> typing.Tuple[str, bool, str]:
+        """
+        get_intended_text for the item or location names and groups of a game,
+        with perfect matches looked up instead of compared to each name.
+        """
+        names = self.all_location_and_group_names[game] if for_location else self.all_item_and_group_names[game]
+        if len(names) > 1:
+            if input_text in names:
+                return input_text, True, "Perfect Match"
+            lowered_names = self.lowered_names.get((game, for_location), None)
+            if lowered_names is None:
+                lowered_names = self.lowered_names[game, for_location] = collections.defaultdict(list)
+                for name in names:
+                    lowered_names[name.lower()].append(name)
+            matches = lowered_names.get(input_text.lower(), ())
+            if len(matches) == 1:
+                return matches[0], True, "Case Insensitive Perfect Match"
+        return get_intended_text(input_text, names)
     
     # "events"
 
@@ -872,24 +1202,22 @@ class Context:
 
     def on_changed_hints(self, team: int, slot: int):
         key: str = f"_read_hints_{team}_{slot}"
-        targets: typing.Set[Client] = set(self.stored_data_notification_clients[key])
+        targets: typing.Set[Client] = self.stored_data_notification_clients.get(key, set())
         if targets:
             self.broadcast(targets, [{"cmd": "SetReply", "key": key, "value": self.hints[team, slot]}])
 
     def on_client_status_change(self, team: int, slot: int):
         key: str = f"_read_client_status_{team}_{slot}"
-        targets: typing.Set[Client] = set(self.stored_data_notification_clients[key])
+        targets: typing.Set[Client] = self.stored_data_notification_clients.get(key, set())
         if targets:
             self.broadcast(targets, [{"cmd": "SetReply", "key": key, "value": self.client_game_state[team, slot]}])
 
 
 def update_aliases(ctx: Context, team: int):
-    cmd = ctx.dumper([{"cmd": "RoomUpdate",
-                       "players": ctx.get_players_package()}])
+    cmd = [{"cmd": "RoomUpdate",
+            "players": ctx.get_players_package()}]
 
-    for clients in ctx.clients[team].values():
-        for client in clients:
-            async_start(ctx.send_encoded_msgs(client, cmd))
+    ctx.broadcast(itertools.chain.from_iterable(ctx.clients[team].values()), cmd)
 
 
 async def server(websocket: "ServerConnection", path: str = "/", ctx: Context = None) -> None:
@@ -905,7 +1233,7 @@ async def server(websocket: "ServerConnection", path: str = "/", ctx: Context =
         async for data in websocket:
             if ctx.log_network:
                 ctx.logger.info(f"Incoming message: {data}")
-            for msg in decode(data):
+            for msg in NetUtils.decode_frame(data):
                 await process_client_cmd(ctx, client, msg)
     except Exception as e:
         if not isinstance(e, websockets.WebSocketException):
@@ -1066,20 +1394,24 @@ def get_start_inventory(ctx: Context, player: int, remote_start_inventory: bool)
 
 
 def send_new_items(ctx: Context):
-    for team, clients in ctx.clients.items():
-        for slot, clients in clients.items():
-            for client in clients:
-                if client.no_items:
-                    continue
-                start_inventory = get_start_inventory(ctx, slot, client.remote_start_inventory)
-                items = get_received_items(ctx, team, slot, client.remote_items)
-                if len(start_inventory) + len(items) > client.send_index:
-                    first_new_item = max(0, client.send_index - len(start_inventory))
-                    async_start(ctx.send_msgs(client, [{
-                        "cmd": "ReceivedItems",
-                        "index": client.send_index,
-                        "items": start_inventory[client.send_index:] + items[first_new_item:]}]))
-                    client.send_index = len(start_inventory) + len(items)
+    """Sends the items received since the last call to the clients of the slots that received them."""
+    dirty_receivers, ctx.dirty_receivers = ctx.dirty_receivers, set()
+    for team, slot in dirty_receivers:
+        for client in ctx.clients[team][slot]:
+            if client.no_items:
+                continue
+            start_inventory = get_start_inventory(ctx, slot, client.remote_start_inventory)
+            items = get_received_items(ctx, team, slot, client.remote_items)
+            if len(start_inventory) + len(items) > client.send_index:
+                if client.send_index >= len(start_inventory):
+                    new_items = items[client.send_index - len(start_inventory):]
+                else:
+                    new_items = start_inventory[client.send_index:] + items
+                ctx.queue_msgs(client, [{
+                    "cmd": "ReceivedItems",
+                    "index": client.send_index,
+                    "items": new_items}])
+                client.send_index = len(start_inventory) + len(items)
 
 
 def update_checked_locations(ctx: Context, team: int, slot: int):
@@ -1123,6 +1455,7 @@ def get_remaining(ctx: Context, team: int, slot: int) -> typing.List[typing.Tupl
 
 def send_items_to(ctx: Context, team: int, target_slot: int, *items: NetworkItem):
     for target in ctx.slot_set(target_slot):
+        ctx.dirty_receivers.add((team, target))
         for item in items:
             if item.player != target_slot:
                 get_received_items(ctx, team, target, False).append(item)
@@ -1171,7 +1504,7 @@ def register_location_checks(ctx: Context, team: int, slot: int, locations: typi
             "checked_locations": new_locations,  # send back new checks only
         }])
         updated_slots: typing.Set[tuple[int, int]] = set()
-        ctx.recheck_hints(team, slot, updated_slots)
+        ctx.recheck_hints(team, slot, updated_slots, new_locations)
         for hint_team, hint_slot in updated_slots:
             ctx.on_changed_hints(hint_team, hint_slot)
         ctx.save()
@@ -1192,7 +1525,7 @@ def collect_hints(ctx: Context, team: int, slot: int, item: typing.Union[int, st
 
     seeked_item_id = item if isinstance(item, int) else ctx.item_names_for_game(ctx.games[slot])[item]
     for finding_player, location_id, item_id, receiving_player, item_flags \
-            in ctx.locations.find_item(slots, seeked_item_id):
+            in ctx.find_item(slots, seeked_item_id):
         prev_hint = ctx.get_hint(team, finding_player, location_id)
         if prev_hint:
             hints.append(prev_hint)
@@ -1666,6 +1999,7 @@ class ClientMessageProcessor(CommonCommandProcessor):
                 new_item = NetworkItem(names[item_name], -1, self.client.slot)
                 get_received_items(self.ctx, self.client.team, self.client.slot, False).append(new_item)
                 get_received_items(self.ctx, self.client.team, self.client.slot, True).append(new_item)
+                self.ctx.dirty_receivers.add((self.client.team, self.client.slot))
                 self.ctx.broadcast_text_all(
                     'Cheat console: sending "' + item_name + '" to ' + self.ctx.get_aliased_name(self.client.team,
                                                                                                  self.client.slot),
@@ -1686,6 +2020,7 @@ class ClientMessageProcessor(CommonCommandProcessor):
             hints = {hint.re_check(self.ctx, self.client.team) for hint in
                      self.ctx.hints[self.client.team, self.client.slot]}
             self.ctx.hints[self.client.team, self.client.slot] = hints
+            self.ctx.index_hints(self.client.team, self.client.slot)
             self.ctx.notify_hints(self.client.team, list(hints), recipients=(self.client.slot,))
             self.output(f"A hint costs {self.ctx.get_hint_cost(self.client.slot)} points. "
                         f"You have {points_available} points.")
@@ -1716,10 +2051,7 @@ class ClientMessageProcessor(CommonCommandProcessor):
             if game not in self.ctx.all_item_and_group_names:
                 self.output("Can't look up item/location for unknown game. Hint for ID instead.")
                 return False
-            names = self.ctx.all_location_and_group_names[game] \
-                if for_location else \
-                self.ctx.all_item_and_group_names[game]
-            hint_name, usable, response = get_intended_text(input_text, names)
+            hint_name, usable, response = self.ctx.get_intended_name(input_text, game, for_location)
 
             if usable:
                 if hint_name in self.ctx.non_hintable_names[game]:
@@ -1843,7 +2175,7 @@ def get_slot_points(ctx: Context, team: int, slot: int) -> int:
             ctx.get_hint_cost(slot) * ctx.hints_used[team, slot])
 
 
-async def process_client_cmd(ctx: Context, client: Client, args: dict):
+async def process_client_cmd(ctx: Context, client: Client, args: typing.Dict[str, typing.Any]) -> None:
     try:
         cmd: str = args["cmd"]
     except:
@@ -1908,6 +2240,9 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
             client.no_locations = bool(client.tags & _non_game_messages.keys())
             # set NoText for old PopTracker clients that predate the tag to save traffic
             client.no_text = "NoText" in client.tags or ("PopTracker" in client.tags and client.version < (0, 5, 1))
+            # everything from Connected on is sent in the requested encoding, if this server supports it
+            client.encoding = NetUtils.binary_encoding \
+                if NetUtils.binary_encoding and args.get("encoding", "json") == NetUtils.binary_encoding else "json"
             connected_packet = {
                 "cmd": "Connected",
                 "team": client.team, "slot": client.slot,
@@ -2142,12 +2477,15 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
             tags = set(args.get("tags", []))
             slots = set(args.get("slots", []))
             args["cmd"] = "Bounced"
-            msg = ctx.dumper([args])
+            encoded: typing.Dict[str, str | bytes] = {}
 
             for bounceclient in ctx.endpoints:
                 if client.team == bounceclient.team and (ctx.games[bounceclient.slot] in games or
                                                          set(bounceclient.tags) & tags or
                                                          bounceclient.slot in slots):
+                    msg = encoded.get(bounceclient.encoding)
+                    if msg is None:
+                        msg = encoded[bounceclient.encoding] = ctx.encode_msgs([args], bounceclient.encoding)
                     await ctx.send_encoded_msgs(bounceclient, msg)
 
         elif cmd == "Get":
@@ -2170,18 +2508,39 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
                 await ctx.send_msgs(client, [{'cmd': 'InvalidPacket', "type": "arguments",
                                               "text": 'Set', "original_cmd": cmd}])
                 return
+            key = args["key"]
+            if key not in ctx.stored_data and len(ctx.stored_data) >= ctx.stored_data_max_keys:
+                await ctx.send_msgs(client, [{'cmd': 'InvalidPacket', "type": "arguments",
+                                              "text": f"Set: the data storage is limited to "
+                                                      f"{ctx.stored_data_max_keys} keys",
+                                              "original_cmd": cmd}])
+                return
             args["cmd"] = "SetReply"
-            value = ctx.stored_data.get(args["key"], args.get("default", 0))
-            args["original_value"] = copy.copy(value)
-            args["slot"] = client.slot
+            value = ctx.stored_data.get(key, args.get("default", 0))
+            # operations that modify containers in place need the original value copied, to reply and to undo with
+            if any(operation["operation"] in in_place_modify_functions for operation in args["operations"]):
+                original_value = copy.copy(value)
+            else:
+                original_value = value
             for operation in args["operations"]:
                 func = modify_functions[operation["operation"]]
                 value = func(value, operation["value"])
-            ctx.stored_data[args["key"]] = args["value"] = value
-            targets = set(ctx.stored_data_notification_clients[args["key"]])
-            if args.get("want_reply", False):
-                targets.add(client)
-            if targets:
+            if isinstance(value, (str, list, dict)) and len(value) > ctx.stored_data_max_length:
+                if key in ctx.stored_data:
+                    ctx.stored_data[key] = original_value
+                await ctx.send_msgs(client, [{'cmd': 'InvalidPacket', "type": "arguments",
+                                              "text": f"Set: values in the data storage are limited to a length of "
+                                                      f"{ctx.stored_data_max_length}",
+                                              "original_cmd": cmd}])
+                return
+            args["original_value"] = original_value
+            args["slot"] = client.slot
+            ctx.stored_data[key] = args["value"] = value
+            ctx.changed_stored_data_keys.add(key)
+            targets = ctx.stored_data_notification_clients.get(key)
+            if args.get("want_reply", False) and not (targets and client in targets):
+                ctx.broadcast(itertools.chain(targets or (), (client,)), [args])
+            elif targets:
                 ctx.broadcast(targets, [args])
             ctx.save()
 
@@ -2191,7 +2550,8 @@ async def process_client_cmd(ctx: Context, client: Client, args: dict):
                                               "text": 'SetNotify', "original_cmd": cmd}])
                 return
             for key in args["keys"]:
-                ctx.stored_data_notification_clients[key].add(client)
+                ctx.stored_data_notification_clients.setdefault(key, set()).add(client)
+            client.notify_keys.update(args["keys"])
 
 
 def update_client_status(ctx: Context, client: Client, new_status: ClientStatus):
@@ -2434,7 +2794,7 @@ class ServerCommandProcessor(CommonCommandProcessor):
             if full_name.isnumeric():
                 item, usable, response = int(full_name), True, None
             elif game in self.ctx.all_item_and_group_names:
-                item, usable, response = get_intended_text(full_name, self.ctx.all_item_and_group_names[game])
+                item, usable, response = self.ctx.get_intended_name(full_name, game, False)
             else:
                 self.output("Can't look up item for unknown game. Hint for ID instead.")
                 return False
@@ -2473,7 +2833,7 @@ class ServerCommandProcessor(CommonCommandProcessor):
             if full_name.isnumeric():
                 location, usable, response = int(full_name), True, None
             elif game in self.ctx.all_location_and_group_names:
-                location, usable, response = get_intended_text(full_name, self.ctx.all_location_and_group_names[game])
+                location, usable, response = self.ctx.get_intended_name(full_name, game, True)
             else:
                 self.output("Can't look up location for unknown game. Hint for ID instead.")
                 return False
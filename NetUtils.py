@@ -11,6 +11,11 @@ if typing.TYPE_CHECKING:
 
 from Utils import ByValue, Version
 
+try:
+    import msgpack
+except ImportError:  # the binary encoding is optional, JSON is always available
+    msgpack = None
+
 
 class HintStatus(ByValue, enum.IntEnum):
     HINT_UNSPECIFIED = 0
@@ -172,14 +177,118 @@ def _object_hook(o: typing.Any) -> typing.Any:
 
 decode = JSONDecoder(object_hook=_object_hook).decode
 
+# Binary encoding, which a client can ask for in Connect. Commands are the same as in JSON, but NetworkItem,
+# NetworkPlayer and NetworkSlot are msgpack extension types holding an array of their fields instead of objects.
+binary_encoding: typing.Optional[str] = "msgpack" if msgpack else None
+binary_types: typing.Dict[type, int] = {
+    NetworkItem: 1,
+    NetworkPlayer: 2,
+    NetworkSlot: 3,
+}
+_binary_classes: typing.Dict[int, type] = {code: cls for cls, code in binary_types.items()}
+
+
+def _binary_default(obj: typing.Any) -> typing.Any:
+    code = binary_types.get(type(obj), None)
+    if code:
+        # the fields are simple types, which don't need the strict handling of the outer encoding
+        return msgpack.ExtType(code, msgpack.packb(obj, default=_binary_default))
+    if isinstance(obj, tuple) and hasattr(obj, "_fields"):
+        data = obj._asdict()
+        data["class"] = obj.__class__.__name__
+        return data
+    if isinstance(obj, (tuple, list, set, frozenset)):
+        return list(obj)
+    if isinstance(obj, dict):
+        return dict(obj)
+    # unwrap simple types to their base, such as IntEnum
+    for base in (str, int, float):
+        if isinstance(obj, base):
+            return base(obj)
+    raise TypeError(f"Cannot handle {type(obj)}")
+
+
+def encode_binary(obj: typing.Any) -> bytes:
+    return msgpack.packb(obj, default=_binary_default, strict_types=True)
+
+
+def _json_key(key: typing.Any) -> str:
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    return repr(key)
+
+
+def _binary_object_pairs_hook(pairs: typing.List[typing.Tuple[typing.Any, typing.Any]]) -> typing.Any:
+    # keys are turned into str, like JSON does, so that receivers don't have to care about the encoding
+    return _object_hook({key if type(key) is str else _json_key(key): value for key, value in pairs})
+
+
+def _binary_ext_hook(code: int, data: bytes) -> typing.Any:
+    cls = _binary_classes.get(code, None)
+    if cls:
+        return cls(*msgpack.unpackb(data))
+    return msgpack.ExtType(code, data)
+
+
+def decode_binary(data: bytes) -> typing.Any:
+    return msgpack.unpackb(data, object_pairs_hook=_binary_object_pairs_hook, ext_hook=_binary_ext_hook,
+                           strict_map_key=False)
+
+
+def decode_frame(data: typing.Union[str, bytes]) -> typing.Any:
+    """Decodes a websocket frame, text frames are JSON and binary frames use the binary encoding."""
+    return decode(data) if isinstance(data, str) else decode_binary(data)
+
+
+def join_encoded_msgs(parts: typing.Sequence[typing.AnyStr]) -> typing.AnyStr:
+    """Joins encoded lists of messages, which are all JSON or all binary, into one list."""
+    if isinstance(parts[0], str):
+        return "[" + ",".join(part[1:-1] for part in parts if len(part) > 2) + "]"
+    count = 0
+    bodies: typing.List[bytes] = []
+    for part in parts:
+        part_count, header_size = _binary_list_header(part)
+        count += part_count
+        bodies.append(part[header_size:])
+    if count < 16:
+        header = bytes((0x90 | count,))
+    elif count < 0x10000:
+        header = b"\xdc" + count.to_bytes(2, "big")
+    else:
+        header = b"\xdd" + count.to_bytes(4, "big")
+    return header + b"".join(bodies)
+
+
+def _binary_list_header(data: bytes) -> typing.Tuple[int, int]:
+    """Returns the length of the encoded list and the size of its header."""
+    first = data[0]
+    if first & 0xf0 == 0x90:
+        return first & 0x0f, 1
+    if first == 0xdc:
+        return int.from_bytes(data[1:3], "big"), 3
+    if first == 0xdd:
+        return int.from_bytes(data[1:5], "big"), 5
+    raise ValueError("Encoded messages are not a list")
+
+
+def is_empty_encoded_msgs(msg: typing.Union[str, bytes]) -> bool:
+    return len(msg) <= 2 if isinstance(msg, str) else msg == b"\x90"
+
 
 class Endpoint:
-    __slots__ = ("socket",)
+    __slots__ = ("socket", "encoding")
 
     socket: "ServerConnection"
+    encoding: str
+    """ "json", or binary_encoding once both sides agreed on it """
 
     def __init__(self, socket):
         self.socket = socket
+        self.encoding = "json"
 
 
 class HandlerMeta(type):
@@ -1,14 +1,18 @@
 from __future__ import annotations
 
+import array
 import asyncio
 import concurrent.futures
 import json
+import mmap
+import struct
 import typing
 import builtins
 import os
 import itertools
 import subprocess
 import sys
+import types
 import pickle
 import functools
 import io
@@ -16,6 +20,7 @@ import collections
 import importlib
 import logging
 import warnings
+import zlib
 
 from argparse import Namespace
 from settings import Settings, get_settings
@@ -353,10 +358,88 @@ def get_file_safe_name(name: str) -> str:
     return "".join(c for c in name if c not in '<>:"/\\|?*')
 
 
+# magic, item count, location count, sizes of item names, location names and the JSON of everything else
+_data_package_header = struct.Struct("<5sIIIII")
+_data_package_magic = b"APDP\x01"
+# name to id tables that are packed as arrays, and the name groups that refer to their names
+_data_package_tables = {"item_name_to_id": "item_name_groups", "location_name_to_id": "location_name_groups"}
+
+
+def data_package_to_bytes(data: typing.Mapping[str, Any]) -> bytes:
+    """
+    Packs the data package of a game into a compact binary format, for caching and for serving it over HTTP.
+    The name to id tables are stored as an array of ids and their names separated by null characters,
+    which unpack much faster than JSON. Anything else is stored as JSON, with the members of name groups stored as
+    their index in the table they are from, unless a group has members that are not in the table.
+    """
+    tables = []
+    rest_data = {key: value for key, value in data.items() if key not in _data_package_tables}
+    for key, groups_key in _data_package_tables.items():
+        table = data.get(key, {})
+        names = "\0".join(table).encode("utf-8")
+        if table and names.count(b"\0") != len(table) - 1:
+            raise ValueError(f"Names in {key} contain null characters")
+        ids = array.array("q", table.values())
+        if sys.byteorder == "big":
+            ids.byteswap()
+        tables.append((len(table), ids.tobytes(), names))
+        if groups_key in rest_data:
+            indices = {name: index for index, name in enumerate(table)}
+            rest_data[groups_key] = {
+                group: [indices[member] for member in members] if indices.keys() >= set(members) else members
+                for group, members in rest_data[groups_key].items()
+            }
+    rest = json.dumps(rest_data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    (item_count, item_ids, item_names), (location_count, location_ids, location_names) = tables
+    header = _data_package_header.pack(_data_package_magic, item_count, location_count,
+                                       len(item_names), len(location_names), len(rest))
+    return b"".join((header, item_ids, location_ids, item_names, location_names, rest))
+
+
+def data_package_from_buffer(buffer: typing.Union[bytes, memoryview, mmap.mmap]) -> Dict[str, Any]:
+    """Unpacks a data package packed by data_package_to_bytes."""
+    with memoryview(buffer) as view:
+        magic, item_count, location_count, *sizes = _data_package_header.unpack_from(view)
+        if magic != _data_package_magic:
+            raise ValueError("Not a packed data package")
+        offset = _data_package_header.size
+        ids = []
+        for count in (item_count, location_count):
+            table_ids = array.array("q")
+            table_ids.frombytes(view[offset:offset + count * table_ids.itemsize])
+            if sys.byteorder == "big":
+                table_ids.byteswap()
+            ids.append(table_ids)
+            offset += count * table_ids.itemsize
+        parts = []
+        for size in sizes:
+            parts.append(str(view[offset:offset + size], "utf-8"))
+            offset += size
+    data: Dict[str, Any] = json.loads(parts.pop())
+    for (key, groups_key), count, names, table_ids in zip(_data_package_tables.items(), (item_count, location_count),
+                                                          parts, ids):
+        names = names.split("\0") if count else []
+        data[key] = dict(zip(names, table_ids))
+        if groups_key in data:
+            data[groups_key] = {group: list(map(names.__getitem__, members))
+                                if members and type(members[0]) is int else members
+                                for group, members in data[groups_key].items()}
+    return data
+
+
 def load_data_package_for_checksum(game: str, checksum: typing.Optional[str]) -> Dict[str, Any]:
     if checksum and game:
         if checksum != get_file_safe_name(checksum):
             raise ValueError(f"Bad symbols in checksum: {checksum}")
+        path = cache_path("datapackage", get_file_safe_name(game), f"{checksum}.apdp")
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return data_package_from_buffer(mapped)
+            except Exception as e:
+                logging.debug(f"Could not load data package: {e}")
+
+        # data packages that were cached before the binary format
         path = cache_path("datapackage", get_file_safe_name(game), f"{checksum}.json")
         if os.path.exists(path):
             try:
@@ -382,8 +465,20 @@ def store_data_package_for_checksum(game: str, data: typing.Dict[str, Any]) -> N
         game_folder = cache_path("datapackage", get_file_safe_name(game))
         os.makedirs(game_folder, exist_ok=True)
         try:
-            with open(os.path.join(game_folder, f"{checksum}.json"), "w", encoding="utf-8-sig") as f:
-                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            packed = data_package_to_bytes(data)
+        except ValueError:
+            try:
+                with open(os.path.join(game_folder, f"{checksum}.json"), "w", encoding="utf-8-sig") as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            except Exception as e:
+                logging.debug(f"Could not store data package: {e}")
+            return
+        try:
+            # written to a temporary file first, so a client loading it at the same time never sees half of it
+            path = os.path.join(game_folder, f"{checksum}.apdp")
+            with open(f"{path}.{os.getpid()}.tmp", "wb") as f:
+                f.write(packed)
+            os.replace(f"{path}.{os.getpid()}.tmp", path)
         except Exception as e:
             logging.debug(f"Could not store data package: {e}")
 
@@ -506,6 +601,86 @@ def restricted_dumps(obj: Any) -> bytes:
     return s
 
 
+def restricted_load(file: BinaryIO) -> Any:
+    """Helper function analogous to pickle.load(), reading the pickle from `file` as it goes."""
+    return RestrictedUnpickler(file).load()
+
+
+class RestrictedPickler(pickle.Pickler):
+    """
+    Pickler that refuses to refer to classes and functions which RestrictedUnpickler would not load, so pickles can be
+    checked while they are written instead of by loading them again.
+    """
+    restricted_unpickler: RestrictedUnpickler
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super(RestrictedPickler, self).__init__(*args, **kwargs)
+        self.restricted_unpickler = RestrictedUnpickler(io.BytesIO())
+
+    def reducer_override(self, obj: Any) -> Any:
+        if isinstance(obj, (type, types.FunctionType, types.BuiltinFunctionType)):
+            try:
+                self.restricted_unpickler.find_class(obj.__module__, obj.__qualname__)
+            except (pickle.UnpicklingError, ImportError, AttributeError) as e:
+                raise pickle.PicklingError(e) from e
+        return NotImplemented
+
+
+def restricted_dump(obj: Any, file: BinaryIO) -> None:
+    """Helper function analogous to pickle.dump(), writing the pickle to `file` as it goes."""
+    RestrictedPickler(file).dump(obj)
+
+
+class ZlibWriter(io.RawIOBase):
+    """Binary stream that writes its data zlib compressed into `file`, one chunk at a time."""
+    file: BinaryIO
+    compressor: typing.Any
+
+    def __init__(self, file: BinaryIO, level: int = -1) -> None:
+        super().__init__()
+        self.file = file
+        self.compressor = zlib.compressobj(level)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: typing.Any) -> int:
+        self.file.write(self.compressor.compress(data))
+        return memoryview(data).nbytes
+
+    def close(self) -> None:
+        if not self.closed:
+            self.file.write(self.compressor.flush())
+        super().close()
+
+
+class ZlibReader(io.RawIOBase):
+    """Binary stream that decompresses the zlib data read from `file`, one chunk at a time."""
+    chunk_size: typing.ClassVar[int] = 64 * 1024
+
+    file: BinaryIO
+    decompressor: typing.Any
+
+    def __init__(self, file: BinaryIO) -> None:
+        super().__init__()
+        self.file = file
+        self.decompressor = zlib.decompressobj()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: typing.Any) -> int:
+        size = len(buffer)
+        data = b""
+        while not data and not self.decompressor.eof:
+            compressed = self.decompressor.unconsumed_tail or self.file.read(self.chunk_size)
+            if not compressed:
+                raise zlib.error("Compressed data ended before the end of the stream.")
+            data = self.decompressor.decompress(compressed, size)
+        buffer[:len(data)] = data
+        return len(data)
+
+
 class ByValue:
     """
     Mixin for enums to pickle value instead of name (restores pre-3.11 behavior). Use as left-most parent.
@@ -701,7 +876,7 @@ def get_fuzzy_results(input_word: str, word_list: typing.Collection[str], limit:
     )
 
 
-def get_intended_text(input_text: str, possible_answers) -> typing.Tuple[str, bool, str]:
+def get_intended_text(input_text: str, possible_answers: typing.Collection[str]) -> typing.Tuple[str, bool, str]:
     picks = get_fuzzy_results(input_text, possible_answers, limit=2)
     if len(picks) > 1:
         dif = picks[0][1] - picks[1][1]
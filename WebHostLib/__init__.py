@@ -47,6 +47,10 @@ app.config["JOB_THRESHOLD"] = 1
 app.config["JOB_TIME"] = 600
 # memory limit for generator processes in bytes
 app.config["GENERATOR_MEMORY_LIMIT"] = 4294967296
+# autohost and autogen get notified of new work through UDP on this host and these ports (one per channel).
+# Set the port to None if they run in the same process as the website, they are notified through a queue then.
+app.config["NOTIFIER_HOST"] = "127.0.0.1"
+app.config["NOTIFIER_PORT"] = 38270
 
 # waitress uses one thread for I/O, these are for processing of views that then get sent
 # archipelago.gg uses gunicorn + nginx; ignoring this option
@@ -1,6 +1,10 @@
-from flask import abort
+import typing
+import zlib
 
-from Utils import restricted_loads
+from flask import abort, make_response, request
+
+from NetUtils import GamesPackage
+from Utils import data_package_to_bytes, restricted_loads
 from WebHostLib import cache
 from WebHostLib.models import GameDataPackage
 from . import api_endpoints
@@ -22,6 +26,41 @@ def get_datapackage_by_checksum(checksum: str):
     return abort(404)
 
 
+@cache.memoize(timeout=3600)
+def get_packed_datapackage(checksum: str) -> typing.Optional[bytes]:
+    """The data package of checksum in the format of Utils.data_package_to_bytes, compressed with zlib."""
+    package = GameDataPackage.get(checksum=checksum)
+    game_data: typing.Optional[GamesPackage] = restricted_loads(package.data) if package else None
+    if not game_data:
+        from worlds import network_data_package
+        game_data = next((game_data for game_data in network_data_package["games"].values()
+                          if game_data["checksum"] == checksum), None)
+    if not game_data:
+        return None
+    try:
+        return zlib.compress(data_package_to_bytes(game_data), 9)
+    except ValueError:
+        return None
+
+
+@api_endpoints.route('/datapackage/<string:checksum>/packed')
+def get_packed_datapackage_by_checksum(checksum: str):
+    """
+    A game's data package in the compact format that clients cache data packages in. As the checksum is the content's
+    address, responses never change and can be cached by anything in between.
+    """
+    packed = get_packed_datapackage(checksum)
+    if packed is None:
+        return abort(404)
+    response = make_response(packed)
+    response.content_type = "application/octet-stream"
+    response.cache_control.public = True
+    response.cache_control.max_age = 365 * 24 * 60 * 60
+    response.cache_control.immutable = True
+    response.set_etag(checksum)
+    return response.make_conditional(request)
+
+
 @api_endpoints.route('/datapackage_checksum')
 @cache.cached()
 def get_datapackage_checksums():
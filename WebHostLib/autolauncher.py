@@ -3,6 +3,7 @@ from __future__ import annotations
 import json
 import logging
 import multiprocessing
+import time
 import typing
 from datetime import timedelta, datetime
 from threading import Event, Thread
@@ -13,8 +14,12 @@ from pony.orm import db_session, select, commit, PrimaryKey
 
 from Utils import restricted_loads
 from .locker import Locker, AlreadyRunningException
+from .notifier import get_notifier
 
 _stop_event = Event()
+# autohost and autogen get notified of new work, polling the database only catches up on what they were not notified of
+room_poll_interval = 10  # seconds
+generation_poll_interval = 10  # seconds
 
 
 def stop() -> None:
@@ -125,15 +130,37 @@ def autohost(config: dict):
                     hosters.append(hoster)
                     hoster.start()
 
-                while not stop_event.wait(0.1):
-                    with db_session:
-                        rooms = select(
-                            room for room in Room if
-                            room.last_activity >= datetime.utcnow() - timedelta(days=3))
-                        for room in rooms:
-                            # we have to filter twice, as the per-room timeout can't currently be PonyORM transpiled.
-                            if room.last_activity >= datetime.utcnow() - timedelta(seconds=room.timeout + 5):
-                                hosters[room.id.int % len(hosters)].start_room(room.id)
+                def start_room(room: Room) -> None:
+                    # we have to filter twice, as the per-room timeout can't currently be PonyORM transpiled.
+                    if room.last_activity >= datetime.utcnow() - timedelta(seconds=room.timeout + 5):
+                        hosters[room.id.int % len(hosters)].start_room(room.id)
+
+                with get_notifier(config).listen("autohost") as listener:
+                    next_poll = 0.0
+                    while not stop_event.is_set():
+                        if time.monotonic() >= next_poll:
+                            next_poll = time.monotonic() + room_poll_interval
+                            with db_session:
+                                rooms = select(
+                                    room for room in Room if
+                                    room.last_activity >= datetime.utcnow() - timedelta(days=3))
+                                for room in rooms:
+                                    start_room(room)
+
+                        room_ids: typing.Set[UUID] = set()
+                        for message in listener.get(timeout=1):
+                            kind, _, room_id = message.partition(" ")
+                            if kind == "room":
+                                room_ids.add(UUID(room_id))
+                            elif kind == "command":
+                                room_id = UUID(room_id)
+                                hosters[room_id.int % len(hosters)].notify_commands(room_id)
+                        if room_ids:
+                            with db_session:
+                                for room_id in room_ids:
+                                    room = Room.get(id=room_id)
+                                    if room:
+                                        start_room(room)
 
         except AlreadyRunningException:
             logging.info("Autohost reports as already running, not starting another.")
@@ -165,14 +192,19 @@ def autogen(config: dict):
                             commit()
                         select(generation for generation in Generation if generation.state == STATE_ERROR).delete()
 
-                    while not stop_event.wait(0.1):
-                        with db_session:
-                            # for update locks the database row(s) during transaction, preventing writes from elsewhere
-                            to_start = select(
-                                generation for generation in Generation
-                                if generation.state == STATE_QUEUED).for_update()
-                            for generation in to_start:
-                                launch_generator(generator_pool, generation, timeout=job_time)
+                    with get_notifier(config).listen("autogen") as listener:
+                        next_poll = 0.0
+                        while not stop_event.is_set():
+                            if listener.get(timeout=1) or time.monotonic() >= next_poll:
+                                next_poll = time.monotonic() + generation_poll_interval
+                                with db_session:
+                                    # for update locks the database row(s) during transaction,
+                                    # preventing writes from elsewhere
+                                    to_start = select(
+                                        generation for generation in Generation
+                                        if generation.state == STATE_QUEUED).for_update()
+                                    for generation in to_start:
+                                        launch_generator(generator_pool, generation, timeout=job_time)
         except AlreadyRunningException:
             logging.info("Autogen reports as already running, not starting another.")
 
@@ -189,6 +221,7 @@ class MultiworldInstance():
         self.host = config["HOST_ADDRESS"]
         self.rooms_to_start = multiprocessing.Queue()
         self.rooms_shutting_down = multiprocessing.Queue()
+        self.room_commands = multiprocessing.Queue()
         self.name = f"MultiHoster{id}"
 
     def start(self):
@@ -198,7 +231,7 @@ class MultiworldInstance():
         process = multiprocessing.Process(group=None, target=run_server_process,
                                           args=(self.name, self.ponyconfig, get_static_server_data(),
                                                 self.cert, self.key, self.host,
-                                                self.rooms_to_start, self.rooms_shutting_down),
+                                                self.rooms_to_start, self.rooms_shutting_down, self.room_commands),
                                           name=self.name)
         process.start()
         self.process = process
@@ -212,6 +245,10 @@ class MultiworldInstance():
             self.room_ids.add(room_id)
             self.rooms_to_start.put(room_id)
 
+    def notify_commands(self, room_id):
+        if room_id in self.room_ids:  # otherwise the room reads its commands once it is started
+            self.room_commands.put(room_id)
+
     def stop(self):
         if self.process:
             self.process.terminate()
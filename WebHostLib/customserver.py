@@ -10,9 +10,10 @@ import pickle
 import random
 import socket
 import threading
-import time
 import typing
 import sys
+import weakref
+from uuid import UUID
 
 import websockets
 from pony.orm import commit, db_session, select
@@ -23,9 +24,10 @@ from MultiServer import (
     Context, server, auto_shutdown, ServerCommandProcessor, ClientMessageProcessor, load_server_cert,
     server_per_message_deflate_factory,
 )
+from NetUtils import LocationStore
 from Utils import restricted_loads, cache_argsless
 from .locker import Locker
-from .models import Command, GameDataPackage, Room, db
+from .models import Command, GameDataPackage, Room, SaveJournalRecord, db
 
 
 class CustomClientMessageProcessor(ClientMessageProcessor):
@@ -60,8 +62,44 @@ class DBCommandProcessor(ServerCommandProcessor):
         self.ctx.logger.info(text)
 
 
+class StaticSeedData:
+    """
+    The parts of a seed's multidata that rooms don't modify, shared by all rooms of the seed in a server process,
+    so starting another room of it doesn't have to decompress and parse the multidata again.
+    """
+    __slots__ = ("__weakref__", "multidata", "game_data", "static_game_data")
+
+    multidata: typing.Dict[str, typing.Any]
+    game_data: typing.Optional[typing.Dict[str, typing.Any]]
+    static_game_data: bool
+
+    def __init__(self, multidata: typing.Dict[str, typing.Any], static_game_data: bool) -> None:
+        # without the embedded data packages, which are part of game_data once the first room loaded them
+        self.multidata = multidata
+        # Context attributes built from the data packages, see WebHostContext.game_data_attributes
+        self.game_data = None
+        # if all data packages are the static ones, the game data is the same as that of all other such seeds
+        self.static_game_data = static_game_data
+
+
+# seeds of running rooms, kept alive by their rooms
+static_seed_data: weakref.WeakValueDictionary[UUID, StaticSeedData] = weakref.WeakValueDictionary()
+# seeds of recently started rooms, as rooms are often started again shortly after they shut down
+recent_static_seed_data: typing.Deque[StaticSeedData] = collections.deque(maxlen=16)
+# game data of seeds that only use static data packages
+static_game_data: typing.Optional[typing.Dict[str, typing.Any]] = None
+
+
 class WebHostContext(Context):
     room_id: int
+    static_seed_data: StaticSeedData
+    commands_pending: threading.Event
+    # commands are notified through run_server_process, this only catches up on what was not notified
+    command_poll_interval = 60  # in seconds
+    game_data_attributes: typing.ClassVar[typing.Tuple[str, ...]] = (
+        "gamespackage", "item_name_groups", "location_name_groups", "checksums", "item_names", "location_names",
+        "all_item_and_group_names", "all_location_and_group_names",
+    )
 
     def __init__(self, static_server_data: dict, logger: logging.Logger):
         # static server data is used during _load_game_data to load required data,
@@ -72,6 +110,7 @@ class WebHostContext(Context):
                                              "enabled", 0, 2, logger=logger)
         del self.static_server_data
         self.main_loop = asyncio.get_running_loop()
+        self.commands_pending = threading.Event()
         self.video = {}
         self.tags = ["AP", "WebHost"]
 
@@ -89,10 +128,26 @@ class WebHostContext(Context):
             setattr(self, key, value)
         self.non_hintable_names = collections.defaultdict(frozenset, self.non_hintable_names)
 
+    def _init_game_data(self):
+        global static_game_data
+        seed_data = self.static_seed_data
+        if seed_data.game_data is None and seed_data.static_game_data:
+            seed_data.game_data = static_game_data
+        if seed_data.game_data is None:
+            super(WebHostContext, self)._init_game_data()
+            # NOTE: these are shared from now on, so they will have to be copied before being modified
+            seed_data.game_data = {attribute: getattr(self, attribute) for attribute in self.game_data_attributes}
+            if seed_data.static_game_data:
+                static_game_data = seed_data.game_data
+        else:
+            for attribute, value in seed_data.game_data.items():
+                setattr(self, attribute, value)
+
     def listen_to_db_commands(self):
         cmdprocessor = DBCommandProcessor(self)
 
         while not self.exit_event.is_set():
+            self.commands_pending.clear()
             with db_session:
                 commands = select(command for command in Command if command.room.id == self.room_id)
                 if commands:
@@ -101,7 +156,7 @@ class WebHostContext(Context):
                         command.delete()
                     commit()
             del commands
-            time.sleep(5)
+            self.commands_pending.wait(self.command_poll_interval)
 
     @db_session
     def load(self, room_id: int):
@@ -112,7 +167,22 @@ class WebHostContext(Context):
         else:
             self.port = get_random_port()
 
-        multidata = self.decompress(room.seed.multidata)
+        seed_data = static_seed_data.get(room.seed.id)
+        if seed_data:
+            self.logger.info(f"Using already loaded multidata of seed {room.seed.id}")
+            multidata = dict(seed_data.multidata)
+            game_data_packages = {}
+        else:
+            multidata, game_data_packages, seed_data = self._load_seed(room.seed.multidata)
+            static_seed_data[room.seed.id] = seed_data
+        if seed_data not in recent_static_seed_data:
+            recent_static_seed_data.append(seed_data)
+        self.static_seed_data = seed_data
+        return self._load(multidata, game_data_packages, True)
+
+    def _load_seed(self, compressed_multidata: bytes) \
+            -> typing.Tuple[typing.Dict[str, typing.Any], typing.Dict[str, typing.Any], StaticSeedData]:
+        multidata = self.decompress(compressed_multidata)
         game_data_packages = {}
 
         static_gamespackage = self.gamespackage  # this is shared across all rooms
@@ -143,35 +213,50 @@ class WebHostContext(Context):
             self.item_name_groups[game] = static_item_name_groups.get(game, {})
             self.location_name_groups[game] = static_location_name_groups.get(game, {})
 
-        if not game_data_packages and not missing_checksum:
+        all_static = not game_data_packages and not missing_checksum
+        if all_static:
             # all static -> use the static dicts directly
             self.gamespackage = static_gamespackage
             self.item_name_groups = static_item_name_groups
             self.location_name_groups = static_location_name_groups
-        return self._load(multidata, game_data_packages, True)
+
+        multidata["locations"] = LocationStore(multidata["locations"])
+        seed_data = StaticSeedData({key: value for key, value in multidata.items() if key != "datapackage"},
+                                   all_static)
+        return multidata, game_data_packages, seed_data
 
     def init_save(self, enabled: bool = True):
         self.saving = enabled
         if self.saving:
             with db_session:
-                savegame_data = Room.get(id=self.room_id).multisave
+                savegame_data = Room.get(id=self.room_id).get_multisave()
                 if savegame_data:
-                    self.set_save(restricted_loads(Room.get(id=self.room_id).multisave))
+                    self.set_save(savegame_data)
             self._start_async_saving(atexit_save=False)
         threading.Thread(target=self.listen_to_db_commands, daemon=True).start()
 
     @db_session
     def _save(self, exit_save: bool = False) -> bool:
-        room = Room.get(id=self.room_id)
-        # Does not use Utils.restricted_dumps because we'd rather make a save than not make one
-        room.multisave = pickle.dumps(self.get_save())
         # saving only occurs on activity, so we can "abuse" this information to mark this as last_activity
         if not exit_save:  # we don't want to count a shutdown as activity, which would restart the server again
-            room.last_activity = datetime.datetime.utcnow()
-        return True
+            Room.get(id=self.room_id).last_activity = datetime.datetime.utcnow()
+        return super()._save(exit_save)
 
-    def get_save(self) -> dict:
-        d = super(WebHostContext, self).get_save()
+    def _write_save_snapshot(self, save: dict) -> int:
+        room = Room.get(id=self.room_id)
+        # Does not use Utils.restricted_dumps because we'd rather make a save than not make one
+        room.multisave = pickle.dumps(save)
+        generation = self.save_generation
+        room.save_journal.select(lambda record: record.generation < generation).delete(bulk=True)
+        return len(room.multisave)
+
+    def _append_save_journal(self, record: dict) -> int:
+        encoded_record = pickle.dumps(record)
+        SaveJournalRecord(room=Room.get(id=self.room_id), generation=self.save_generation, data=encoded_record)
+        return len(encoded_record)
+
+    def _get_save_state(self) -> dict:
+        d = super(WebHostContext, self)._get_save_state()
         d["video"] = [(tuple(playerslot), videodata) for playerslot, videodata in self.video.items()]
         return d
 
@@ -231,7 +316,8 @@ def set_up_logging(room_id) -> logging.Logger:
 
 def run_server_process(name: str, ponyconfig: dict, static_server_data: dict,
                        cert_file: typing.Optional[str], cert_key_file: typing.Optional[str],
-                       host: str, rooms_to_run: multiprocessing.Queue, rooms_shutting_down: multiprocessing.Queue):
+                       host: str, rooms_to_run: multiprocessing.Queue, rooms_shutting_down: multiprocessing.Queue,
+                       room_commands: multiprocessing.Queue):
     from setproctitle import setproctitle
 
     setproctitle(name)
@@ -275,12 +361,15 @@ def run_server_process(name: str, ponyconfig: dict, static_server_data: dict,
     gc.collect()  # free intermediate objects used during setup
 
     loop = asyncio.get_event_loop()
+    # events of the running rooms, set when new commands for them were committed
+    commands_pending: typing.Dict[UUID, threading.Event] = {}
 
     async def start_room(room_id):
         with Locker(f"RoomLocker {room_id}"):
             try:
                 logger = set_up_logging(room_id)
                 ctx = WebHostContext(static_server_data, logger)
+                commands_pending[room_id] = ctx.commands_pending
                 ctx.load(room_id)
                 ctx.init_save()
                 assert ctx.server is None
@@ -342,6 +431,8 @@ def run_server_process(name: str, ponyconfig: dict, static_server_data: dict,
                 try:
                     ctx.save_dirty = False  # make sure the saving thread does not write to DB after final wakeup
                     ctx.exit_event.set()  # make sure the saving thread stops at some point
+                    ctx.commands_pending.set()  # and the command listener
+                    commands_pending.pop(room_id, None)
                     # NOTE: async saving should probably be an async task and could be merged with shutdown_task
                     with db_session:
                         # ensure the Room does not spin up again on its own, minute of safety buffer
@@ -375,9 +466,17 @@ def run_server_process(name: str, ponyconfig: dict, static_server_data: dict,
                 logging.info(f"Starting room {next_room} on {name}.")
                 del task  # delete reference to task object
 
+    def notify_commands():
+        while 1:
+            room_id = room_commands.get(block=True, timeout=None)
+            event = commands_pending.get(room_id, None)
+            if event:
+                event.set()
+
     starter = Starter()
     starter.daemon = True
     starter.start()
+    threading.Thread(target=notify_commands, name="CommandNotifier", daemon=True).start()
     try:
         loop.run_forever()
     finally:
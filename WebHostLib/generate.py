@@ -19,6 +19,7 @@ from WebHostLib import app
 from settings import ServerOptions, GeneratorOptions
 from .check import get_yaml_data, roll_options
 from .models import Generation, STATE_ERROR, STATE_QUEUED, Seed, UUID
+from .notifier import notify_generation
 from .upload import upload_zip_to_db
 
 
@@ -102,6 +103,7 @@ def start_generation(options: dict[str, dict | str], meta: dict[str, Any]):
             return render_template("seedError.html", seed_error=meta["error"], details=details)
 
         commit()
+        notify_generation(app.config)
 
         return redirect(url_for("wait_seed", seed=gen.id))
     else:
@@ -26,12 +26,33 @@ class Room(db.Entity):
     commands = Set('Command')
     seed = Required('Seed', index=True)
     multisave = Optional(buffer, lazy=True)
+    save_journal = Set('SaveJournalRecord')
     show_spoiler = Required(int, default=0)  # 0 -> never, 1 -> after completion, -> 2 always
     timeout = Required(int, default=lambda: 2 * 60 * 60)  # seconds since last activity to shutdown
     tracker = Optional(UUID, index=True)
     # Port special value -1 means the server errored out. Another attempt can be made with a page refresh
     last_port = Optional(int, default=lambda: 0)
 
+    def get_multisave(self) -> dict:
+        """Returns the room's save snapshot with the save journal written since then applied."""
+        from MultiServer import apply_save_journal
+        from Utils import restricted_loads
+
+        if not self.multisave:
+            return {}
+        save = restricted_loads(self.multisave)
+        generation = save.get("journal_generation", 0)
+        records = self.save_journal.select(lambda record: record.generation == generation).order_by(
+            SaveJournalRecord.id)
+        return apply_save_journal(save, (restricted_loads(record.data) for record in records))
+
+
+class SaveJournalRecord(db.Entity):
+    id = PrimaryKey(int, auto=True)
+    room = Required(Room, index=True)
+    generation = Required(int)
+    data = Required(buffer, lazy=True)
+
 
 class Seed(db.Entity):
     id = PrimaryKey(UUID, default=uuid4)
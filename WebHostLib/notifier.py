@@ -0,0 +1,166 @@
+"""
+Wakes up the WebHost's background workers when there is something for them to do, so they don't have to keep polling
+the database. Notifications are best effort, the workers still poll the database, but rarely, to catch up on anything
+that was not notified.
+"""
+from __future__ import annotations
+
+import abc
+import functools
+import logging
+import queue
+import select
+import socket
+import typing
+from uuid import UUID
+
+
+class Listener(abc.ABC):
+    """Receives the notifications of one channel."""
+
+    @abc.abstractmethod
+    def get(self, timeout: float) -> typing.List[str]:
+        """Waits up to timeout seconds for notifications, returns all that arrived, which may be none."""
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> Listener:
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+
+class Notifier(abc.ABC):
+    """Sends notifications to the listener of a channel, there is at most one listener per channel."""
+    channels: typing.ClassVar[typing.Tuple[str, ...]] = ("autohost", "autogen")
+
+    @abc.abstractmethod
+    def notify(self, channel: str, message: str) -> None:
+        ...
+
+    @abc.abstractmethod
+    def listen(self, channel: str) -> Listener:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class QueueListener(Listener):
+    def __init__(self, messages: queue.SimpleQueue[str]) -> None:
+        self.messages = messages
+
+    def get(self, timeout: float) -> typing.List[str]:
+        try:
+            messages = [self.messages.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while not self.messages.empty():
+            messages.append(self.messages.get_nowait())
+        return messages
+
+
+class QueueNotifier(Notifier):
+    """Notifies within the current process only, such as when running everything from WebHost.py, or for tests."""
+
+    def __init__(self) -> None:
+        self.queues: typing.Dict[str, queue.SimpleQueue[str]] = {channel: queue.SimpleQueue()
+                                                                 for channel in self.channels}
+
+    def notify(self, channel: str, message: str) -> None:
+        self.queues[channel].put(message)
+
+    def listen(self, channel: str) -> Listener:
+        return QueueListener(self.queues[channel])
+
+
+class UDPListener(Listener):
+    def __init__(self, address: typing.Tuple[str, int]) -> None:
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            self.socket.bind(address)
+        except OSError:
+            self.socket.close()
+            raise
+        self.socket.setblocking(False)
+
+    def get(self, timeout: float) -> typing.List[str]:
+        messages: typing.List[str] = []
+        if select.select([self.socket], [], [], timeout)[0]:
+            while True:
+                try:
+                    messages.append(self.socket.recv(UDPNotifier.max_message_size).decode())
+                except (BlockingIOError, ConnectionResetError):
+                    break
+        return messages
+
+    def close(self) -> None:
+        self.socket.close()
+
+
+class UDPNotifier(Notifier):
+    """
+    Notifies across processes of one host, using a datagram per notification. Each channel is listened to on its own
+    port, counting up from the configured port in the order of Notifier.channels. With port 0, the listeners get ports
+    assigned by the OS instead, which only the notifier they were created by knows about, such as for tests.
+    """
+    max_message_size: typing.ClassVar[int] = 1024
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.assigned_addresses: typing.Dict[str, typing.Tuple[str, int]] = {}
+
+    def get_address(self, channel: str) -> typing.Tuple[str, int]:
+        if not self.port:
+            return self.assigned_addresses.get(channel, (self.host, 0))
+        return self.host, self.port + self.channels.index(channel)
+
+    def notify(self, channel: str, message: str) -> None:
+        try:
+            self.socket.sendto(message.encode(), self.get_address(channel))
+        except OSError as e:
+            # polling will pick it up eventually
+            logging.debug(f"Could not notify {channel}: {e}")
+
+    def listen(self, channel: str) -> Listener:
+        listener = UDPListener(self.get_address(channel))
+        if not self.port:
+            self.assigned_addresses[channel] = listener.socket.getsockname()
+        return listener
+
+    def close(self) -> None:
+        self.socket.close()
+
+
+_local_notifier = QueueNotifier()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_udp_notifier(host: str, port: int) -> UDPNotifier:
+    return UDPNotifier(host, port)
+
+
+def get_notifier(config: typing.Mapping[str, typing.Any]) -> Notifier:
+    port: typing.Optional[int] = config["NOTIFIER_PORT"]
+    if port is None:
+        return _local_notifier
+    return _get_udp_notifier(config["NOTIFIER_HOST"], port)
+
+
+def notify_room(config: typing.Mapping[str, typing.Any], room_id: UUID) -> None:
+    """Notifies autohost that a room was created or has new activity, which may require starting it."""
+    get_notifier(config).notify("autohost", f"room {room_id.hex}")
+
+
+def notify_command(config: typing.Mapping[str, typing.Any], room_id: UUID) -> None:
+    """Notifies the room through autohost that a Command for it was committed."""
+    get_notifier(config).notify("autohost", f"command {room_id.hex}")
+
+
+def notify_generation(config: typing.Mapping[str, typing.Any]) -> None:
+    """Notifies autogen that a Generation was queued."""
+    get_notifier(config).notify("autogen", "generation")
@@ -1,7 +1,8 @@
 import datetime
 import collections
+import functools
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, NamedTuple, Counter
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Set, Tuple, NamedTuple, Counter
 from uuid import UUID
 from email.utils import parsedate_to_datetime
 
@@ -12,7 +13,7 @@ from MultiServer import Context, get_saving_second
 from NetUtils import ClientStatus, Hint, NetworkItem, NetworkSlot, SlotType
 from Utils import restricted_loads, KeyedDefaultDict
 from . import app, cache
-from .models import GameDataPackage, Room
+from .models import GameDataPackage, Room, Seed
 
 # Multisave is currently updated, at most, every minute.
 TRACKER_CACHE_TIMEOUT_IN_SECONDS = 60
@@ -24,6 +25,75 @@ TeamPlayer = Tuple[int, int]
 ItemMetadata = Tuple[int, int, int]
 
 
+class _GameLookups(NamedTuple):
+    item_id_to_name: Dict[int, str]
+    location_id_to_name: Dict[int, str]
+    item_name_to_id: Dict[str, int]
+    location_name_to_id: Dict[str, int]
+
+
+class _NameLookup(Mapping[int, str]):
+    """
+    Read-only view of a shared id to name table, which names ids that are not in it with unknown_name instead of
+    raising KeyError. Unlike KeyedDefaultDict, looking up an unknown id does not add it to the shared table.
+    """
+    __slots__ = ("names", "unknown_name")
+
+    names: Dict[int, str]
+    unknown_name: str
+    """format string for the name of an unknown id"""
+
+    def __init__(self, names: Dict[int, str], unknown_name: str) -> None:
+        self.names = names
+        self.unknown_name = unknown_name
+
+    def __getitem__(self, code: int) -> str:
+        name = self.names.get(code)
+        return self.unknown_name.format(code) if name is None else name
+
+    def get(self, code: int, default: Any = None) -> Any:
+        return self.names.get(code, default)
+
+    def __contains__(self, code: object) -> bool:
+        return code in self.names
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+# The data trackers are built from is cached per process and shared by all requests, as it is the same for every
+# viewer of a room. Trackers only read from them, so they are safe to share between threads. Lookups of unknown ids
+# go through _NameLookup, which doesn't insert them.
+@functools.lru_cache(maxsize=32)
+def _get_seed_multidata(seed_id: UUID) -> Dict[str, Any]:
+    """Returns the decompressed multidata of a seed."""
+    return Context.decompress(Seed.get(id=seed_id).multidata)
+
+
+@functools.lru_cache(maxsize=256)
+def _get_game_lookups(checksum: str) -> _GameLookups:
+    """Returns the lookup tables of the data package of checksum, in both directions."""
+    game_package = restricted_loads(GameDataPackage.get(checksum=checksum).data)
+    return _GameLookups(
+        {id: name for name, id in game_package["item_name_to_id"].items()},
+        {id: name for name, id in game_package["location_name_to_id"].items()},
+        game_package["item_name_to_id"],
+        game_package["location_name_to_id"],
+    )
+
+
+@functools.lru_cache(maxsize=32)
+def _get_room_multisave(room_id: UUID, last_activity: datetime.datetime) -> Dict[str, Any]:
+    """
+    Returns the save of a room. A room saves only on activity, which updates its last_activity, so that is used to
+    tell when the save changed.
+    """
+    return Room.get(id=room_id).get_multisave()
+
+
 def _cache_results(func: Callable) -> Callable:
     """Stores the results of any computationally expensive methods after the initial call in TrackerData.
     If called again, returns the cached result instead, as results will not change for the lifetime of TrackerData.
@@ -46,6 +116,7 @@ class TrackerData:
 
     Provides helper methods to lazily load necessary data that each tracker require and caches any results so any
     subsequent helper method calls do not need to recompute results during the lifetime of this instance.
+    The seed, save and data package it reads from are shared with other requests, so they must not be modified.
     """
     room: Room
     _multidata: Dict[str, Any]
@@ -55,30 +126,29 @@ class TrackerData:
     def __init__(self, room: Room):
         """Initialize a new RoomMultidata object for the current room."""
         self.room = room
-        self._multidata = Context.decompress(room.seed.multidata)
-        self._multisave = restricted_loads(room.multisave) if room.multisave else {}
+        self._multidata = _get_seed_multidata(room.seed.id)
+        self._multisave = _get_room_multisave(room.id, room.last_activity)
         self._tracker_cache = {}
 
         self.item_name_to_id: Dict[str, Dict[str, int]] = {}
         self.location_name_to_id: Dict[str, Dict[str, int]] = {}
 
         # Generate inverse lookup tables from data package, useful for trackers.
-        self.item_id_to_name: Dict[str, Dict[int, str]] = KeyedDefaultDict(lambda game_name: {
+        self.item_id_to_name: Dict[str, Mapping[int, str]] = KeyedDefaultDict(lambda game_name: {
             game_name: KeyedDefaultDict(lambda code: f"Unknown Game {game_name} - Item (ID: {code})")
         })
-        self.location_id_to_name: Dict[str, Dict[int, str]] = KeyedDefaultDict(lambda game_name: {
+        self.location_id_to_name: Dict[str, Mapping[int, str]] = KeyedDefaultDict(lambda game_name: {
             game_name: KeyedDefaultDict(lambda code: f"Unknown Game {game_name} - Location (ID: {code})")
         })
         for game, game_package in self._multidata["datapackage"].items():
-            game_package = restricted_loads(GameDataPackage.get(checksum=game_package["checksum"]).data)
-            self.item_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Item (ID: {code})", {
-                id: name for name, id in game_package["item_name_to_id"].items()})
-            self.location_id_to_name[game] = KeyedDefaultDict(lambda code: f"Unknown Location (ID: {code})", {
-                id: name for name, id in game_package["location_name_to_id"].items()})
+            # the tables are shared with other requests, so unknown ids must not be added to them
+            lookups = _get_game_lookups(game_package["checksum"])
+            self.item_id_to_name[game] = _NameLookup(lookups.item_id_to_name, "Unknown Item (ID: {})")
+            self.location_id_to_name[game] = _NameLookup(lookups.location_id_to_name, "Unknown Location (ID: {})")
 
             # Normal lookup tables as well.
-            self.item_name_to_id[game] = game_package["item_name_to_id"]
-            self.location_name_to_id[game] = game_package["location_name_to_id"]
+            self.item_name_to_id[game] = lookups.item_name_to_id
+            self.location_name_to_id[game] = lookups.location_name_to_id
 
     def get_seed_name(self) -> str:
         """Retrieves the seed name."""
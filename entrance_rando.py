@@ -5,7 +5,7 @@ import time
 from collections import deque
 from collections.abc import Callable, Iterable
 
-from BaseClasses import CollectionState, Entrance, Region, EntranceType
+from BaseClasses import CollectionState, Entrance, Region, EntranceType, SphereSearch
 from Options import Accessibility
 from worlds.AutoWorld import World
 
@@ -180,19 +180,43 @@ class ERPlacementState:
     """A lookup table of all unconnected ER targets"""
     coupled: bool
     """Whether entrance randomization is operating in coupled mode"""
+    _search: SphereSearch
+    """Collects the events of the multiworld into collection_state once they become reachable"""
+    _advancement_count: int
+    """The number of advancements of collection_state after the last sweep"""
 
     def __init__(self, world: World, entrance_lookup: EntranceLookup, coupled: bool):
         self.placements = []
         self.pairings = []
         self.world = world
         self.coupled = coupled
-        self.collection_state = world.multiworld.get_all_state(False, True)
+        multiworld = world.multiworld
+        self.collection_state = multiworld.get_all_state(False, True, perform_sweep=False)
+        # instead of sweeping every location of the multiworld after each placement, the search only tests the events
+        # that may have become reachable through it
+        self._search = SphereSearch(self.collection_state, (),
+                                    [location for location in multiworld.get_locations() if location.advancement])
+        self._advancement_count = 0
         self.entrance_lookup = entrance_lookup
+        self.sweep()
 
     @property
     def placed_regions(self) -> set[Region]:
         return self.collection_state.reachable_regions[self.world.player]
 
+    def sweep(self) -> None:
+        """Collects the events that became reachable since the last sweep into collection_state."""
+        state = self.collection_state
+        search = self._search
+        if len(state.advancements) != self._advancement_count:
+            # the state was swept from outside, so the search must not collect those events again
+            search.remaining_events -= state.advancements
+        search.update()
+        # the search has no locations, so this only collects its events
+        for _ in search:
+            pass
+        self._advancement_count = len(state.advancements)
+
     def find_placeable_exits(self, check_validity: bool, usable_exits: list[Entrance]) -> list[Entrance]:
         if check_validity:
             blocked_connections = self.collection_state.blocked_connections[self.world.player]
@@ -219,14 +243,24 @@ class ERPlacementState:
 
     def test_speculative_connection(self, source_exit: Entrance, target_entrance: Entrance,
                                     usable_exits: set[Entrance]) -> bool:
-        copied_state = self.collection_state.copy()
+        player = self.world.player
+        if self.collection_state.stale[player]:
+            self.collection_state.update_reachable_regions(player)
+        # the copied search continues from the events collected so far, on a copy-on-write copy of the state
+        search = self._search.copy()
+        copied_state = search.state
         # simulated connection. A real connection is unsafe because the region graph is shallow-copied and would
         # propagate back to the real multiworld.
-        copied_state.reachable_regions[self.world.player].add(target_entrance.connected_region)
-        copied_state.blocked_connections[self.world.player].remove(source_exit)
-        copied_state.blocked_connections[self.world.player].update(target_entrance.connected_region.exits)
-        copied_state.update_reachable_regions(self.world.player)
-        copied_state.sweep_for_advancements()
+        target_region = target_entrance.connected_region
+        copied_state.reachable_regions.own(player).add(target_region)
+        copied_state.blocked_connections.own(player).remove(source_exit)
+        copied_state.blocked_connections[player].update(target_region.exits)
+        # only the exits of the new region, and the connections that depend on reaching it, can lead further
+        copied_state.update_reachable_regions(
+            player, [*target_region.exits, *self.world.multiworld.indirect_connections.get(target_region, ())])
+        search.update()
+        for _ in search:
+            pass
         # test that at there are newly reachable randomized exits that are ACTUALLY reachable
         available_randomized_exits = copied_state.blocked_connections[self.world.player]
         for _exit in available_randomized_exits:
@@ -258,6 +292,10 @@ class ERPlacementState:
         source_region = source_exit.parent_region
         target_region = target_entrance.connected_region
 
+        # catch up on collected items first, so the new connections are the only change since the last update of the
+        # reachable regions, and updating them only has to search onward from the placed exits
+        if self.collection_state.stale[self.world.player]:
+            self.collection_state.update_reachable_regions(self.world.player)
         self._connect_one_way(source_exit, target_entrance)
         # if we're doing coupled randomization place the reverse transition as well.
         if self.coupled and source_exit.randomization_type == EntranceType.TWO_WAY:
@@ -401,13 +439,13 @@ def randomize_entrances(
     def do_placement(source_exit: Entrance, target_entrance: Entrance) -> None:
         placed_exits, paired_entrances = er_state.connect(source_exit, target_entrance)
         # propagate new connections
-        er_state.collection_state.update_reachable_regions(world.player)
-        er_state.collection_state.sweep_for_advancements()
+        er_state.collection_state.update_reachable_regions(world.player, placed_exits)
+        er_state.sweep()
         if on_connect:
             change = on_connect(er_state, placed_exits, paired_entrances)
             if change:
                 er_state.collection_state.update_reachable_regions(world.player)
-                er_state.collection_state.sweep_for_advancements()
+                er_state.sweep()
 
     def needs_speculative_sweep(dead_end: bool, require_new_exits: bool, placeable_exits: list[Entrance]) -> bool:
         # speculative sweep is expensive. We currently only do it as a last resort, if we might cap off the graph
@@ -24,20 +24,27 @@ __all__ = [
 
 no_gui = False
 skip_autosave = False
-_world_settings_name_cache: dict[str, str] = {}  # TODO: cache on disk and update when worlds change
+_world_settings_name_cache: dict[str, str] = {}
 _world_settings_name_cache_updated = False
 _lock = Lock()
 
 
 def _update_cache() -> None:
-    """Load all worlds and update world_settings_name_cache"""
+    """Update world_settings_name_cache from the world index, and the worlds registered since"""
     global _world_settings_name_cache_updated
     if _world_settings_name_cache_updated:
         return
 
     try:
+        from worlds import world_index
         from worlds.AutoWorld import AutoWorldRegister
-        for world in AutoWorldRegister.world_types.values():
+        for entry in world_index.values():
+            if entry["settings"]:
+                _world_settings_name_cache[entry["settings_key"]] = entry["settings"]
+        for game in AutoWorldRegister.world_types:
+            if game in world_index:
+                continue
+            world = AutoWorldRegister.world_types[game]
             annotation = world.__annotations__.get("settings", None)
             if annotation is None or annotation == "ClassVar[Optional['Group']]":
                 continue
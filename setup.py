@@ -57,6 +57,7 @@ if __name__ == "__main__":
     import ModuleUpdate
     ModuleUpdate.update(yes="--yes" in sys.argv or "-y" in sys.argv)
 
+from worlds import load_all_worlds
 from worlds.LauncherComponents import components, icon_paths
 from Utils import version_tuple, is_windows, is_linux
 from Cython.Build import cythonize
@@ -184,6 +185,8 @@ def resolve_icon(icon_name: str):
         return base_path
 
 
+# worlds add their components when they are imported
+load_all_worlds()
 exes = [
     cx_Freeze.Executable(
         script=f"{c.script_name}.py",
@@ -17,3 +17,7 @@ import Utils
 file_path = pathlib.Path(__file__).parent.parent
 Utils.local_path.cached_path = file_path
 Utils.user_path()  # initialize cached_path
+
+from worlds import load_all_worlds
+
+load_all_worlds()  # tests cover every world, including what they register on import
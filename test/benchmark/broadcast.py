@@ -0,0 +1,138 @@
+def _run_clients(port: int, expected_items: "typing.Dict[int, int]", connected: "multiprocessing.Event",
+                 done: "multiprocessing.Event", frames: "multiprocessing.Value") -> None:
+    """Connects one client per slot and counts the items they receive, in a process separate from the server."""
+    import asyncio
+    import json
+
+    import websockets
+
+    async def main() -> None:
+        received_items = {slot: 0 for slot in expected_items}
+        connections = 0
+
+        async def run_client(slot: int) -> None:
+            nonlocal connections
+            async with websockets.connect(f"ws://127.0.0.1:{port}", max_size=None, open_timeout=None,
+                                          ping_interval=None) as websocket:
+                await websocket.send(str(slot))
+                connections += 1
+                if connections == len(expected_items):
+                    connected.set()
+                async for frame in websocket:
+                    frames.value += 1
+                    for msg in json.loads(frame):
+                        if msg["cmd"] == "ReceivedItems":
+                            received_items[slot] += len(msg["items"])
+                    if received_items[slot] == expected_items[slot] and received_items == expected_items:
+                        done.set()
+                        return
+
+        await asyncio.gather(*(run_client(slot) for slot in expected_items), return_exceptions=True)
+
+    asyncio.run(main())
+
+
+def run_broadcast_benchmark(players: int = 300, locations_per_player: int = 50) -> None:
+    """
+    Simulate a room-wide release: every slot of a room with one connected client per slot releases, one command per
+    event loop iteration. Measures the server's CPU time and wall time until every client received all of its items,
+    with the clients running in a separate process.
+
+    :param players: number of slots, each with a connected client
+    :param locations_per_player: number of locations of each slot, holding items of random slots
+    """
+    import asyncio
+    import logging
+    import multiprocessing
+    import random
+    import time
+
+    import websockets
+
+    from MultiServer import Client, Context, release_player, server_per_message_deflate_factory
+    from NetUtils import NetworkSlot, SlotType
+    from Utils import init_logging, version_tuple
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+    server_logger = logging.getLogger("Server")
+    server_logger.setLevel(logging.WARNING)  # logging every sent item would dominate the measurement
+    logging.getLogger("websockets").setLevel(logging.WARNING)
+
+    random.seed(0)
+    slots = range(1, players + 1)
+    locations = {slot: {location: (location, random.choice(slots), 0)
+                        for location in range(slot * 1000, slot * 1000 + locations_per_player)}
+                 for slot in slots}
+    expected_items = {slot: 0 for slot in slots}
+    for slot_locations in locations.values():
+        for _, target, _ in slot_locations.values():
+            expected_items[target] += 1
+
+    ctx = Context("127.0.0.1", 0, "", "", 0, 0, False, logger=server_logger)
+    ctx._load({
+        "minimum_versions": {"server": version_tuple, "clients": {}},
+        "version": version_tuple,
+        "slot_info": {slot: NetworkSlot(f"Player{slot}", "Archipelago", SlotType.player) for slot in slots},
+        "seed_name": "Benchmark",
+        "connect_names": {f"Player{slot}": (0, slot) for slot in slots},
+        "locations": locations,
+        "slot_data": {},
+        "er_hint_data": {},
+        "precollected_items": {},
+        "precollected_hints": {},
+    }, {}, False)
+
+    async def handle_client(websocket) -> None:
+        client = Client(websocket, ctx)
+        client.slot = int(await websocket.recv())
+        client.team = 0
+        client.auth = True
+        client.items_handling = 0b111  # receive own items too
+        ctx.endpoints.append(client)
+        ctx.clients[0][client.slot].append(client)
+        await websocket.wait_closed()
+
+    async def main() -> None:
+        connected = multiprocessing.Event()
+        done = multiprocessing.Event()
+        frames = multiprocessing.Value("L", 0)
+        loop = asyncio.get_running_loop()
+        async with websockets.serve(handle_client, "127.0.0.1", 0, ping_interval=None, open_timeout=None,
+                                    extensions=[server_per_message_deflate_factory]) as websocket_server:
+            port = websocket_server.sockets[0].getsockname()[1]
+            clients = multiprocessing.Process(target=_run_clients, args=(port, expected_items, connected, done,
+                                                                         frames))
+            clients.start()
+            await loop.run_in_executor(None, connected.wait)
+            while sum(len(slot_clients) for slot_clients in ctx.clients[0].values()) < players:
+                await asyncio.sleep(0.01)
+
+            start = time.perf_counter()
+            start_cpu = time.process_time()
+            for slot in slots:
+                release_player(ctx, 0, slot)
+                await asyncio.sleep(0)  # each command arrives in its own event loop iteration
+            await loop.run_in_executor(None, done.wait)
+            taken = time.perf_counter() - start
+            taken_cpu = time.process_time() - start_cpu
+        clients.join()  # clients disconnect once the server closed
+
+        logger.info(f"Room-wide release of {players} slots with {locations_per_player} locations each: "
+                    f"{taken_cpu:.2f} seconds of server CPU time, {taken:.2f} seconds until all items arrived, "
+                    f"{frames.value} frames received.")
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from path_change import change_home
+    change_home()
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=300)
+    parser.add_argument("--locations", type=int, default=50)
+    benchmark_args = parser.parse_args()
+    run_broadcast_benchmark(benchmark_args.players, benchmark_args.locations)
@@ -0,0 +1,96 @@
+class _Socket:
+    """Stands in for a client connection, the messages for it are dropped instead of sent."""
+    open = True
+
+    async def send(self, data: "str | bytes") -> None:
+        pass
+
+
+def run_data_storage_benchmark(keys: int = 10000, players: int = 500, sets: int = 50000,
+                               shared_keys: int = 10) -> None:
+    """
+    Stress the data storage of a room: each slot's client subscribes to its own share of the keys and to a few keys
+    that every client subscribes to, like deathlink or gifting do. Then random keys are changed with Set, some of them
+    with operations that modify containers. Finally every client reads its keys with Get.
+
+    :param keys: number of keys in the data storage
+    :param players: number of slots, each with a connected client
+    :param sets: number of Set commands to process
+    :param shared_keys: number of keys every client subscribes to, which get a tenth of the Set commands
+    """
+    import asyncio
+    import logging
+    import random
+    import time
+
+    from MultiServer import Client, Context, process_client_cmd
+    from Utils import init_logging
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    async def main() -> None:
+        random.seed(0)
+        ctx = Context("127.0.0.1", 0, "", "", 0, 0, False)
+        ctx.clients = {0: {}}
+        clients = []
+        for slot in range(1, players + 1):
+            client = Client(_Socket(), ctx)  # type: ignore[arg-type]
+            client.team, client.slot, client.auth = 0, slot, True
+            ctx.clients[0][slot] = [client]
+            clients.append(client)
+        key_names = [f"key{key}" for key in range(keys)]
+        shared_key_names = [f"shared{key}" for key in range(shared_keys)]
+        own_keys = keys // players
+        for index, client in enumerate(clients):
+            await process_client_cmd(ctx, client, {
+                "cmd": "SetNotify", "keys": key_names[index * own_keys:(index + 1) * own_keys] + shared_key_names})
+
+        commands = []
+        for number in range(sets):
+            if number % 10 == 0:
+                key = random.choice(shared_key_names)
+                operations, default = [{"operation": "add", "value": 1}], 0
+            else:
+                key_index = random.randrange(keys)
+                key = key_names[key_index]
+                if key_index % 3 == 0:
+                    operations, default = [{"operation": "update", "value": {str(number % 50): number}}], {}
+                else:
+                    operations, default = [{"operation": "add", "value": [number]}], []
+            commands.append((random.choice(clients), {"cmd": "Set", "key": key, "default": default,
+                                                      "want_reply": number % 2 == 0, "operations": operations}))
+
+        start = time.perf_counter()
+        for client, command in commands:
+            await process_client_cmd(ctx, client, command)
+            ctx.outbound.clear()
+        taken = time.perf_counter() - start
+        get_start = time.perf_counter()
+        for index, client in enumerate(clients):
+            await process_client_cmd(ctx, client, {
+                "cmd": "Get", "keys": key_names[index * own_keys:(index + 1) * own_keys] + shared_key_names})
+            ctx.outbound.clear()
+        get_taken = time.perf_counter() - get_start
+        if ctx.outbound_flush:
+            ctx.outbound_flush.cancel()
+
+        logger.info(f"{keys} keys, {players} subscribed clients: {sets / taken:.0f} Set commands per second, "
+                    f"{players / get_taken:.0f} Get commands of {own_keys + shared_keys} keys per second, "
+                    f"{len(ctx.stored_data_notification_clients)} keys with subscriber entries.")
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from path_change import change_home
+    change_home()
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keys", type=int, default=10000)
+    parser.add_argument("--players", type=int, default=500)
+    parser.add_argument("--sets", type=int, default=50000)
+    benchmark_args = parser.parse_args()
+    run_data_storage_benchmark(benchmark_args.keys, benchmark_args.players, benchmark_args.sets)
@@ -0,0 +1,67 @@
+def run_entrance_rando_benchmark(games: "typing.Sequence[str]" = ("Stardew Valley", "The Messenger"),
+                                 players: int = 5, rounds: int = 5) -> None:
+    """
+    Measure connect_entrances of worlds that randomize their entrances with randomize_entrances, on multiworlds of
+    `players` slots of a single game each. The pairing hash has to stay the same when entrance randomization is only
+    made faster.
+
+    :param games: games to create a multiworld of each, with their entrance randomization turned on
+    :param players: number of slots in each multiworld
+    :param rounds: how many multiworlds to randomize the entrances of per game
+    """
+    import gc
+    import hashlib
+    import logging
+    import random
+    import time
+    import typing
+
+    from multiworld import generate_benchmark_multiworld
+
+    from Utils import init_logging
+    from worlds.AutoWorld import call_all
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    # the option turning on entrance randomization for each game, set to its most shuffled value
+    er_options = {
+        "Stardew Valley": ("entrance_randomization", 4),  # buildings
+        "The Messenger": ("shuffle_transitions", 2),  # decoupled
+    }
+
+    for game in games:
+        option_name, value = er_options[game]
+        timings: typing.List[float] = []
+        pairings: typing.List[typing.Tuple[int, str, str]] = []
+        for _ in range(rounds):
+            # default options may be random, which are rolled through the global random
+            random.seed(0)
+            multiworld = generate_benchmark_multiworld((game,), players, steps=())
+            for world in multiworld.worlds.values():
+                getattr(world.options, option_name).value = value
+            for step in ("generate_early", "create_regions", "create_items", "set_rules"):
+                call_all(multiworld, step)
+            gc.collect()
+            start = time.perf_counter()
+            call_all(multiworld, "connect_entrances")
+            timings.append(time.perf_counter() - start)
+            pairings = sorted((entrance.player, entrance.name, entrance.connected_region.name)
+                              for entrance in multiworld.get_entrances() if entrance.connected_region)
+        logger.info(f"{game}: connect_entrances of {players} slots, fastest {min(timings) * 1000:.1f} ms, "
+                    f"average {sum(timings) / rounds * 1000:.1f} ms, "
+                    f"pairing hash {hashlib.sha256(repr(pairings).encode()).hexdigest()[:16]}.")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from path_change import change_home
+    change_home()
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=5)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("games", nargs="*", default=["Stardew Valley", "The Messenger"])
+    benchmark_args = parser.parse_args()
+    run_entrance_rando_benchmark(benchmark_args.games, benchmark_args.players, benchmark_args.rounds)
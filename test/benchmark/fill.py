@@ -0,0 +1,63 @@
+def run_fill_benchmark(games: "typing.Sequence[str]" = ("Hollow Knight", "Timespinner", "Super Metroid", "Lingo",
+                                                       "A Link to the Past"),
+                       players: int = 50) -> None:
+    """
+    Measure distribute_items_restrictive on a large multiworld, and how many locations fill_restrictive tests.
+
+    :param games: games to cycle through when creating slots
+    :param players: number of slots in the multiworld
+    """
+    import hashlib
+    import logging
+    import random
+    import typing
+
+    from time_it import TimeIt
+    from multiworld import generate_benchmark_multiworld
+
+    import worlds  # worlds have to be loaded before Fill, as they import from it
+    from BaseClasses import CollectionState, Item, Location
+    from Fill import distribute_items_restrictive
+    from Utils import init_logging
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    # default options may be random, which are rolled through the global random
+    random.seed(0)
+    with TimeIt(f"generating {players} slots of {', '.join(games)}", logger):
+        multiworld = generate_benchmark_multiworld(games, players)
+
+    can_fill_calls = 0
+    original_can_fill = Location.can_fill
+
+    def counted_can_fill(location: Location, state: CollectionState, item: Item, check_access: bool = True) -> bool:
+        nonlocal can_fill_calls
+        can_fill_calls += 1
+        return original_can_fill(location, state, item, check_access)
+
+    Location.can_fill = counted_can_fill
+    try:
+        with TimeIt("distribute_items_restrictive", logger):
+            distribute_items_restrictive(multiworld)
+    finally:
+        Location.can_fill = original_can_fill
+    logger.info(f"{can_fill_calls} calls to Location.can_fill during fill.")
+
+    placements = [(str(location), str(location.item)) for location in multiworld.get_filled_locations()]
+    logger.info(f"{len(placements)} filled locations, "
+                f"placement hash {hashlib.sha256(repr(placements).encode()).hexdigest()[:16]}.")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from path_change import change_home
+    change_home()
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=50)
+    parser.add_argument("games", nargs="*", default=["Hollow Knight", "Timespinner", "Super Metroid", "Lingo",
+                                                     "A Link to the Past"])
+    benchmark_args = parser.parse_args()
+    run_fill_benchmark(benchmark_args.games, benchmark_args.players)
@@ -12,7 +12,8 @@ def run_load_worlds_benchmark():
 
     import BaseClasses, Launcher, Fill
 
-    from worlds import world_sources
+    from worlds import load_all_worlds, world_sources
+    load_all_worlds()
 
     init_logging("Benchmark Runner")
     logger = logging.getLogger("Benchmark")
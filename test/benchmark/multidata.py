@@ -0,0 +1,112 @@
+def run_multidata_benchmark(games: "typing.Sequence[str]" = ("Hollow Knight", "Timespinner", "Super Metroid", "Lingo",
+                                                            "A Link to the Past"),
+                            players: int = 300) -> None:
+    """
+    Measure peak memory and time of writing and loading multidata, compressed as a whole and streamed.
+
+    :param games: games to cycle through when creating slots
+    :param players: number of slots in the multiworld
+    """
+    import logging
+    import os
+    import random
+    import tempfile
+    import time
+    import tracemalloc
+    import typing
+    import zlib
+
+    from multiworld import generate_benchmark_multiworld
+
+    import worlds
+    from Main import write_multidata_file
+    from MultiServer import Context
+    from NetUtils import Hint, NetworkSlot, convert_to_base_types
+    from Utils import init_logging, restricted_dumps, restricted_loads
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    # default options may be random, which are rolled through the global random
+    random.seed(0)
+    multiworld = generate_benchmark_multiworld(games, players)
+    # placement logic doesn't matter for the size of the multidata
+    locations = [location for location in multiworld.get_unfilled_locations() if location.address is not None]
+    items = [item for item in multiworld.itempool if item.code is not None]
+    multiworld.random.shuffle(items)
+    for location, item in zip(locations, items):
+        location.place_locked_item(item)
+
+    locations_data: typing.Dict[int, typing.Dict[int, typing.Tuple[int, int, int]]] = {
+        player: {} for player in multiworld.player_ids
+    }
+    hints: typing.Dict[int, typing.Set[Hint]] = {player: set() for player in multiworld.player_ids}
+    for location in multiworld.get_filled_locations():
+        if type(location.address) is not int:
+            continue
+        item = location.item
+        locations_data[location.player][location.address] = item.code, item.player, item.flags
+        if item.advancement:
+            hint = Hint(item.player, location.player, location.address, item.code, False)
+            hints[location.player].add(hint)
+            hints[item.player].add(hint)
+    multidata = {
+        "slot_data": convert_to_base_types({player: multiworld.worlds[player].fill_slot_data()
+                                            for player in multiworld.player_ids}),
+        "slot_info": {player: NetworkSlot(multiworld.player_name[player], multiworld.game[player],
+                                          multiworld.player_types[player]) for player in multiworld.player_ids},
+        "connect_names": {name: (0, player) for player, name in multiworld.player_name.items()},
+        "locations": locations_data,
+        "precollected_hints": hints,
+        "datapackage": {game: worlds.network_data_package["games"][game] for game in games},
+    }
+
+    def measure(name: str, function: typing.Callable[[], typing.Any]) -> None:
+        tracemalloc.start()
+        start = time.perf_counter()
+        function()
+        taken = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        logger.info(f"{name}: peak of {peak / 1024 ** 2:.1f} MiB newly allocated, {taken:.2f} seconds")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        whole_path = os.path.join(temp_dir, "whole.archipelago")
+        streamed_path = os.path.join(temp_dir, "streamed.archipelago")
+
+        def write_whole() -> None:
+            serialized_multidata = zlib.compress(restricted_dumps(multidata), 9)
+            with open(whole_path, "wb") as f:
+                f.write(bytes([3]))
+                f.write(serialized_multidata)
+
+        def load_whole() -> None:
+            with open(whole_path, "rb") as f:
+                data = f.read()
+            restricted_loads(zlib.decompress(data[1:]))
+
+        def load_streamed() -> None:
+            with open(streamed_path, "rb") as f:
+                Context.decompress(f)
+
+        logger.info(f"Multidata of {players} slots of {', '.join(games)}.")
+        measure("writing compressed as a whole", write_whole)
+        measure("writing streamed", lambda: write_multidata_file(multidata, streamed_path))
+        logger.info(f"{os.path.getsize(whole_path)} bytes compressed as a whole, "
+                    f"{os.path.getsize(streamed_path)} bytes streamed.")
+        measure("loading decompressed as a whole", load_whole)
+        measure("loading streamed", load_streamed)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from path_change import change_home
+    change_home()
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=300)
+    parser.add_argument("games", nargs="*", default=["Hollow Knight", "Timespinner", "Super Metroid", "Lingo",
+                                                     "A Link to the Past"])
+    benchmark_args = parser.parse_args()
+    run_multidata_benchmark(benchmark_args.games, benchmark_args.players)
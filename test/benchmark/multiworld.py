@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import typing
+
+if typing.TYPE_CHECKING:
+    from BaseClasses import MultiWorld
+
+
+def generate_benchmark_multiworld(games: typing.Sequence[str], players: int, seed: int = 0,
+                                  steps: typing.Optional[typing.Tuple[str, ...]] = None) -> MultiWorld:
+    """
+    Creates a multiworld of `players` slots with default options, cycling through `games`, and calls the gen steps
+    through pre_fill on it.
+
+    :param games: game names to cycle through when assigning slots
+    :param players: number of slots to create
+    :param seed: seed for the multiworld
+    :param steps: gen steps to call, defaults to everything up to and including pre_fill
+    """
+    import argparse
+
+    from BaseClasses import CollectionState, MultiWorld
+    from worlds import AutoWorld
+    from worlds.AutoWorld import call_all
+
+    if steps is None:
+        steps = ("generate_early", "create_regions", "create_items", "set_rules", "connect_entrances",
+                 "generate_basic", "pre_fill")
+
+    multiworld = MultiWorld(players)
+    multiworld.game = {player: games[(player - 1) % len(games)] for player in multiworld.player_ids}
+    multiworld.player_name = {player: f"Player{player}" for player in multiworld.player_ids}
+    multiworld.set_seed(seed)
+    args = argparse.Namespace()
+    for player, game in multiworld.game.items():
+        for name, option in AutoWorld.AutoWorldRegister.world_types[game].options_dataclass.type_hints.items():
+            if not hasattr(args, name):
+                setattr(args, name, {})
+            getattr(args, name)[player] = option.from_any(option.default)
+    multiworld.set_options(args)
+    multiworld.set_item_links()
+    multiworld.state = CollectionState(multiworld)
+    for step in steps:
+        call_all(multiworld, step)
+    return multiworld
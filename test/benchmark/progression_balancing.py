@@ -0,0 +1,56 @@
+def run_progression_balancing_benchmark(games: "typing.Sequence[str]" = ("Timespinner", "A Link to the Past", "Lingo",
+                                                                         "Hollow Knight"),
+                                        players: int = 100, progression_balancing: int = 50) -> None:
+    """
+    Measure balance_multiworld_progression on a large filled multiworld, compared with the main fill.
+    The placement hash afterward has to stay the same when balancing is only made faster.
+
+    :param games: games to cycle through when creating slots
+    :param players: number of slots in the multiworld
+    :param progression_balancing: progression balancing value of every slot
+    """
+    import hashlib
+    import logging
+    import random
+    import typing
+
+    from time_it import TimeIt
+    from multiworld import generate_benchmark_multiworld
+
+    import worlds  # worlds have to be loaded before Fill, as they import from it
+    from Fill import balance_multiworld_progression, distribute_items_restrictive
+    from Utils import init_logging
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    # default options may be random, which are rolled through the global random
+    random.seed(0)
+    with TimeIt(f"generating {players} slots of {', '.join(games)}", logger):
+        multiworld = generate_benchmark_multiworld(games, players)
+    for world in multiworld.worlds.values():
+        world.options.progression_balancing.value = progression_balancing
+
+    with TimeIt("distribute_items_restrictive", logger):
+        distribute_items_restrictive(multiworld)
+    with TimeIt("balance_multiworld_progression", logger):
+        balance_multiworld_progression(multiworld)
+
+    placements = [(str(location), str(location.item)) for location in multiworld.get_filled_locations()]
+    logger.info(f"{len(placements)} filled locations, "
+                f"placement hash {hashlib.sha256(repr(placements).encode()).hexdigest()[:16]}.")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from path_change import change_home
+    change_home()
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--progression-balancing", type=int, default=50)
+    parser.add_argument("games", nargs="*", default=["Timespinner", "A Link to the Past", "Lingo", "Hollow Knight"])
+    benchmark_args = parser.parse_args()
+    run_progression_balancing_benchmark(benchmark_args.games, benchmark_args.players,
+                                        benchmark_args.progression_balancing)
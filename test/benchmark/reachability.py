@@ -0,0 +1,54 @@
+def run_reachability_benchmark(games: "typing.Sequence[str]" = ("Hollow Knight", "Timespinner", "Super Metroid"),
+                               players: int = 60) -> None:
+    """
+    Compare sphere sweeps of a filled multiworld with and without incremental reachability.
+
+    :param games: games to cycle through when creating slots
+    :param players: number of slots in the multiworld
+    """
+    import logging
+    import typing
+
+    from time_it import TimeIt
+    from multiworld import generate_benchmark_multiworld
+
+    import worlds  # worlds have to be loaded before Fill, as they import from it
+    from BaseClasses import Location
+    from Fill import distribute_items_restrictive
+    from Utils import init_logging
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    with TimeIt(f"generating and filling {players} slots of {', '.join(games)}", logger):
+        multiworld = generate_benchmark_multiworld(games, players)
+        distribute_items_restrictive(multiworld)
+
+    results: typing.Dict[bool, typing.List[typing.Set[Location]]] = {}
+    for incremental in (False, True):
+        for world in multiworld.worlds.values():
+            world.incremental_reachability = incremental
+        with TimeIt(f"sphere sweep with incremental_reachability={incremental}", logger):
+            results[incremental] = list(multiworld.get_spheres())
+        logger.info(f"{len(results[incremental])} spheres")
+
+    if results[False] == results[True]:
+        logger.info("Spheres are identical.")
+    else:
+        mismatched_games = {location.game for full_sphere, incremental_sphere in zip(results[False], results[True])
+                            for location in full_sphere ^ incremental_sphere}
+        logger.warning(f"Spheres differ, these games don't meet the incremental reachability requirements: "
+                       f"{', '.join(sorted(mismatched_games))}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from path_change import change_home
+    change_home()
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=60)
+    parser.add_argument("games", nargs="*", default=["Hollow Knight", "Timespinner", "Super Metroid"])
+    benchmark_args = parser.parse_args()
+    run_reachability_benchmark(benchmark_args.games, benchmark_args.players)
@@ -0,0 +1,87 @@
+def run_rules_benchmark(games: "typing.Sequence[str]" = ("Ocarina of Time", "A Link to the Past", "Timespinner",
+                                                         "Lingo"),
+                        rounds: int = 20) -> None:
+    """
+    Measure evaluations per second of access rules: chains of add_rule, as nested closures like add_rule used to
+    create, compiled by add_rule, and built from Rule nodes, then all location and entrance rules of some worlds.
+
+    :param games: games to evaluate all access rules of, with a solo multiworld each
+    :param rounds: how often each rule is evaluated per state
+    """
+    import gc
+    import logging
+    import time
+    import typing
+
+    from multiworld import generate_benchmark_multiworld
+
+    from BaseClasses import CollectionState, Entrance, Item, ItemClassification, Location
+    from Utils import init_logging
+    from worlds.generic.Rules import CollectionRule, Has, add_rule
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    def evaluations_per_second(spots: typing.Sequence[typing.Union[Location, Entrance]],
+                               state: CollectionState) -> float:
+        # compile rules that were not evaluated yet, which then replace themselves on their spot
+        for spot in spots:
+            spot.access_rule(state)
+        rules = [spot.access_rule for spot in spots]
+        gc.freeze()
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for rule in rules:
+                rule(state)
+        elapsed = time.perf_counter() - start
+        gc.unfreeze()
+        return len(rules) * rounds / elapsed
+
+    def nested_add_rule(spot: Location, rule: CollectionRule) -> None:
+        """add_rule as it was before rules were compiled"""
+        old_rule = spot.access_rule
+        if old_rule is Location.access_rule:
+            spot.access_rule = rule
+        else:
+            spot.access_rule = lambda state: rule(state) and old_rule(state)
+
+    multiworld = generate_benchmark_multiworld(("Archipelago",), 1, steps=())
+    state = CollectionState(multiworld)
+    for index in range(4):
+        state.collect(Item(f"Item {index}", ItemClassification.progression, None, 1), True)
+    for length in (1, 2, 4, 8):
+        results = []
+        for name in ("nested closures", "compiled by add_rule", "Rule nodes"):
+            locations = [Location(1, f"Location {index}") for index in range(1000)]
+            for location in locations:
+                for index in range(length):
+                    item_name = f"Item {index % 4}"
+                    if name == "Rule nodes":
+                        add_rule(location, Has(item_name, 1))
+                    else:
+                        (nested_add_rule if name == "nested closures" else add_rule)(
+                            location, lambda state, item_name=item_name: state.has(item_name, 1))
+            per_second = evaluations_per_second(locations, state)
+            results.append(f"{name} {per_second:,.0f}")
+        logger.info(f"Chains of {length} rules, evaluations per second: {', '.join(results)}")
+
+    for game in games:
+        multiworld = generate_benchmark_multiworld((game,), 1)
+        spots = [*multiworld.get_locations(), *multiworld.get_entrances()]
+        for state_name, state in (("empty_state", CollectionState(multiworld)),
+                                  ("all_state", multiworld.get_all_state(False))):
+            logger.info(f"{game}: {len(spots)} access rules, "
+                        f"{evaluations_per_second(spots, state):,.0f} evaluations per second in {state_name}.")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from path_change import change_home
+    change_home()
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("games", nargs="*", default=["Ocarina of Time", "A Link to the Past", "Timespinner", "Lingo"])
+    benchmark_args = parser.parse_args()
+    run_rules_benchmark(benchmark_args.games, benchmark_args.rounds)
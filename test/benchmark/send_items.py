@@ -0,0 +1,61 @@
+class _Socket:
+    """Stands in for a client connection, the items queued for it are dropped instead of sent."""
+    open = True
+
+
+def run_send_items_benchmark(room_sizes: "typing.Sequence[int]" = (10, 100, 500), sends: int = 10000) -> None:
+    """
+    Measure how many single item sends per second the server can process, which is what every location check of a
+    client results in, for rooms of different sizes with one connected client per slot.
+
+    :param room_sizes: numbers of slots to measure with
+    :param sends: number of items to send in each room, each to a random slot
+    """
+    import asyncio
+    import logging
+    import random
+    import time
+
+    from MultiServer import Client, Context, send_items_to, send_new_items
+    from NetUtils import NetworkItem
+    from Utils import init_logging
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    async def measure(players: int) -> None:
+        random.seed(0)
+        ctx = Context("127.0.0.1", 0, "", "", 0, 0, False)
+        ctx.clients = {0: {}}
+        for slot in range(1, players + 1):
+            client = Client(_Socket(), ctx)  # type: ignore[arg-type]
+            client.team, client.slot, client.items_handling = 0, slot, 0b111
+            ctx.clients[0][slot] = [client]
+        targets = [random.randint(1, players) for _ in range(sends)]
+
+        start = time.perf_counter()
+        for location, target in enumerate(targets):
+            send_items_to(ctx, 0, target, NetworkItem(1, location, 1, 0))
+            send_new_items(ctx)
+            ctx.outbound.clear()
+        taken = time.perf_counter() - start
+        if ctx.outbound_flush:
+            ctx.outbound_flush.cancel()
+
+        logger.info(f"{players} slots: {sends / taken:.0f} item sends per second.")
+
+    for room_size in room_sizes:
+        asyncio.run(measure(room_size))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from path_change import change_home
+    change_home()
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sends", type=int, default=10000)
+    parser.add_argument("room_sizes", type=int, nargs="*", default=[10, 100, 500])
+    benchmark_args = parser.parse_args()
+    run_send_items_benchmark(benchmark_args.room_sizes, benchmark_args.sends)
@@ -0,0 +1,68 @@
+def run_spheres_benchmark(games: "typing.Sequence[str]" = ("Hollow Knight", "Timespinner", "Super Metroid"),
+                          players: int = 60) -> None:
+    """
+    Compare MultiWorld.get_spheres with re-testing every remaining location for every sphere, on a filled multiworld,
+    with and without incremental reachability.
+
+    :param games: games to cycle through when creating slots
+    :param players: number of slots in the multiworld
+    """
+    import logging
+    import typing
+
+    from time_it import TimeIt
+    from multiworld import generate_benchmark_multiworld
+
+    import worlds  # worlds have to be loaded before Fill, as they import from it
+    from BaseClasses import CollectionState, Location, MultiWorld
+    from Fill import distribute_items_restrictive
+    from Utils import init_logging
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    def rescan_spheres(multiworld: MultiWorld) -> typing.Iterator[typing.Set[Location]]:
+        """get_spheres as it was before SphereSearch"""
+        state = CollectionState(multiworld)
+        locations = set(multiworld.get_filled_locations())
+        while locations:
+            sphere = {location for location in locations if location.can_reach(state)}
+            yield sphere
+            if not sphere:
+                yield locations
+                break
+            for location in sphere:
+                state.collect(location.item, True, location)
+            locations -= sphere
+
+    with TimeIt(f"generating and filling {players} slots of {', '.join(games)}", logger):
+        multiworld = generate_benchmark_multiworld(games, players)
+        distribute_items_restrictive(multiworld)
+
+    for incremental in (False, True):
+        for world in multiworld.worlds.values():
+            world.incremental_reachability = incremental
+        with TimeIt(f"re-testing all locations with incremental_reachability={incremental}", logger):
+            rescanned = list(rescan_spheres(multiworld))
+        with TimeIt(f"get_spheres with incremental_reachability={incremental}", logger):
+            searched = list(multiworld.get_spheres())
+        if rescanned == searched:
+            logger.info(f"{len(searched)} spheres, identical.")
+        else:
+            mismatched_games = {location.game for rescanned_sphere, searched_sphere in zip(rescanned, searched)
+                                for location in rescanned_sphere ^ searched_sphere}
+            logger.warning(f"Spheres differ, these games don't meet the incremental reachability requirements: "
+                           f"{', '.join(sorted(mismatched_games))}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from path_change import change_home
+    change_home()
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=60)
+    parser.add_argument("games", nargs="*", default=["Hollow Knight", "Timespinner", "Super Metroid"])
+    benchmark_args = parser.parse_args()
+    run_spheres_benchmark(benchmark_args.games, benchmark_args.players)
@@ -0,0 +1,79 @@
+def run_state_copy_benchmark(games: "typing.Sequence[str]" = ("Hollow Knight", "Timespinner", "Lingo"),
+                             players: int = 100, copies: int = 50) -> None:
+    """
+    Measure CollectionState.copy during a fill, and the time and memory of copying a swept all_state.
+
+    :param games: games to cycle through when creating slots
+    :param players: number of slots in the multiworld
+    :param copies: number of copies of all_state to keep alive for the memory measurement
+    """
+    import gc
+    import logging
+    import time
+    import tracemalloc
+    import typing
+
+    from time_it import TimeIt
+    from multiworld import generate_benchmark_multiworld
+
+    import worlds  # worlds have to be loaded before Fill, as they import from it
+    from BaseClasses import CollectionState
+    from Fill import distribute_items_restrictive
+    from Utils import init_logging
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+
+    with TimeIt(f"generating {players} slots of {', '.join(games)}", logger):
+        multiworld = generate_benchmark_multiworld(games, players)
+
+    copy_calls = 0
+    copy_time = 0.0
+    original_copy = CollectionState.copy
+
+    def timed_copy(state: CollectionState) -> CollectionState:
+        nonlocal copy_calls, copy_time
+        start = time.perf_counter()
+        ret = original_copy(state)
+        copy_time += time.perf_counter() - start
+        copy_calls += 1
+        return ret
+
+    CollectionState.copy = timed_copy
+    try:
+        with TimeIt("distribute_items_restrictive", logger):
+            distribute_items_restrictive(multiworld)
+    finally:
+        CollectionState.copy = original_copy
+    logger.info(f"{copy_calls} state copies during fill took {copy_time:.4f} seconds.")
+
+    all_state = multiworld.get_all_state()
+    player_regions = {player: next(iter(multiworld.get_regions(player))) for player in multiworld.player_ids}
+
+    gc.collect()
+    tracemalloc.start()
+    kept: typing.List[CollectionState] = []
+    with TimeIt(f"{copies} copies of all_state, each reaching one player's region", logger):
+        for i in range(copies):
+            state = all_state.copy()
+            player = i % players + 1
+            state.can_reach(player_regions[player])
+            kept.append(state)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    logger.info(f"{copies} copies of all_state hold {current / 1024 / 1024:.2f} MiB "
+                f"(peak {peak / 1024 / 1024:.2f} MiB).")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from path_change import change_home
+    change_home()
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--players", type=int, default=100)
+    parser.add_argument("--copies", type=int, default=50)
+    parser.add_argument("games", nargs="*", default=["Hollow Knight", "Timespinner", "Lingo"])
+    benchmark_args = parser.parse_args()
+    run_state_copy_benchmark(benchmark_args.games, benchmark_args.players, benchmark_args.copies)
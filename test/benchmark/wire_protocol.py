@@ -0,0 +1,72 @@
+def run_wire_protocol_benchmark(repetitions: int = 20) -> None:
+    """
+    Compare the JSON and binary encodings of typical server messages: encode and decode throughput, and frame size
+    before and after the compression that per-message deflate applies.
+
+    :param repetitions: how often each message is encoded and decoded per measurement
+    """
+    import logging
+    import random
+    import time
+    import zlib
+
+    from NetUtils import (NetworkItem, NetworkPlayer, NetworkSlot, SlotType, decode, decode_binary, encode,
+                          encode_binary, msgpack)
+    from Utils import init_logging
+    from worlds import network_data_package
+
+    init_logging("Benchmark Runner")
+    logger = logging.getLogger("Benchmark")
+    if not msgpack:
+        logger.error("msgpack is not installed, there is no binary encoding to compare with.")
+        return
+
+    random.seed(0)
+    players = 500
+    messages = {
+        "ReceivedItems": [{"cmd": "ReceivedItems", "index": 0,
+                           "items": [NetworkItem(random.randrange(1 << 20), random.randrange(1 << 20),
+                                                 random.randrange(1, players + 1), random.choice((0, 1, 2, 4)))
+                                     for _ in range(5000)]}],
+        "Connected": [{"cmd": "Connected", "team": 0, "slot": 1,
+                       "players": [NetworkPlayer(0, slot, f"Player{slot}", f"Player{slot}")
+                                   for slot in range(1, players + 1)],
+                       "missing_locations": list(range(1000, 1500)), "checked_locations": list(range(2000, 2100)),
+                       "slot_info": {slot: NetworkSlot(f"Player{slot}", "Archipelago", SlotType.player)
+                                     for slot in range(1, players + 1)},
+                       "hint_points": 0}],
+        "RoomUpdate": [{"cmd": "RoomUpdate", "checked_locations": set(range(100)), "hint_points": 10}],
+        "PrintJSON": [{"cmd": "PrintJSON", "type": "ItemSend", "receiving": 2, "item": NetworkItem(1, 2, 3, 1),
+                       "data": [{"text": "1", "type": "player_id"}, {"text": " sent "},
+                                {"text": "1", "player": 2, "flags": 1, "type": "item_id"},
+                                {"text": " to "}, {"text": "2", "type": "player_id"}]}] * 20,
+        "DataPackage": [{"cmd": "DataPackage", "data": network_data_package}],
+    }
+
+    def measure(function, argument) -> float:
+        start = time.perf_counter()
+        for _ in range(repetitions):
+            function(argument)
+        return (time.perf_counter() - start) / repetitions
+
+    for name, msgs in messages.items():
+        results = []
+        for encoding, encoder, decoder in (("JSON", encode, decode), ("msgpack", encode_binary, decode_binary)):
+            frame = encoder(msgs)
+            data = frame.encode() if isinstance(frame, str) else frame
+            results.append(f"{encoding}: encode {measure(encoder, msgs) * 1000:.3f} ms, "
+                           f"decode {measure(decoder, frame) * 1000:.3f} ms, "
+                           f"{len(data)} bytes, {len(zlib.compress(data))} compressed")
+        logger.info(f"{name}:\n  " + "\n  ".join(results))
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from path_change import change_home
+    change_home()
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repetitions", type=int, default=20)
+    benchmark_args = parser.parse_args()
+    run_wire_protocol_benchmark(benchmark_args.repetitions)
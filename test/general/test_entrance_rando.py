@@ -303,6 +303,23 @@ class TestRandomizeEntrances(unittest.TestCase):
         self.assertEqual(80, len(result.pairings))
         self.assertEqual(80, len(result.placements))
 
+    def test_state_matches_full_sweep(self):
+        """tests that the state, updated only behind each new connection, ends up like a fresh sweep of the result"""
+        multiworld = generate_test_multiworld()
+        generate_disconnected_region_grid(multiworld, 5)
+        for index in (3, 8, 13):
+            region = multiworld.get_region(f"region{index}", 1)
+            region.add_event(f"Event {index}", f"Event {index}")
+            for exit_ in multiworld.get_region(f"region{index + 7}", 1).exits:
+                set_rule(exit_, lambda state, index=index: state.has(f"Event {index}", 1))
+
+        result = randomize_entrances(multiworld.worlds[1], True, directionally_matched_group_lookup)
+
+        fresh_state = multiworld.get_all_state(False)
+        self.assertEqual(fresh_state.reachable_regions[1], result.collection_state.reachable_regions[1])
+        self.assertEqual(fresh_state.advancements, result.collection_state.advancements)
+        self.assertEqual(3, len(result.collection_state.advancements))
+
     def test_coupled(self):
         """tests that in coupled mode, all 2 way transitions have an inverse"""
         multiworld = generate_test_multiworld()
@@ -1,4 +1,5 @@
 from typing import List, Iterable
+import hashlib
 import unittest
 
 from Options import Accessibility
@@ -463,6 +464,24 @@ class TestFillRestrictive(unittest.TestCase):
         self.assertEqual(1, len(player1.prog_items))
         self.assertIsNot(loc0.item, player1.prog_items[0], "Filled item was still present in item pool")
 
+    def test_fill_uses_first_fillable_location(self):
+        """Test that skipping unreachable and excluded locations still fills the first location that can be filled"""
+        multiworld = generate_test_multiworld()
+        player1 = generate_player_data(multiworld, 1, 2, 2, 1)
+        excluded, menu_location = player1.locations
+        locked = player1.generate_region(player1.menu, 3, lambda state: state.has("Not in Pool", player1.id))
+        excluded.progress_type = LocationProgressType.EXCLUDED
+        locked.locations[1].always_allow = lambda state, item: True
+        locations = [locked.locations[0], excluded, locked.locations[1], locked.locations[2], menu_location]
+        items = [player1.basic_items[0], *player1.prog_items]
+
+        fill_restrictive(multiworld, multiworld.state, locations, items, one_item_per_player=False)
+
+        self.assertEqual(locked.locations[1].item, player1.prog_items[1])
+        self.assertEqual(menu_location.item, player1.prog_items[0])
+        self.assertEqual(excluded.item, player1.basic_items[0])
+        self.assertEqual([locked.locations[0], locked.locations[2]], locations)
+
 
 class TestDistributeItemsRestrictive(unittest.TestCase):
     def test_basic_distribute(self):
@@ -880,3 +899,54 @@ class TestBalanceMultiworldProgression(unittest.TestCase):
 
         self.assertRegionContains(
             self.player1.regions[2], self.player2.prog_items[0])
+
+
+class TestBalanceMultiworldProgressionSeeds(unittest.TestCase):
+    # digests of the placements after balancing, taken before balancing searched spheres incrementally.
+    # Only update these when the balancing algorithm is meant to produce different results.
+    expected_placements = {
+        (1, 50): "868e8dfb40d53c36",
+        (1, 99): "bba2de7827a76923",
+        (2, 50): "da51910c0ec3b555",
+        (2, 99): "f9ff9a1288df7f26",
+        (3, 50): "90bb8e5fd54d8395",
+        (3, 99): "6a1c8a776c056ce4",
+        (4, 50): "e21aaf32da90ae7e",
+        (4, 99): "408157859734b115",
+    }
+
+    def generate_filled_multiworld(self, seed: int, progression_balancing: int) -> MultiWorld:
+        """Fills 4 players of differently sized chains of regions, that each need the previous region's item"""
+        multiworld = generate_test_multiworld(4)
+        multiworld.random.seed(seed)
+        for player in multiworld.player_ids:
+            multiworld.worlds[player].options.progression_balancing.value = progression_balancing
+            player_data = generate_player_data(multiworld, player, 2 * player, prog_item_count=6, basic_item_count=44)
+            other_player = player % 4 + 1
+            region = player_data.menu
+            for index, item in enumerate(player_data.prog_items):
+                if index == 3:
+                    # also depend on another player, so balancing one player can unlock another
+                    def rule(state, item_name=item.name, player=player, other_player=other_player) -> bool:
+                        return (state.has(item_name, player)
+                                and state.has(f"player{other_player}_progitem0", other_player))
+                else:
+                    def rule(state, item_name=item.name, player=player) -> bool:
+                        return state.has(item_name, player)
+                size = (50 - 2 * player) // 6 + (index == 5) * ((50 - 2 * player) % 6)
+                region = player_data.generate_region(region, size, rule)
+            multiworld.completion_condition[player] = lambda state, items=list(names(player_data.prog_items)), \
+                player=player: state.has_all(items, player)
+        distribute_items_restrictive(multiworld)
+        return multiworld
+
+    def test_fixed_seeds(self) -> None:
+        """Tests that progression balancing places the same items as before for a set of fixed seeds"""
+        for (seed, progression_balancing), expected in self.expected_placements.items():
+            with self.subTest(seed=seed, progression_balancing=progression_balancing):
+                multiworld = self.generate_filled_multiworld(seed, progression_balancing)
+                balance_multiworld_progression(multiworld)
+                self.assertTrue(multiworld.can_beat_game())
+                placements = sorted((location.name, location.item.name)
+                                    for location in multiworld.get_filled_locations())
+                self.assertEqual(hashlib.sha256(repr(placements).encode()).hexdigest()[:16], expected)
@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+
+from BaseClasses import CollectionState, Location
+from Fill import distribute_items_restrictive
+from GenerationProfiler import GenerationProfiler, profile_section
+from worlds.AutoWorld import AutoWorldRegister, call_all
+from . import gen_steps, setup_multiworld
+
+
+class TestGenerationProfiler(unittest.TestCase):
+    def test_report(self) -> None:
+        """Ensure stages are recorded per world, and fill counts rule evaluations, sweeps and state copies."""
+        world_types = [AutoWorldRegister.world_types["A Link to the Past"], AutoWorldRegister.world_types["Lingo"]]
+        original_can_reach = Location.can_reach
+        original_copy = CollectionState.copy
+        with GenerationProfiler() as profiler:
+            multiworld = setup_multiworld(world_types, ())
+            for step in gen_steps:
+                call_all(multiworld, step)
+            with profile_section("fill"):
+                distribute_items_restrictive(multiworld)
+            self.assertIsNot(Location.can_reach, original_can_reach)
+        self.assertIs(Location.can_reach, original_can_reach)
+        self.assertIs(CollectionState.copy, original_copy)
+
+        set_rules = profiler.root.children["set_rules"]
+        self.assertEqual({section.player for section in set_rules.children.values()}, {1, 2})
+        self.assertEqual(set_rules.calls, 2)
+        fill = profiler.root.children["fill"]
+        self.assertEqual(fill.calls, 1)
+        self.assertGreater(fill.sweeps, 0)
+        self.assertGreater(fill.state_copies, 0)
+        self.assertEqual(set(fill.rule_evaluations), {1, 2})
+        self.assertLessEqual(fill.time, profiler.root.time)
+
+        report = profiler.to_dict(multiworld)
+        self.assertEqual(json.loads(json.dumps(report)), report)
+        self.assertEqual(report["worlds"]["2"]["game"], "Lingo")
+        self.assertGreater(report["worlds"]["1"]["rule_evaluations"], 0)
+        self.assertIn(["generation", "set_rules", "Player 2"], [section["path"] for section in report["sections"]])
+
+        for line in profiler.to_folded(multiworld):
+            stack, value = line.rsplit(" ", 1)
+            self.assertTrue(stack.startswith("generation"))
+            self.assertGreater(int(value), 0)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base_path = os.path.join(temp_dir, "profile")
+            profiler.write(multiworld, base_path)
+            self.assertTrue(os.path.isfile(f"{base_path}.json"))
+            self.assertTrue(os.path.isfile(f"{base_path}.folded"))
+
+    def test_inactive(self) -> None:
+        """Ensure sections do nothing when not profiling."""
+        with profile_section("fill", 1) as section:
+            self.assertIsNone(section)
@@ -0,0 +1,68 @@
+import itertools
+import unittest
+
+from BaseClasses import CollectionState, Item, ItemClassification, Location
+from worlds.generic.Rules import (And, CanReach, Call, Constant, Has, HasAll, HasAny, Or, StateMethod, UncompiledRule,
+                                  add_rule, as_rule, compile_rule, set_rule)
+from . import generate_test_multiworld
+
+
+class TestRules(unittest.TestCase):
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld()
+        self.location = Location(1, "Location", None, self.multiworld.get_region("Menu", 1))
+
+    def get_states(self) -> list[CollectionState]:
+        """Returns states with every combination of Key 0, Key 1 and two of Key 2."""
+        states = []
+        for keys in itertools.product((0, 1), (0, 1), (0, 1, 2)):
+            state = CollectionState(self.multiworld)
+            for index, count in enumerate(keys):
+                for _ in range(count):
+                    state.collect(Item(f"Key {index}", ItemClassification.progression, None, 1), True)
+            states.append(state)
+        return states
+
+    def test_combinations_flatten(self):
+        """Tests that combining rules of the same kind doesn't nest them."""
+        rule = Has("Key 0", 1) & Has("Key 1", 1) & (Has("Key 2", 1) | HasAny(("Key 0", "Key 1"), 1))
+        self.assertEqual(rule, And(Has("Key 0", 1), Has("Key 1", 1),
+                                   Or(Has("Key 2", 1), HasAny(["Key 0", "Key 1"], 1))))
+        self.assertEqual(len(rule.rules), 3)
+
+    def test_compiled_rules(self):
+        """Tests that compiled rules evaluate like the functions they replace."""
+        rules = [
+            (Constant(True), lambda state: True),
+            (Or(), lambda state: False),
+            (Has("Key 2", 1, 2), lambda state: state.has("Key 2", 1, 2)),
+            (HasAll(("Key 0", "Key 1"), 1), lambda state: state.has_all(("Key 0", "Key 1"), 1)),
+            (StateMethod("count", "Key 2", 1), lambda state: state.count("Key 2", 1)),
+            (CanReach("Menu", 1), lambda state: state.can_reach_region("Menu", 1)),
+            (Has("Key 0", 1) | Has("Key 1", 1) & Call(lambda state: state.has("Key 2", 1)),
+             lambda state: state.has("Key 0", 1) or state.has("Key 1", 1) and state.has("Key 2", 1)),
+        ]
+        for state in self.get_states():
+            for rule, function in rules:
+                with self.subTest(rule=rule):
+                    self.assertEqual(compile_rule(rule)(state), function(state))
+
+    def test_add_rule(self):
+        """Tests that add_rule merges the rules it combines into one rule, compiled on first evaluation."""
+        add_rule(self.location, Has("Key 0", 1))
+        add_rule(self.location, lambda state: state.has("Key 1", 1))
+        add_rule(self.location, Has("Key 2", 1), "or")
+        self.assertIsInstance(self.location.access_rule, UncompiledRule)
+        rule = as_rule(self.location.access_rule)
+        self.assertIsInstance(rule, Or)
+        self.assertIsInstance(rule.rules[1], And)
+
+        for state in self.get_states():
+            self.assertEqual(self.location.access_rule(state),
+                             state.has("Key 2", 1) or state.has("Key 1", 1) and state.has("Key 0", 1))
+        compiled = self.location.access_rule
+        self.assertNotIsInstance(compiled, UncompiledRule)
+        self.assertEqual(as_rule(compiled), rule)
+
+        set_rule(self.location, lambda state: False)
+        self.assertFalse(self.location.access_rule(CollectionState(self.multiworld)))
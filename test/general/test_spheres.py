@@ -0,0 +1,82 @@
+import unittest
+from collections import Counter
+
+from BaseClasses import CollectionState, Item, ItemClassification, Location, Region, SphereSearch
+from worlds.generic.Rules import set_rule
+from . import generate_test_multiworld
+
+
+class TestSphereSearch(unittest.TestCase):
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld()
+        menu = self.multiworld.get_region("Menu", 1)
+        locked = Region("Locked", 1, self.multiworld)
+        self.multiworld.regions.append(locked)
+        menu.connect(locked, rule=lambda state: state.has("Key 0", 1))
+        self.locations = {}
+        for address, (name, region, item_name) in enumerate((
+            ("A", menu, "Key 0"),
+            ("B", menu, "Key 2"),
+            ("C", menu, "Filler"),
+            ("D", locked, "Key 1"),
+            ("E", menu, "Event"),
+            ("F", menu, "Key 3"),
+        ), 1):
+            event = name == "E"
+            location = Location(1, name, None if event else address, region)
+            region.locations.append(location)
+            classification = ItemClassification.filler if item_name == "Filler" else ItemClassification.progression
+            self.multiworld.push_item(location, Item(item_name, classification, None if event else address, 1), False)
+            self.locations[name] = location
+        set_rule(self.locations["B"], lambda state: state.has("Key 1", 1))
+        set_rule(self.locations["C"], lambda state: state.has("Key 2", 1))
+        set_rule(self.locations["E"], lambda state: state.has("Key 1", 1))
+        set_rule(self.locations["F"], lambda state: state.has("Event", 1))
+        self.tests = Counter()
+        for location in self.locations.values():
+            rule = location.access_rule
+            location.access_rule = lambda state, rule=rule, name=location.name: \
+                self.tests.update((name,)) is None and rule(state)
+
+    def get_spheres(self, incremental: bool) -> list[set[str]]:
+        self.multiworld.worlds[1].incremental_reachability = incremental
+        return [{location.name for location in sphere} for sphere in self.multiworld.get_spheres()]
+
+    def test_spheres(self) -> None:
+        """Ensure spheres are the same with and without incremental reachability"""
+        for incremental in (False, True):
+            with self.subTest(incremental=incremental):
+                self.assertEqual(self.get_spheres(incremental), [{"A"}, {"D"}, {"B", "E"}, {"C", "F"}])
+
+    def test_only_reachable_locations_tested(self) -> None:
+        """Ensure locations wait for their region, and with incremental reachability for items their rule read"""
+        self.get_spheres(False)
+        self.assertEqual(self.tests, {"A": 1, "B": 3, "C": 4, "D": 1, "E": 3, "F": 4})
+        self.tests.clear()
+        self.get_spheres(True)
+        # tested again when Locked became reachable, then only once Key 1, Key 2 or Event were collected
+        self.assertEqual(self.tests, {"A": 1, "B": 3, "C": 3, "D": 1, "E": 3, "F": 3})
+
+    def test_unreachable(self) -> None:
+        """Ensure unreachable locations stay in remaining, after an empty sphere from get_spheres"""
+        set_rule(self.locations["D"], lambda state: False)
+        self.assertEqual(self.get_spheres(False), [{"A"}, set(), {"B", "C", "D", "E", "F"}])
+        search = SphereSearch(CollectionState(self.multiworld), self.multiworld.get_filled_locations())
+        self.assertEqual(len(list(search)), 1)
+        self.assertEqual(search.remaining, {location for name, location in self.locations.items() if name != "A"})
+
+    def test_sendable_spheres_shared(self) -> None:
+        """Ensure sendable spheres collect events right away, and are shared with the accessibility check"""
+        spheres = [{location.name for location in sphere} for sphere in self.multiworld.get_sendable_spheres()]
+        self.assertEqual(spheres, [{"A"}, {"D"}, {"B", "F"}, {"C"}])
+        self.assertTrue(self.multiworld.fulfills_accessibility())
+        self.assertEqual(self.tests["A"], 1)
+        self.assertEqual(list(self.multiworld.get_sendable_spheres())[0], {self.locations["A"]})
+        self.assertEqual(self.tests["A"], 1)
+
+        # placements changed, so spheres are searched again
+        item_a, item_c = self.locations["A"].item, self.locations["C"].item
+        self.locations["A"].item, self.locations["C"].item = item_c, item_a
+        self.assertEqual(list(self.multiworld.get_sendable_spheres()), [{self.locations["A"]}, set(),
+                                                                       {self.locations[name] for name in "BCDF"}])
+        self.assertEqual(self.tests["A"], 2)
@@ -0,0 +1,44 @@
+import unittest
+
+from worlds.generic.Rules import set_rule
+from . import generate_items, generate_locations, generate_test_multiworld
+
+
+class TestPlaythrough(unittest.TestCase):
+    def test_culls_unrequired_items(self) -> None:
+        """Tests that the playthrough only keeps the items required to beat the game, sphere by sphere"""
+        multiworld = generate_test_multiworld()
+        menu = multiworld.get_region("Menu", 1)
+        locations = generate_locations(5, 1, menu)
+        items = generate_items(5, 1, True)
+        for location, item in zip(locations, items):
+            multiworld.push_item(location, item, False)
+        set_rule(locations[1], lambda state: state.has(items[0].name, 1))
+        set_rule(locations[3], lambda state: state.has(items[2].name, 1))
+        multiworld.completion_condition[1] = lambda state: state.has_all((items[1].name, items[3].name), 1)
+
+        multiworld.spoiler.create_playthrough()
+
+        self.assertEqual(multiworld.spoiler.playthrough, {
+            "0": [],
+            "1": {str(locations[0]): str(items[0]), str(locations[2]): str(items[2])},
+            "2": {str(locations[1]): str(items[1]), str(locations[3]): str(items[3])},
+        })
+
+    def test_culls_large_sphere(self) -> None:
+        """Tests that culling a sphere keeps exactly one of two interchangeable items, and nothing unrequired"""
+        multiworld = generate_test_multiworld()
+        menu = multiworld.get_region("Menu", 1)
+        locations = generate_locations(20, 1, menu)
+        items = generate_items(20, 1, True)
+        for location, item in zip(locations, items):
+            multiworld.push_item(location, item, False)
+        multiworld.completion_condition[1] = lambda state: (state.has(items[5].name, 1)
+                                                            and state.has_any((items[8].name, items[17].name), 1))
+
+        multiworld.spoiler.create_playthrough()
+
+        kept = multiworld.spoiler.playthrough["1"]
+        self.assertEqual(len(kept), 2)
+        self.assertEqual(kept[str(locations[5])], str(items[5]))
+        self.assertTrue(str(locations[8]) in kept or str(locations[17]) in kept)
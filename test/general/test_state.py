@@ -1,7 +1,12 @@
+import pickle
+import threading
 import unittest
+from collections import Counter
 
+from BaseClasses import (CollectionState, CopyOnAccessDict, Item, ItemClassification, ItemCounter, ItemIndex,
+                         LayeredDict, Region)
 from worlds.AutoWorld import AutoWorldRegister, call_all
-from . import setup_solo_multiworld
+from . import generate_test_multiworld, setup_solo_multiworld
 
 
 class TestBase(unittest.TestCase):
@@ -27,3 +32,210 @@ class TestBase(unittest.TestCase):
                     with self.subTest("Step", step=step):
                         call_all(multiworld, step)
                         self.assertTrue(multiworld.get_all_state(False, allow_partial_entrances=True))
+
+
+class TestIncrementalReachability(unittest.TestCase):
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld()
+        menu = self.multiworld.get_region("Menu", 1)
+        regions = [Region(f"Region {i}", 1, self.multiworld) for i in range(8)]
+        self.multiworld.regions += regions
+        menu.connect(regions[0], rule=lambda state: state.has("Key 0", 1))
+        menu.connect(regions[1], rule=lambda state: state.has_all(("Key 0", "Key 1"), 1))
+        regions[0].connect(regions[2], rule=lambda state: state.count("Key 2", 1) >= 2)
+        regions[1].connect(regions[3])
+        regions[2].connect(regions[4], rule=lambda state: state.has_any(("Key 3", "Key 4"), 1))
+        # depends on the whole inventory
+        regions[3].connect(regions[5], rule=lambda state: len(state.prog_items[1]) >= 4)
+        # indirect condition on Region 4
+        indirect = menu.connect(regions[6], rule=lambda state: state.can_reach_region("Region 4", 1))
+        self.multiworld.register_indirect_condition(regions[4], indirect)
+        regions[6].connect(regions[7], rule=lambda state: "Key 5" in state.prog_items[1])
+        self.collection_order = ["Key 1", "Key 2", "Key 0", "Key 5", "Key 2", "Key 4"]
+
+    def get_states(self, incremental: bool) -> list[object]:
+        self.multiworld.worlds[1].incremental_reachability = incremental
+        state = CollectionState(self.multiworld)
+        results = []
+        for item_name in self.collection_order:
+            state.collect(Item(item_name, ItemClassification.progression, None, 1), True)
+            state.update_reachable_regions(1)
+            results.append(({region.name for region in state.reachable_regions[1]},
+                             {str(spot): path for spot, path in state.path.items()}))
+        results.append(state.copy())
+        return results
+
+    def test_same_as_full_rescan(self) -> None:
+        """Ensure incremental reachability finds the same regions and paths as re-testing all blocked entrances."""
+        full = self.get_states(False)
+        incremental = self.get_states(True)
+        self.assertEqual(full[:-1], incremental[:-1])
+        self.assertEqual(len(full[-2][0]), 9)
+        copied_state = incremental[-1]
+        self.assertTrue(copied_state.can_reach_region("Region 7", 1))
+
+    def test_only_dependent_entrances_retested(self) -> None:
+        """Ensure collecting an item only re-tests entrances whose rules read that item."""
+        self.multiworld.worlds[1].incremental_reachability = True
+        state = CollectionState(self.multiworld)
+        state.update_reachable_regions(1)
+        tested = []
+        for entrance in self.multiworld.get_entrances(1):
+            rule = entrance.access_rule
+            entrance.access_rule = lambda s, rule=rule, name=entrance.name: tested.append(name) or rule(s)
+        state.collect(Item("Key 9", ItemClassification.progression, None, 1), True)
+        state.update_reachable_regions(1)
+        self.assertEqual(tested, [])
+        state.collect(Item("Key 0", ItemClassification.progression, None, 1), True)
+        state.update_reachable_regions(1)
+        self.assertEqual(sorted(tested), ["Menu -> Region 0", "Menu -> Region 1", "Region 0 -> Region 2"])
+
+
+class TestStateCopy(unittest.TestCase):
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld(2)
+        for player in (1, 2):
+            menu = self.multiworld.get_region("Menu", player)
+            region = Region("Locked", player, self.multiworld)
+            self.multiworld.regions.append(region)
+            menu.connect(region, rule=lambda state, player=player: state.has("Key", player))
+
+    def collect_key(self, state: CollectionState, player: int) -> None:
+        state.collect(Item("Key", ItemClassification.progression, None, player), True)
+
+    def test_copies_are_independent(self) -> None:
+        """Ensure mutating a copied state, or the state it was copied from, doesn't leak into the other one."""
+        state = CollectionState(self.multiworld)
+        state.update_reachable_regions(1)
+        state.update_reachable_regions(2)
+        copied_state = state.copy()
+        self.collect_key(copied_state, 1)
+        self.assertTrue(copied_state.can_reach_region("Locked", 1))
+        self.assertFalse(state.can_reach_region("Locked", 1))
+        self.assertFalse(state.has("Key", 1))
+        self.assertNotIn(self.multiworld.get_region("Locked", 1), state.path)
+
+        self.collect_key(state, 2)
+        self.assertTrue(state.can_reach_region("Locked", 2))
+        self.assertFalse(copied_state.can_reach_region("Locked", 2))
+        self.assertEqual(copied_state.prog_items, {1: {"Key": 1}, 2: {}})
+        self.assertEqual(state.prog_items, {1: {}, 2: {"Key": 1}})
+
+    def test_unused_players_stay_shared(self) -> None:
+        """Ensure a copy only copies the per-player containers it mutates."""
+        state = CollectionState(self.multiworld)
+        state.update_reachable_regions(1)
+        state.update_reachable_regions(2)
+        copied_state = state.copy()
+        self.collect_key(copied_state, 1)
+        copied_state.update_reachable_regions(1)
+        self.assertIsNot(copied_state.reachable_regions[1], state.reachable_regions[1])
+        self.assertIs(copied_state.reachable_regions[2], state.reachable_regions[2])
+
+    def test_copy_of_copies_keeps_path(self) -> None:
+        """Ensure paths stay complete over long chains of copies."""
+        state = CollectionState(self.multiworld)
+        self.collect_key(state, 1)
+        state.update_reachable_regions(1)
+        for _ in range(20):
+            state = state.copy()
+        self.collect_key(state, 2)
+        state.update_reachable_regions(2)
+        locked_1 = self.multiworld.get_region("Locked", 1)
+        locked_2 = self.multiworld.get_region("Locked", 2)
+        self.assertEqual(state.path[locked_1], ("Locked", state.path.get(locked_1.entrances[0])))
+        self.assertIn(locked_2, state.path)
+        self.assertEqual(len(state.path), 4)
+
+    def test_share_keeps_shared_entries(self) -> None:
+        """Ensure sharing only moves the entries a dict owns, instead of copying or flattening the shared ones."""
+        copies = []
+        prog_items = CopyOnAccessDict({player: {} for player in range(5)},
+                                      lambda value: copies.append(value) or value.copy())
+        prog_items = prog_items.share()
+        prog_items[0]["Key"] = 1
+        prog_items = prog_items.share()
+        self.assertEqual(len(copies), 1)
+        self.assertEqual(prog_items[0], {"Key": 1})
+
+        path = LayeredDict({index: index for index in range(100)})
+        path = path.share()
+        for index in range(100, 110):
+            path[index] = index
+        path = path.share()
+        self.assertEqual([len(layer) for layer in path.layers], [100, 10])
+        self.assertEqual(len(path), 110)
+
+
+class TestItemCounter(unittest.TestCase):
+    def setUp(self) -> None:
+        self.multiworld = generate_test_multiworld()
+        self.multiworld.worlds[1].item_name_groups = {
+            "Keys": frozenset({"Key 0", "Key 1", "Key 2"}),
+            "Everything": frozenset({"Key 0", "Key 1", "Key 2", "Sword", "Shield"}),
+            "Empty": frozenset(),
+        }
+
+    def assert_same_as_counter(self, state: CollectionState) -> None:
+        counter_state = state.copy()
+        counter_state.prog_items[1] = Counter(state.prog_items[1])
+        for group in ("Keys", "Everything", "Empty"):
+            with self.subTest(group=group):
+                for count in range(4):
+                    self.assertEqual(counter_state.has_group(group, 1, count), state.has_group(group, 1, count))
+                    self.assertEqual(counter_state.has_group_unique(group, 1, count),
+                                     state.has_group_unique(group, 1, count))
+                self.assertEqual(counter_state.count_group(group, 1), state.count_group(group, 1))
+                self.assertEqual(counter_state.count_group_unique(group, 1), state.count_group_unique(group, 1))
+
+    def test_groups_same_as_counter(self) -> None:
+        """Ensure item group checks of ItemCounter match checking each item name of the group."""
+        state = CollectionState(self.multiworld)
+        self.assert_same_as_counter(state)
+        for item_name in ("Sword", "Key 1", "Key 1", "Key 2"):
+            state.collect(Item(item_name, ItemClassification.progression, None, 1), True)
+            self.assert_same_as_counter(state)
+        state.remove(Item("Key 1", ItemClassification.progression, None, 1))
+        self.assert_same_as_counter(state)
+        state.set_item("Key 2", 1, 0)
+        self.assert_same_as_counter(state)
+        state.prog_items[1].update({"Key 0": 2, "Shield": 1})
+        self.assert_same_as_counter(state)
+        state.prog_items[1]["Key 0"] -= 2
+        self.assert_same_as_counter(state)
+        state.prog_items[1].pop("Key 1")
+        self.assert_same_as_counter(state)
+        state.prog_items[1].clear()
+        self.assert_same_as_counter(state)
+
+    def test_copy(self) -> None:
+        """Ensure a copied ItemCounter keeps its item bits, and doesn't share them with the original."""
+        state = CollectionState(self.multiworld)
+        state.collect(Item("Key 0", ItemClassification.progression, None, 1), True)
+        copied_state = state.copy()
+        copied_state.collect(Item("Key 1", ItemClassification.progression, None, 1), True)
+        self.assertEqual(state.count_group_unique("Keys", 1), 1)
+        self.assertEqual(copied_state.count_group_unique("Keys", 1), 2)
+        self.assertIsInstance(copied_state.prog_items[1], ItemCounter)
+        self.assertEqual(pickle.loads(pickle.dumps(copied_state.prog_items[1])).mask, copied_state.prog_items[1].mask)
+
+    def test_bits_from_threads(self) -> None:
+        """Ensure names interned from several threads at once each get their own bit."""
+        index = ItemIndex()
+        index.group_mask("Odd", frozenset(f"Item {i}" for i in range(1, 400, 2)))
+        barrier = threading.Barrier(4)
+
+        def intern(offset: int) -> None:
+            barrier.wait()
+            for i in range(400):
+                index.bit(f"Item {(i + offset) % 400}")
+
+        threads = [threading.Thread(target=intern, args=(offset * 100,)) for offset in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(index.names), 400)
+        self.assertEqual(sorted(index.bits.values()), [1 << i for i in range(400)])
+        self.assertEqual(set(index.iter_names(index.group_mask("Odd", index.group_masks["Odd"][0]))),
+                         {f"Item {i}" for i in range(1, 400, 2)})
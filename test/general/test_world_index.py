@@ -0,0 +1,40 @@
+import unittest
+
+from worlds import world_index
+from worlds.AutoWorld import AutoWorldRegister, WorldTypes
+
+
+class TestWorldIndex(unittest.TestCase):
+    def test_index_matches_worlds(self) -> None:
+        """Test that what the world index knows about each game is what its world type has"""
+        for game, entry in world_index.items():
+            with self.subTest(game=game):
+                world_type = AutoWorldRegister.world_types[game]
+                self.assertEqual(entry["data_package"], world_type.get_data_package_data())
+                self.assertEqual(entry["world_version"], world_type.world_version.as_simple_string())
+                self.assertEqual(entry["settings_key"], world_type.settings_key)
+                self.assertEqual(frozenset(entry["hint_blacklist"]), world_type.hint_blacklist)
+
+    def test_lazy_world_types(self) -> None:
+        """Test that games known from the index are only loaded once they're used"""
+        world_types = WorldTypes()
+        loaded = []
+        registered = []
+
+        def load(game: str) -> None:
+            loaded.append(game)
+            world_types[game] = object  # type: ignore[assignment]
+
+        world_types.add_unloaded("Game 1", lambda: load("Game 1"), registered.append)
+        world_types.add_unloaded("Game 2", lambda: load("Game 2"), registered.append)
+
+        self.assertEqual(list(world_types), ["Game 1", "Game 2"])
+        self.assertEqual(len(world_types), 2)
+        self.assertEqual(loaded, [])
+        self.assertIn("Game 2", world_types)
+        self.assertNotIn("Game 3", world_types)
+        self.assertEqual(loaded, ["Game 2"])
+        self.assertEqual(registered, [object])
+        self.assertEqual(dict(world_types.items()), {"Game 1": object, "Game 2": object})
+        self.assertEqual(loaded, ["Game 2", "Game 1"])
+        self.assertEqual(len(world_types), 2)
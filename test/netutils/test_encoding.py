@@ -0,0 +1,49 @@
+# Tests for the JSON and binary encodings of network messages
+import unittest
+
+from NetUtils import (ClientStatus, NetworkItem, NetworkPlayer, NetworkSlot, SlotType, binary_encoding, decode,
+                      decode_frame, encode, encode_binary, is_empty_encoded_msgs, join_encoded_msgs, msgpack)
+from Utils import Version
+
+sample_msgs = [
+    {"cmd": "Connected", "team": 0, "slot": 1,
+     "players": [NetworkPlayer(0, 1, "Alias", "Player")],
+     "missing_locations": [1, 2, 3], "checked_locations": {4, 5},
+     "slot_info": {1: NetworkSlot("Player", "Game", SlotType.player),
+                   2: NetworkSlot("Group", "Game", SlotType.group, [1])},
+     "slot_data": {"nested": {"list": (1, 2.5, None, True), "text": "ü"}, 10: False}},
+    {"cmd": "ReceivedItems", "index": 0, "items": [NetworkItem(1, -2, 3), NetworkItem(2 ** 40, 2, 1, 0b101)]},
+    {"cmd": "StatusUpdate", "status": ClientStatus.CLIENT_GOAL},
+    {"cmd": "RoomInfo", "version": Version(0, 6, 1)},
+]
+
+
+@unittest.skipUnless(msgpack, "msgpack is not installed")
+class TestBinaryEncoding(unittest.TestCase):
+    def test_same_as_json(self) -> None:
+        """Test that messages decode to the same objects from the binary encoding as from JSON"""
+        self.assertEqual(binary_encoding, "msgpack")
+        binary = encode_binary(sample_msgs)
+        self.assertIsInstance(binary, bytes)
+        decoded = decode_frame(binary)
+        self.assertEqual(decoded, decode(encode(sample_msgs)))
+        self.assertIs(type(decoded[1]["items"][0]), NetworkItem)
+        self.assertIs(type(decoded[0]["slot_info"]["2"]), NetworkSlot)
+        self.assertIs(type(decoded[3]["version"]), Version)
+
+    def test_compact(self) -> None:
+        """Test that NetworkItems are sent as arrays of their fields, without their field names"""
+        items = [{"cmd": "ReceivedItems", "index": 0, "items": [NetworkItem(item, item, 1) for item in range(100)]}]
+        self.assertLess(len(encode_binary(items)), len(encode(items)) / 3)
+
+    def test_join(self) -> None:
+        """Test that encoded lists of messages are joined into one list, whatever their lengths"""
+        for lengths in ((1, 2), (10, 10), (0, 300), (70000, 1)):
+            with self.subTest(lengths=lengths):
+                parts = [[{"cmd": "Test", "part": part, "index": index} for index in range(length)]
+                         for part, length in enumerate(lengths)]
+                expected = [msg for part in parts for msg in part]
+                self.assertEqual(decode_frame(join_encoded_msgs([encode_binary(part) for part in parts])), expected)
+                self.assertEqual(decode_frame(join_encoded_msgs([encode(part) for part in parts])), expected)
+        self.assertTrue(is_empty_encoded_msgs(encode_binary([])))
+        self.assertFalse(is_empty_encoded_msgs(encode_binary([{}])))
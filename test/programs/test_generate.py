@@ -72,6 +72,16 @@ class TestGenerateMain(unittest.TestCase):
 
         self.assertOutput(self.output_tempdir.name)
 
+    def test_generate_batch(self):
+        args = Generate.mystery_argparse(['--seed', '0', '--batch', '2', '--jobs', '1',
+                                          '--player_files_path', str(self.abs_input_dir),
+                                          '--outputpath', self.output_tempdir.name])
+        print(f'Testing Generate.py batch mode in {os.getcwd()}')
+        failed = Generate.batch_main(args)
+
+        self.assertEqual(failed, [])
+        self.assertEqual(len(list(Path(self.output_tempdir.name).glob('*.zip'))), 2)
+
     def test_generate_yaml(self):
         # override host.yaml
         from settings import get_settings
@@ -108,6 +118,7 @@ class TestGenerateWeights(TestGenerateMain):
     # don't need to run these tests
     test_generate_absolute = None
     test_generate_relative = None
+    test_generate_batch = None
 
     def test_generate_yaml(self):
         from settings import get_settings
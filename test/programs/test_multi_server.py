@@ -1,5 +1,21 @@
+import asyncio
+import copy
+import json
+import logging
+import os
+import random
+import tempfile
+import typing
 import unittest
-from MultiServer import Context, ServerCommandProcessor
+from unittest import mock
+
+from typing_extensions import override
+
+from MultiServer import (Client, Context, ServerCommandProcessor, coalesce_encoded_msgs, collect_hints,
+                         process_client_cmd, register_location_checks, send_items_to, send_new_items)
+from NetUtils import (ClientStatus, Endpoint, Hint, MultiData, NetworkItem, NetworkSlot, SlotType, binary_encoding,
+                      decode_frame)
+from Utils import get_intended_text, version_tuple
 
 
 class TestResolvePlayerName(unittest.TestCase):
@@ -38,3 +54,331 @@ class TestResolvePlayerName(unittest.TestCase):
         assert p.resolve_player("ABC") == (1, 2, "abc"), "case insensitive resolves when 1 match"
         assert p.resolve_player("abcd") == (1, 3, "abCD"), "case insensitive resolves when 1 match"
         assert not p.resolve_player("aB"), "partial name shouldn't resolve to player"
+
+
+class TestSaveJournal(unittest.TestCase):
+    @override
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.save_filename = os.path.join(self.temp_dir.name, "test.apsave")
+        self.ctx = self.make_context()
+
+    @override
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def make_context(self) -> Context:
+        ctx = Context("", 0, "", "", 0, 0, False)
+        ctx.connect_names = {"Player1": (0, 1), "Player2": (0, 2)}
+        ctx.save_filename = self.save_filename
+        ctx.saving = True
+        return ctx
+
+    def load(self) -> Context:
+        ctx = self.make_context()
+        with mock.patch.object(Context, "_start_async_saving"):
+            ctx.init_save()
+        return ctx
+
+    def play(self, start: int, count: int) -> None:
+        for location in range(start, start + count):
+            item = NetworkItem(location, location, 1, 0)
+            self.ctx.received_items.setdefault((0, 2, True), []).append(item)
+            self.ctx.location_checks[0, 1].add(location)
+        self.ctx.hints[0, 1].add(Hint(2, 1, start + count, 1, False))
+        self.ctx.stored_data[f"key{start}"] = start
+        self.ctx.changed_stored_data_keys.add(f"key{start}")
+        self.ctx.client_game_state[0, 1] = ClientStatus.CLIENT_PLAYING
+
+    def test_journal_replay(self) -> None:
+        """Test that loading a snapshot and its journal results in the same save as the context that wrote them"""
+        self.play(0, 100)
+        self.assertTrue(self.ctx.save(now=True))
+        snapshot_size = os.path.getsize(self.save_filename)
+        self.play(100, 10)
+        self.ctx.stored_data["key0"] = "changed"
+        self.ctx.changed_stored_data_keys.add("key0")
+        self.assertTrue(self.ctx.save(now=True))
+        self.play(110, 10)
+        self.ctx.client_game_state[0, 2] = ClientStatus.CLIENT_GOAL
+        with mock.patch.object(Context, "get_save", side_effect=AssertionError("journal records build a snapshot")):
+            self.assertTrue(self.ctx.save(now=True))
+
+        self.assertEqual(os.path.getsize(self.save_filename), snapshot_size, "Expected saves to be journaled")
+        self.assertLess(os.path.getsize(self.ctx.save_journal_filename), snapshot_size)
+        self.assertEqual(self.load().get_save(), self.ctx.get_save())
+
+    def test_compaction(self) -> None:
+        """Test that a snapshot is written once the journal outgrows it, and that older journals aren't replayed"""
+        self.play(0, 10)
+        self.assertTrue(self.ctx.save(now=True))
+        for start in range(10, 1000, 10):
+            self.play(start, 10)
+            self.assertTrue(self.ctx.save(now=True))
+            self.assertLessEqual(self.ctx.save_journal_size, 2 * self.ctx.save_snapshot_size)
+        self.assertGreater(self.ctx.save_generation, 1)
+        self.assertEqual(self.load().get_save(), self.ctx.get_save())
+
+        self.play(1000, 10)
+        self.assertTrue(self.ctx._save(exit_save=True))  # pyright: ignore[reportPrivateUsage]
+        self.assertEqual(os.path.getsize(self.ctx.save_journal_filename), 0)
+        self.assertEqual(self.load().get_save(), self.ctx.get_save())
+
+    def test_interrupted_journal(self) -> None:
+        """Test that an incomplete last journal record is skipped"""
+        self.play(0, 10)
+        self.assertTrue(self.ctx.save(now=True))
+        self.play(10, 10)
+        self.assertTrue(self.ctx.save(now=True))
+        expected = copy.deepcopy(self.ctx.get_save())
+        self.play(20, 10)
+        self.assertTrue(self.ctx.save(now=True))
+        with open(self.ctx.save_journal_filename, "r+b") as f:
+            f.truncate(os.path.getsize(self.ctx.save_journal_filename) - 10)
+
+        with self.assertLogs(level="WARNING"):
+            loaded = self.load()
+        self.assertEqual(loaded.get_save(), expected)
+
+
+class FakeSocket:
+    def __init__(self) -> None:
+        self.open = True
+        self.transport = mock.Mock()
+        self.transport.get_write_buffer_size.return_value = 0
+
+
+class TestOutbound(unittest.IsolatedAsyncioTestCase):
+    def test_coalesce(self) -> None:
+        """Test that encoded message lists are joined up to the frame size, keeping their order"""
+        msgs: typing.List[str | bytes] = [json.dumps([{"cmd": "PrintJSON", "text": str(number)}])
+                                          for number in range(10)]
+        frames = list(coalesce_encoded_msgs(msgs + ["[]"], 3 * len(msgs[0])))
+        self.assertEqual(len(frames), 4)
+        self.assertEqual([msg for frame in frames for msg in json.loads(frame)],
+                         [msg for msgs in msgs for msg in json.loads(msgs)])
+        self.assertIs(next(coalesce_encoded_msgs(msgs[:1], 0)), msgs[0])
+
+    async def test_flush(self) -> None:
+        """Test that queued messages are sent once per endpoint, and held back for endpoints that are slow"""
+        ctx = Context("", 0, "", "", 0, 0, False)
+        slow_socket = FakeSocket()
+        fast, other, slow = Endpoint(FakeSocket()), Endpoint(FakeSocket()), Endpoint(slow_socket)
+        slow_socket.transport.get_write_buffer_size.return_value = ctx.outbound_write_limit + 1
+        with mock.patch("MultiServer.websockets.broadcast") as broadcast:
+            ctx.queue_msgs(fast, [{"cmd": "First"}])
+            ctx.queue_encoded_msgs((fast, other, slow), ctx.dumper([{"cmd": "Second"}]))
+            await asyncio.sleep(0)
+            self.assertEqual(len(broadcast.call_args_list), 2)
+            frames = {frame: sockets for (sockets, frame), _ in broadcast.call_args_list}
+            self.assertEqual(frames, {'[{"cmd":"First"},{"cmd":"Second"}]': [fast.socket],
+                                      '[{"cmd":"Second"}]': [other.socket]})
+
+            broadcast.reset_mock()
+            slow_socket.transport.get_write_buffer_size.return_value = 0
+            await asyncio.sleep(ctx.outbound_retry_delay * 2)
+            broadcast.assert_called_once_with([slow.socket], '[{"cmd":"Second"}]')
+
+    @unittest.skipUnless(binary_encoding, "msgpack is not installed")
+    async def test_flush_binary(self) -> None:
+        """Test that endpoints using the binary encoding get the same messages in binary frames"""
+        ctx = Context("", 0, "", "", 0, 0, False)
+        assert binary_encoding
+        text, binary = Endpoint(FakeSocket()), Endpoint(FakeSocket())
+        binary.encoding = binary_encoding
+        with mock.patch("MultiServer.websockets.broadcast") as broadcast:
+            ctx.broadcast((text, binary), [{"cmd": "First", "items": [NetworkItem(1, 2, 3)]}])
+            ctx.queue_encoded_msgs((text, binary), ctx.dumper([{"cmd": "Second"}]))
+            await asyncio.sleep(0)
+            frames = {sockets[0]: frame for (sockets, frame), _ in broadcast.call_args_list}
+            self.assertIsInstance(frames[text.socket], str)
+            self.assertIsInstance(frames[binary.socket], bytes)
+            self.assertEqual(decode_frame(frames[binary.socket]), decode_frame(frames[text.socket]))
+
+
+class TestSendNewItems(unittest.TestCase):
+    def test_only_receivers(self) -> None:
+        """Test that new items are sent to the clients of the receiving slots and group members only"""
+        ctx = Context("", 0, "", "", 0, 0, False)
+        ctx.groups = {4: {1, 2}}
+        ctx.start_inventory = {1: [NetworkItem(10, -2, 0)]}
+        ctx.clients = {0: {slot: [] for slot in range(1, 5)}}
+        clients: typing.Dict[int, Client] = {}
+        for slot in range(1, 4):
+            client = clients[slot] = Client(FakeSocket(), ctx)  # type: ignore[arg-type]
+            client.team, client.slot, client.items_handling = 0, slot, 0b111
+            ctx.clients[0][slot].append(client)
+
+        with mock.patch.object(ctx, "queue_msgs") as queue_msgs:
+            send_items_to(ctx, 0, 4, NetworkItem(1, 1, 3, 0))
+            send_new_items(ctx)
+            sent = {client.slot: msgs for (client, msgs), _ in queue_msgs.call_args_list}
+            self.assertEqual(sent, {
+                1: [{"cmd": "ReceivedItems", "index": 0, "items": [NetworkItem(10, -2, 0), NetworkItem(1, 1, 3, 0)]}],
+                2: [{"cmd": "ReceivedItems", "index": 0, "items": [NetworkItem(1, 1, 3, 0)]}],
+            })
+
+            queue_msgs.reset_mock()
+            send_items_to(ctx, 0, 1, NetworkItem(2, 2, 3, 0))
+            send_new_items(ctx)
+            queue_msgs.assert_called_once_with(clients[1], [
+                {"cmd": "ReceivedItems", "index": 2, "items": [NetworkItem(2, 2, 3, 0)]}])
+
+            queue_msgs.reset_mock()
+            send_new_items(ctx)
+            queue_msgs.assert_not_called()
+
+
+class TestHintIndex(unittest.TestCase):
+    """Test that the indexed hint lookups behave the same as going through all hints and locations"""
+    players = 8
+    items = 20
+    locations = 50
+
+    def make_context(self) -> Context:
+        rng = random.Random(0)
+        slots = range(1, self.players + 1)
+        group = self.players + 1
+        ctx = Context("", 0, "", "", 0, 0, False, logger=logging.getLogger("TestHintIndex"))
+        ctx.logger.disabled = True
+        slot_info = {slot: NetworkSlot(f"Player{slot}", "Archipelago", SlotType.player) for slot in slots}
+        slot_info[group] = NetworkSlot("Group", "Archipelago", SlotType.group, (1, 2, 3))
+        multidata: MultiData = {
+            "minimum_versions": {"server": version_tuple, "clients": {}},
+            "version": version_tuple,
+            "slot_info": slot_info,
+            "seed_name": "Test",
+            "connect_names": {f"Player{slot}": (0, slot) for slot in slots},
+            "locations": {slot: {location: (rng.randrange(self.items), rng.randint(1, group), rng.randrange(8))
+                                 for location in range(slot * 1000, slot * 1000 + self.locations)}
+                          for slot in slots},
+            "checks_in_area": {},
+            "server_options": {},
+            "slot_data": {},
+            "er_hint_data": {},
+            "precollected_items": {},
+            "precollected_hints": {1: {Hint(1, 2, 2000, 0, False)}, 2: {Hint(1, 2, 2000, 0, False)}},
+            "tags": [],
+            "spheres": [],
+            "datapackage": {},
+            "race_mode": 0,
+        }
+        ctx._load(multidata, {}, False)  # pyright: ignore[reportPrivateUsage]
+        return ctx
+
+    def test_find_item(self) -> None:
+        ctx = self.make_context()
+        for slots in ({1}, {4}, {1, 9}, {2, 3, 9}):
+            for item in range(self.items):
+                with self.subTest(slots=slots, item=item):
+                    self.assertEqual(ctx.find_item(slots, item), list(ctx.locations.find_item(slots, item)))
+
+    def test_hints(self) -> None:
+        """Test that hints and hint updates are the same as with rechecking all hints of a slot after checks"""
+        ctx = self.make_context()
+        expected_ctx = self.make_context()
+        rng = random.Random(0)
+
+        def recheck_all_hints(team: typing.Optional[int] = None, slot: typing.Optional[int] = None,
+                              changed: typing.Optional[typing.Set[typing.Tuple[int, int]]] = None,
+                              locations: typing.Optional[typing.Iterable[int]] = None) -> None:
+            Context.recheck_hints(expected_ctx, team, slot, changed)
+
+        patcher = mock.patch.object(expected_ctx, "recheck_hints", recheck_all_hints)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for step in range(200):
+            slot = rng.randint(1, self.players)
+            if rng.random() < 0.3:
+                item = rng.randrange(self.items)
+                hints = collect_hints(ctx, 0, slot, item)
+                self.assertEqual(hints, collect_hints(expected_ctx, 0, slot, item))
+                ctx.notify_hints(0, hints)
+                expected_ctx.notify_hints(0, hints)
+            else:
+                locations = rng.sample(range(slot * 1000, slot * 1000 + self.locations), 3)
+                with mock.patch.object(ctx, "on_changed_hints") as changed, \
+                        mock.patch.object(expected_ctx, "on_changed_hints") as expected_changed:
+                    register_location_checks(ctx, 0, slot, locations)
+                    register_location_checks(expected_ctx, 0, slot, locations)
+                self.assertEqual(sorted(changed.call_args_list), sorted(expected_changed.call_args_list))
+            self.assertEqual(ctx.hints, expected_ctx.hints, f"step {step}")
+            for (team, finding_player), hints in ctx.hints.items():
+                for hint in hints:
+                    if hint.finding_player == finding_player:
+                        self.assertEqual(ctx.get_hint(team, finding_player, hint.location), hint)
+
+    def test_intended_name(self) -> None:
+        ctx = Context("", 0, "", "", 0, 0, False)
+        names = {"Sword", "Shield", "Bow", "Arrow", "Arrows", "bow", "Magic Powder", "Bombs"}
+        ctx.all_item_and_group_names["Test"] = names
+        for text in ("Sword", "sword", "SWORD", "Bow", "BOW", "bow", "Arrow", "arrows", "Swrod", "Magic", "Bombs",
+                     "bombs", "Nothing"):
+            with self.subTest(text=text):
+                self.assertEqual(ctx.get_intended_name(text, "Test", False), get_intended_text(text, names))
+
+
+class TestDataStorage(unittest.IsolatedAsyncioTestCase):
+    @override
+    def setUp(self) -> None:
+        self.ctx = Context("", 0, "", "", 0, 0, False)
+        self.ctx.clients = {0: {1: [], 2: []}}
+        self.clients: typing.List[Client] = []
+        for slot in (1, 2):
+            client = Client(FakeSocket(), self.ctx)  # type: ignore[arg-type]
+            client.team, client.slot, client.auth = 0, slot, True
+            self.ctx.clients[0][slot].append(client)
+            self.ctx.endpoints.append(client)
+            self.clients.append(client)
+
+    async def set(self, client: Client, key: str, *operations: typing.Dict[str, typing.Any], default: object = 0,
+                  want_reply: bool = False) -> typing.List[typing.Tuple[typing.Set[Endpoint],
+                                                                      typing.List[typing.Dict[str, typing.Any]]]]:
+        """Processes a Set from client and returns what was sent to whom"""
+        with mock.patch.object(self.ctx, "broadcast") as broadcast, \
+                mock.patch.object(self.ctx, "send_msgs") as send_msgs:
+            await process_client_cmd(self.ctx, client, {"cmd": "Set", "key": key, "default": default,
+                                                        "want_reply": want_reply, "operations": list(operations)})
+        return [(set(endpoints), msgs) for (endpoints, msgs), _ in broadcast.call_args_list] + \
+            [({endpoint}, msgs) for (endpoint, msgs), _ in send_msgs.call_args_list]
+
+    async def test_notify(self) -> None:
+        """Test that a Set is sent to the subscribers of its key, and to its sender if it wants a reply"""
+        subscriber, other = self.clients
+        await process_client_cmd(self.ctx, subscriber, {"cmd": "SetNotify", "keys": ["key"]})
+        sent = await self.set(other, "key", {"operation": "add", "value": [1]}, default=[], want_reply=True)
+        self.assertEqual(len(sent), 1)
+        self.assertEqual(sent[0][0], {subscriber, other})
+        self.assertEqual(sent[0][1][0]["original_value"], [])
+        self.assertEqual(sent[0][1][0]["value"], [1])
+        self.assertEqual(await self.set(other, "other", {"operation": "add", "value": 1}), [])
+
+        with mock.patch("MultiServer.on_client_disconnected"):
+            await self.ctx.disconnect(subscriber)
+        self.assertEqual(self.ctx.stored_data_notification_clients, {})
+
+    async def test_original_value(self) -> None:
+        """Test that operations that modify containers in place still reply with the value before them"""
+        client = self.clients[0]
+        await self.set(client, "key", {"operation": "replace", "value": {"a": 1}})
+        sent = await self.set(client, "key", {"operation": "update", "value": {"b": 2}}, want_reply=True)
+        self.assertEqual(sent[0][1][0]["original_value"], {"a": 1})
+        self.assertEqual(self.ctx.stored_data["key"], {"a": 1, "b": 2})
+
+    async def test_quotas(self) -> None:
+        """Test that Sets exceeding the quotas are refused and leave the data storage as it was"""
+        client = self.clients[0]
+        self.ctx.stored_data_max_keys = 2
+        self.ctx.stored_data_max_length = 3
+        await self.set(client, "key1", {"operation": "replace", "value": [1, 2]})
+        await self.set(client, "key2", {"operation": "replace", "value": 1})
+        sent = await self.set(client, "key3", {"operation": "replace", "value": 1})
+        self.assertEqual(sent[0][1][0]["cmd"], "InvalidPacket")
+        self.assertNotIn("key3", self.ctx.stored_data)
+
+        sent = await self.set(client, "key1", {"operation": "update", "value": [3, 4]}, want_reply=True)
+        self.assertEqual(sent[0][1][0]["cmd"], "InvalidPacket")
+        self.assertEqual(self.ctx.stored_data["key1"], [1, 2])
+        sent = await self.set(client, "key1", {"operation": "update", "value": [3]}, want_reply=True)
+        self.assertEqual(sent[0][1][0]["cmd"], "SetReply")
+        self.assertEqual(self.ctx.stored_data["key1"], [1, 2, 3])
@@ -0,0 +1,43 @@
+# Tests for the data package cache in Utils.py
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from Utils import (data_package_from_buffer, data_package_to_bytes, load_data_package_for_checksum,
+                   store_data_package_for_checksum)
+
+sample_data = {
+    "item_name_groups": {"Everything": ["Sword", "Shield"], "Other": ["Sword", "Not an item"]},
+    "item_name_to_id": {"Sword": 1, "Shield": 2, "Ünicode": 3},
+    "location_name_groups": {},
+    "location_name_to_id": {"Chest": -1, "Big Chest": 1 << 40},
+    "checksum": "0123456789abcdef",
+}
+
+
+class TestPackedDataPackage(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        """Test that a packed data package unpacks to the same data, including empty tables"""
+        self.assertEqual(data_package_from_buffer(data_package_to_bytes(sample_data)), sample_data)
+        empty = {"item_name_to_id": {}, "location_name_to_id": {}, "checksum": "0"}
+        self.assertEqual(data_package_from_buffer(data_package_to_bytes(empty)), empty)
+
+    def test_null_names(self) -> None:
+        """Test that names that can't be packed are refused, and that such data packages are still cached"""
+        data = {**sample_data, "item_name_to_id": {"Sw\0rd": 1}}
+        with self.assertRaises(ValueError):
+            data_package_to_bytes(data)
+        with tempfile.TemporaryDirectory() as cache, mock.patch("Utils.cache_path",
+                                                               lambda *path: os.path.join(cache, *path)):
+            store_data_package_for_checksum("Game", data)
+            self.assertEqual(load_data_package_for_checksum("Game", data["checksum"]), data)
+
+    def test_cache(self) -> None:
+        """Test that a stored data package is loaded from its packed cache file"""
+        with tempfile.TemporaryDirectory() as cache, mock.patch("Utils.cache_path",
+                                                               lambda *path: os.path.join(cache, *path)):
+            store_data_package_for_checksum("Game", sample_data)
+            self.assertEqual(os.listdir(os.path.join(cache, "datapackage", "Game")), ["0123456789abcdef.apdp"])
+            self.assertEqual(load_data_package_for_checksum("Game", sample_data["checksum"]), sample_data)
@@ -0,0 +1,46 @@
+# Tests for streamed restricted pickles in Utils.py
+
+import io
+import pickle
+import unittest
+import zlib
+from unittest import mock
+
+from NetUtils import Hint, NetworkItem
+from Utils import ZlibReader, ZlibWriter, restricted_dump, restricted_load, restricted_loads
+
+
+class Forbidden:
+    pass
+
+
+class TestRestrictedPickle(unittest.TestCase):
+    data = {
+        "locations": {player: {address: (address, player, 0) for address in range(1000)} for player in range(1, 10)},
+        "items": [NetworkItem(1, 2, 3, 0)],
+        "hints": {1: {Hint(1, 2, 3, 4, False)}},
+    }
+
+    def test_streamed_round_trip(self) -> None:
+        """Test that streamed, compressed pickles load the same, whether read as a whole or chunk by chunk"""
+        file = io.BytesIO()
+        with ZlibWriter(file, 9) as compressed:
+            restricted_dump(self.data, compressed)
+        self.assertEqual(restricted_loads(zlib.decompress(file.getvalue())), self.data)
+
+        file.seek(0)
+        with mock.patch.object(ZlibReader, "chunk_size", 100):
+            self.assertEqual(restricted_load(io.BufferedReader(ZlibReader(file))), self.data)
+
+    def test_truncated(self) -> None:
+        """Test that reading a stream that is cut off fails instead of returning partial data"""
+        data = zlib.compress(pickle.dumps(self.data))
+        with self.assertRaises(zlib.error):
+            restricted_load(io.BufferedReader(ZlibReader(io.BytesIO(data[:len(data) // 2]))))
+
+    def test_forbidden(self) -> None:
+        """Test that objects which can't be loaded by restricted_load can't be dumped either"""
+        with self.assertRaises(pickle.PicklingError):
+            restricted_dump({"forbidden": [Forbidden()]}, io.BytesIO())
+        with self.assertRaises(pickle.PicklingError):
+            restricted_dump(print, io.BytesIO())
@@ -0,0 +1,24 @@
+import zlib
+
+from Utils import data_package_from_buffer
+
+from . import TestBase
+
+
+class TestDataPackage(TestBase):
+    def test_packed(self) -> None:
+        """Test that the packed data package of a checksum unpacks to its data package, and is cacheable"""
+        from worlds import network_data_package
+        game_data = network_data_package["games"]["Archipelago"]
+        checksum = game_data["checksum"]
+        response = self.client.get(f"/api/datapackage/{checksum}/packed")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data_package_from_buffer(zlib.decompress(response.data)), game_data)
+        self.assertIn("immutable", response.headers["Cache-Control"])
+
+        response = self.client.get(f"/api/datapackage/{checksum}/packed", headers={"If-None-Match": f'"{checksum}"'})
+        self.assertEqual(response.status_code, 304)
+
+    def test_packed_unknown(self) -> None:
+        """Test that an unknown checksum is not found"""
+        self.assertEqual(self.client.get("/api/datapackage/unknown/packed").status_code, 404)
@@ -0,0 +1,31 @@
+import unittest
+
+from WebHostLib.notifier import Notifier, QueueNotifier, UDPNotifier
+
+
+class TestNotifier(unittest.TestCase):
+    def check_notifier(self, notifier: Notifier) -> None:
+        with notifier.listen("autohost") as autohost, notifier.listen("autogen") as autogen:
+            self.assertEqual(autohost.get(timeout=0), [])
+            notifier.notify("autohost", "room 1")
+            notifier.notify("autohost", "command 1")
+            notifier.notify("autogen", "generation")
+            self.assertEqual(autohost.get(timeout=1), ["room 1", "command 1"])
+            self.assertEqual(autohost.get(timeout=0), [])
+            self.assertEqual(autogen.get(timeout=1), ["generation"])
+
+    def test_queue(self) -> None:
+        """Test that notifications within a process arrive on their channel"""
+        self.check_notifier(QueueNotifier())
+
+    def test_udp(self) -> None:
+        """Test that notifications through UDP arrive on their channel"""
+        notifier = UDPNotifier("127.0.0.1", 0)
+        self.addCleanup(notifier.close)
+        self.check_notifier(notifier)
+
+    def test_udp_without_listener(self) -> None:
+        """Test that notifying a channel nobody listens to is not an error"""
+        notifier = UDPNotifier("127.0.0.1", 1)
+        self.addCleanup(notifier.close)
+        notifier.notify("autogen", "generation")
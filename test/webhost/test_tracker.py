@@ -103,3 +103,26 @@ class TestTracker(TestBase):
                 self.assertEqual(response.status_code, 200)
             with self.client.open(url_for("api.tracker_slot_data", tracker=self.tracker_uuid)) as response:
                 self.assertEqual(response.status_code, 200)
+
+    def test_tracker_data_cache(self) -> None:
+        """Verify that tracker data is shared between requests until the room saved"""
+        import datetime
+        from pony.orm import db_session
+        from WebHostLib.models import Room
+        from WebHostLib.tracker import TrackerData, _NameLookup
+
+        with db_session:
+            room = Room.get(id=self.room_id)
+            first, second = TrackerData(room), TrackerData(room)
+            self.assertIs(first._multidata, second._multidata)
+            self.assertIs(first._multisave, second._multisave)
+            first_names, second_names = first.item_id_to_name["Archipelago"], second.item_id_to_name["Archipelago"]
+            assert isinstance(first_names, _NameLookup) and isinstance(second_names, _NameLookup)
+            self.assertIs(first_names.names, second_names.names)
+            self.assertEqual(first_names[-1234], "Unknown Item (ID: -1234)")
+            self.assertNotIn(-1234, second_names, "Expected unknown ids to not be added to the shared table")
+            self.assertEqual(first.get_player_checked_locations(0, 1), set())
+
+            room.multisave = pickle.dumps({"location_checks": {(0, 1): {1}}})
+            room.last_activity = datetime.datetime.utcnow() + datetime.timedelta(seconds=1)
+            self.assertEqual(TrackerData(room).get_player_checked_locations(0, 1), {1})
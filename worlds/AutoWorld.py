@@ -7,11 +7,12 @@ import sys
 import time
 from random import Random
 from dataclasses import make_dataclass
-from typing import (Any, Callable, ClassVar, Dict, FrozenSet, Iterable, List, Mapping, Optional, Set, TextIO, Tuple,
-                    TYPE_CHECKING, Type, Union)
+from typing import (Any, Callable, ClassVar, Dict, FrozenSet, Iterable, Iterator, ItemsView, KeysView, List, Mapping,
+                    Optional, Set, TextIO, Tuple, TYPE_CHECKING, Type, Union, ValuesView)
 
 from Options import item_and_loc_options, ItemsAccessibility, OptionGroup, PerGameCommonOptions
 from BaseClasses import CollectionState
+from GenerationProfiler import profile_section
 from Utils import Version
 
 if TYPE_CHECKING:
@@ -26,8 +27,77 @@ class InvalidItemError(KeyError):
     pass
 
 
+class WorldTypes(Dict[str, Type["World"]]):
+    """
+    World types by game. Games known from the world index are only imported once they're used: when looking them up,
+    checking if they're contained, or iterating the values or items. Iterating the game names imports nothing.
+    """
+    unloaded: Dict[str, Callable[[], Any]]
+    """imports the world of the game, which registers it, for games that are known but not imported yet"""
+    on_register: Dict[str, Callable[[Type[World]], None]]
+    """called with the world type when a game of `unloaded` registers"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.unloaded = {}
+        self.on_register = {}
+
+    def add_unloaded(self, game: str, load: Callable[[], Any], on_register: Callable[[Type[World]], None]) -> None:
+        self.unloaded[game] = load
+        self.on_register[game] = on_register
+
+    def load(self, game: str) -> None:
+        """Import the world of `game` if it's known but not imported yet."""
+        load = self.unloaded.pop(game, None)
+        if load:
+            load()
+
+    def load_all(self) -> None:
+        while self.unloaded:
+            self.load(next(iter(self.unloaded)))
+
+    def __setitem__(self, game: str, world_type: Type[World]) -> None:
+        super().__setitem__(game, world_type)
+        self.unloaded.pop(game, None)
+        on_register = self.on_register.pop(game, None)
+        if on_register:
+            on_register(world_type)
+
+    def __getitem__(self, game: str) -> Type[World]:
+        if game in self.unloaded:
+            self.load(game)
+        return super().__getitem__(game)
+
+    def get(self, game: str, default: Any = None) -> Any:
+        if game in self.unloaded:
+            self.load(game)
+        return super().get(game, default)
+
+    def __contains__(self, game: object) -> bool:
+        if game in self.unloaded:
+            self.load(game)  # type: ignore[arg-type]
+        return super().__contains__(game)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([*super().keys(), *self.unloaded])
+
+    def __len__(self) -> int:
+        return super().__len__() + len(self.unloaded)
+
+    def keys(self) -> KeysView[str]:  # type: ignore[override]
+        return KeysView(self)
+
+    def values(self) -> ValuesView[Type[World]]:  # type: ignore[override]
+        self.load_all()
+        return super().values()
+
+    def items(self) -> ItemsView[str, Type[World]]:  # type: ignore[override]
+        self.load_all()
+        return super().items()
+
+
 class AutoWorldRegister(type):
-    world_types: Dict[str, Type[World]] = {}
+    world_types: Dict[str, Type[World]] = WorldTypes()
     __file__: str
     zip_path: Optional[str]
     settings_key: str
@@ -88,7 +158,8 @@ class AutoWorldRegister(type):
         new_class = super().__new__(mcs, name, bases, dct)
         new_class.__file__ = sys.modules[new_class.__module__].__file__
         if "game" in dct:
-            if dct["game"] in AutoWorldRegister.world_types:
+            # only registered games count, without importing games that are known but not imported yet
+            if dict.__contains__(AutoWorldRegister.world_types, dct["game"]):
                 raise RuntimeError(f"""Game {dct["game"]} already registered in 
                 {AutoWorldRegister.world_types[dct["game"]].__file__} when attempting to register from
                 {new_class.__file__}.""")
@@ -165,7 +236,8 @@ class WebWorldRegister(type):
 def _timed_call(method: Callable[..., Any], *args: Any,
                 multiworld: Optional["MultiWorld"] = None, player: Optional[int] = None) -> Any:
     start = time.perf_counter()
-    ret = method(*args)
+    with profile_section(method.__name__ if player else method.__qualname__, player):
+        ret = method(*args)
     taken = time.perf_counter() - start
     if taken > 1.0:
         if player and multiworld:
@@ -318,6 +390,15 @@ class World(metaclass=AutoWorldRegister):
     If False, everything is rechecked at every step, which is slower computationally, 
     but may be desirable in complex/dynamic worlds."""
 
+    incremental_reachability: bool = False
+    """If True, collecting an item only re-tests the blocked entrances whose access rules read that item name when they
+    last failed, instead of re-testing every blocked entrance. Only used together with explicit_indirect_conditions.
+    Entrance rules then may only depend on this player's items, read through the CollectionState API, and on regions
+    registered with MultiWorld.register_indirect_condition(). Items have to be added to state through
+    CollectionState.add_item or CollectionState.set_item, which the default World.collect does.
+    Sphere searches, see BaseClasses.SphereSearch, then also only re-test a location once an item name its rule read
+    was collected or this player reached new regions, so location rules may only depend on the same things."""
+
     multiworld: "MultiWorld"
     """autoset on creation. The MultiWorld object for the currently generating multiworld."""
     player: int
@@ -62,6 +62,10 @@ class AutoPatchRegister(abc.ABCMeta):
     @staticmethod
     def get_handler(file: str) -> Optional[AutoPatchRegister]:
         _, suffix = os.path.splitext(file)
+        if suffix not in AutoPatchRegister.file_endings:
+            # patch containers register when their world is imported
+            from worlds import load_all_worlds
+            load_all_worlds()
         return AutoPatchRegister.file_endings.get(suffix, None)
 
 
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 import importlib
 import importlib.abc
 import importlib.machinery
@@ -10,11 +12,14 @@ import dataclasses
 import json
 from pathlib import Path
 from types import ModuleType
-from typing import List, Sequence
+from typing import Dict, List, Optional, Sequence, Type, TypedDict, TYPE_CHECKING
 from zipfile import BadZipFile
 
-from NetUtils import DataPackage
-from Utils import local_path, user_path, Version, version_tuple, tuplize_version, messagebox
+from NetUtils import DataPackage, GamesPackage
+from Utils import __version__, cache_path, local_path, user_path, Version, version_tuple, tuplize_version, messagebox
+
+if TYPE_CHECKING:
+    from .AutoWorld import World
 
 local_folder = os.path.dirname(__file__)
 user_folder = user_path("worlds") if user_path() != local_path() else user_path("custom_worlds")
@@ -30,12 +35,36 @@ __all__ = [
     "local_folder",
     "user_folder",
     "failed_world_loads",
+    "world_index",
+    "load_all_worlds",
 ]
 
 
 failed_world_loads: List[str] = []
 
 
+class WorldIndexEntry(TypedDict):
+    """What is known about a game without importing its world."""
+    source: str
+    """resolved path of the world source that registers the game"""
+    world_version: str
+    settings_key: str
+    settings: Optional[str]
+    """module and name of the world type, if it defines settings"""
+    hint_blacklist: List[str]
+    data_package: GamesPackage
+
+
+world_index: Dict[str, WorldIndexEntry] = {}
+"""
+Every known game. On startup, it's read from the world index file in the cache, so worlds only have to be imported
+once they're used. If the index is missing or any world source changed, every world is imported and the index is
+written again.
+"""
+world_index_path = cache_path("world_index.json")
+world_index_format = 1
+
+
 @dataclasses.dataclass(order=True)
 class WorldSource:
     path: str  # typically relative path from this module
@@ -91,20 +120,111 @@ for folder in (folder for folder in (user_folder, local_folder) if folder):
             elif entry.is_file() and entry.name.endswith(".apworld"):
                 world_sources.append(WorldSource(file_name, is_zip=True, relative=relative))
 
+
+def _source_fingerprint(world_source: WorldSource) -> List[int]:
+    """Changes whenever a file of the world source is added, removed or modified."""
+    if world_source.is_zip:
+        stat = os.stat(world_source.resolved_path)
+        return [1, stat.st_size, stat.st_mtime_ns]
+    count = size = modified = 0
+    for dirpath, dirnames, filenames in os.walk(world_source.resolved_path):
+        dirnames[:] = [dirname for dirname in dirnames if dirname != "__pycache__"]
+        for file in filenames:
+            stat = os.stat(os.path.join(dirpath, file))
+            count += 1
+            size += stat.st_size
+            modified = max(modified, stat.st_mtime_ns)
+    return [count, size, modified]
+
+
+def _read_world_index() -> Dict[str, List[str]]:
+    """
+    Reads the world index into world_index, if it is up to date with the world sources.
+    Returns the games of each loose world source that can be imported once it's used.
+    """
+    try:
+        with open(world_index_path, encoding="utf-8") as index_file:
+            index = json.load(index_file)
+    except (OSError, ValueError):
+        return {}
+    sources: Dict[str, Dict] = index.get("sources", {})
+    if index.get("format") != world_index_format or index.get("version") != __version__ \
+            or set(sources) != {world_source.resolved_path for world_source in world_sources}:
+        return {}
+    for world_source in world_sources:
+        if sources[world_source.resolved_path]["fingerprint"] != _source_fingerprint(world_source):
+            return {}
+    world_index.update(index["games"])
+    # sources that failed to import or didn't register a game are imported on startup, to report or fix them
+    return {path: source["games"] for path, source in sources.items() if source["games"]}
+
+
+def _write_world_index() -> None:
+    sources: Dict[str, Dict] = {
+        world_source.resolved_path: {"fingerprint": _source_fingerprint(world_source), "games": []}
+        for world_source in world_sources
+    }
+    for game, entry in world_index.items():
+        if entry["source"] in sources:
+            sources[entry["source"]]["games"].append(game)
+    try:
+        os.makedirs(os.path.dirname(world_index_path), exist_ok=True)
+        with open(world_index_path, "w", encoding="utf-8") as index_file:
+            json.dump({"format": world_index_format, "version": __version__, "sources": sources,
+                       "games": world_index}, index_file)
+    except OSError as e:
+        logging.debug(f"Could not write world index: {e}")
+
+
+def _index_entry(world_type: Type[World]) -> WorldIndexEntry:
+    settings_annotation = world_type.__annotations__.get("settings", None)
+    has_settings = settings_annotation is not None and settings_annotation != "ClassVar[Optional['Group']]"
+    return {
+        "source": next((world_source.resolved_path for world_source in world_sources
+                        if world_type.__module__.split(".")[:2] == ["worlds", Path(world_source.path).stem]), ""),
+        "world_version": world_type.world_version.as_simple_string(),
+        "settings_key": world_type.settings_key,
+        "settings": f"{world_type.__module__}.{world_type.__name__}" if has_settings else None,
+        "hint_blacklist": sorted(world_type.hint_blacklist),
+        "data_package": world_type.get_data_package_data(),
+    }
+
+
+def _register_indexed_world(world_type: Type[World]) -> None:
+    entry = world_index[world_type.game]
+    world_type.world_version = tuplize_version(entry["world_version"])
+    # some worlds build their ids in hash seed dependent order, so the checksum is only stable within a process
+    data_package = world_type.get_data_package_data()
+    if data_package["checksum"] != entry["data_package"]["checksum"]:
+        entry["data_package"] = network_data_package["games"][world_type.game] = data_package
+
+
+def load_all_worlds() -> None:
+    """Imports every world that is known but not imported yet, for anything that needs all of them registered."""
+    if isinstance(AutoWorldRegister.world_types, WorldTypes):
+        AutoWorldRegister.world_types.load_all()
+
+
+from .AutoWorld import AutoWorldRegister, WorldTypes
+
 # import all submodules to trigger AutoWorldRegister
 world_sources.sort()
+indexed_sources = _read_world_index()
 apworlds: list[WorldSource] = []
 for world_source in world_sources:
     # load all loose files first:
     if world_source.is_zip:
         apworlds.append(world_source)
+    elif world_source.resolved_path in indexed_sources:
+        # imported once one of its games is used
+        assert isinstance(AutoWorldRegister.world_types, WorldTypes)
+        for game in indexed_sources[world_source.resolved_path]:
+            AutoWorldRegister.world_types.add_unloaded(game, world_source.load, _register_indexed_world)
     else:
         world_source.load()
 
-from .AutoWorld import AutoWorldRegister
-
 for world_source in world_sources:
-    if not world_source.is_zip:
+    if not world_source.is_zip and world_source.resolved_path not in indexed_sources:
         # look for manifest
         manifest = {}
         for dirpath, dirnames, filenames in os.walk(world_source.resolved_path):
@@ -204,8 +324,16 @@ if apworlds:
 
 del apworlds
 
+# index the games that were imported
+for game in AutoWorldRegister.world_types:
+    if game not in world_index:
+        world_index[game] = _index_entry(AutoWorldRegister.world_types[game])
+if not indexed_sources:
+    _write_world_index()
+del indexed_sources
+
 # Build the data package for each game.
 network_data_package: DataPackage = {
-    "games": {world_name: world.get_data_package_data() for world_name, world in AutoWorldRegister.world_types.items()},
+    "games": {world_name: entry["data_package"] for world_name, entry in world_index.items()},
 }
 
@@ -1,5 +1,7 @@
 import collections
+import dataclasses
 import logging
+import types
 import typing
 
 from BaseClasses import LocationProgressType, MultiWorld, Location, Region, Entrance
@@ -96,20 +98,250 @@ def exclusion_rules(multiworld: MultiWorld, player: int, exclude_locations: typi
                 logging.warning(f"Unable to exclude location {loc_name} in player {player}'s world.")
 
 
-def set_rule(spot: typing.Union["BaseClasses.Location", "BaseClasses.Entrance"], rule: CollectionRule):
-    spot.access_rule = rule
+class Rule:
+    """
+    Base of composable access rules. Instead of nesting a function per condition, rules are built as a tree of nodes,
+    like `Has("Hookshot", player) & CanReach("Castle", player)`, that compile_rule flattens into a single function.
+    set_rule and add_rule compile rules on their own, and add_rule merges the rules it combines into one function.
+    Rules are immutable and compare by value.
+    """
+    __slots__ = ()
+
+    def __and__(self, other: "Rule") -> "Rule":
+        return And(self, other)
+
+    def __or__(self, other: "Rule") -> "Rule":
+        return Or(self, other)
+
+    def source(self, compiler: "RuleCompiler") -> str:
+        """Returns a Python expression that evaluates this rule for `state`."""
+        raise NotImplementedError
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Constant(Rule):
+    value: typing.Any
+
+    def source(self, compiler: "RuleCompiler") -> str:
+        return repr(self.value) if self.value is True or self.value is False else compiler.constant(self.value)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Has(Rule):
+    item: str
+    player: int
+    count: int = 1
+
+    def source(self, compiler: "RuleCompiler") -> str:
+        # what CollectionState.has does, without a call
+        return (f"state.prog_items[{compiler.constant(self.player)}].get({compiler.constant(self.item)}, 0) "
+                f">= {compiler.constant(self.count)}")
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class HasAll(Rule):
+    items: typing.Tuple[str, ...]
+    player: int
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "items", tuple(self.items))
+
+    def source(self, compiler: "RuleCompiler") -> str:
+        return f"state.has_all({compiler.constant(self.items)}, {compiler.constant(self.player)})"
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class HasAny(Rule):
+    items: typing.Tuple[str, ...]
+    player: int
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "items", tuple(self.items))
+
+    def source(self, compiler: "RuleCompiler") -> str:
+        return f"state.has_any({compiler.constant(self.items)}, {compiler.constant(self.player)})"
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CanReach(Rule):
+    spot: str
+    player: int
+    resolution_hint: typing.Literal["Region", "Location", "Entrance"] = "Region"
+
+    def source(self, compiler: "RuleCompiler") -> str:
+        method = {"Region": "can_reach_region", "Location": "can_reach_location",
+                  "Entrance": "can_reach_entrance"}[self.resolution_hint]
+        return f"state.{method}({compiler.constant(self.spot)}, {compiler.constant(self.player)})"
+
+
+@dataclasses.dataclass(frozen=True, slots=True, init=False)
+class StateMethod(Rule):
+    """Calls a method of CollectionState, like the ones worlds add through a LogicMixin, with constant arguments."""
+    name: str
+    args: typing.Tuple[typing.Any, ...]
+    kwargs: typing.Tuple[typing.Tuple[str, typing.Any], ...]
+
+    def __init__(self, name: str, *args: typing.Any, **kwargs: typing.Any) -> None:
+        if not name.isidentifier():
+            raise ValueError(f"{name!r} is not a method name.")
+        object.__setattr__(self, "name", name)
+        object.__setattr__(self, "args", args)
+        object.__setattr__(self, "kwargs", tuple(kwargs.items()))
+
+    def source(self, compiler: "RuleCompiler") -> str:
+        arguments = [compiler.constant(arg) for arg in self.args]
+        arguments += [f"{key}={compiler.constant(value)}" for key, value in self.kwargs]
+        return f"state.{self.name}({', '.join(arguments)})"
+
 
+@dataclasses.dataclass(frozen=True, slots=True)
+class Call(Rule):
+    """Calls any CollectionRule, so functions can be part of a rule."""
+    function: CollectionRule
 
-def add_rule(spot: typing.Union["BaseClasses.Location", "BaseClasses.Entrance"], rule: CollectionRule, combine="and"):
+    def source(self, compiler: "RuleCompiler") -> str:
+        return f"{compiler.constant(self.function)}(state)"
+
+
+@dataclasses.dataclass(frozen=True, slots=True, init=False)
+class _Combination(Rule):
+    rules: typing.Tuple[Rule, ...]
+
+    operator: typing.ClassVar[str]
+    empty: typing.ClassVar[str]
+    """source of the combination of no rules"""
+
+    def __init__(self, *rules: Rule) -> None:
+        flattened: typing.List[Rule] = []
+        for rule in rules:
+            if type(rule) is type(self):
+                flattened += rule.rules
+            else:
+                flattened.append(rule)
+        object.__setattr__(self, "rules", tuple(flattened))
+
+    def source(self, compiler: "RuleCompiler") -> str:
+        if not self.rules:
+            return self.empty
+        return f"({f' {self.operator} '.join(rule.source(compiler) for rule in self.rules)})"
+
+
+@dataclasses.dataclass(frozen=True, slots=True, init=False)
+class And(_Combination):
+    operator = "and"
+    empty = "True"
+
+
+@dataclasses.dataclass(frozen=True, slots=True, init=False)
+class Or(_Combination):
+    operator = "or"
+    empty = "False"
+
+
+class RuleCompiler:
+    """
+    Turns a Rule into a function. Values are handed to the function as closure variables, so rules of the same shape
+    share their compiled code.
+    """
+    __slots__ = ("values",)
+
+    values: typing.List[typing.Any]
+
+    factories: typing.ClassVar[typing.Dict[str, typing.Callable[..., CollectionRule]]] = {}
+    """rule source -> function that creates the function of a rule from its values"""
+    codes: typing.ClassVar[typing.Set[types.CodeType]] = set()
+    """code of all compiled functions, which know the rule they were compiled from as their `rule` attribute"""
+
+    def __init__(self) -> None:
+        self.values = []
+
+    def constant(self, value: typing.Any) -> str:
+        """Returns the name the compiled function finds value under."""
+        self.values.append(value)
+        return f"_{len(self.values) - 1}"
+
+    def compile(self, rule: Rule) -> CollectionRule:
+        source = rule.source(self)
+        factory = self.factories.get(source)
+        if factory is None:
+            parameters = ", ".join(f"_{index}" for index in range(len(self.values)))
+            namespace: typing.Dict[str, typing.Any] = {}
+            exec(compile(f"def make_access_rule({parameters}):\n"
+                         f"    def access_rule(state):\n"
+                         f"        return {source}\n"
+                         f"    return access_rule\n", "<compiled rule>", "exec"), namespace)
+            factory = self.factories[source] = namespace["make_access_rule"]
+            function = factory(*self.values)
+            self.codes.add(function.__code__)
+        else:
+            function = factory(*self.values)
+        # kept on the function instead of a mapping, as the rule may reference the function through its spot
+        function.rule = rule
+        return function
+
+
+def compile_rule(rule: Rule) -> CollectionRule:
+    """Compiles rule into a single function of the state."""
+    return RuleCompiler().compile(rule)
+
+
+def as_rule(rule: typing.Union[Rule, CollectionRule]) -> Rule:
+    """Returns rule as a Rule, recovering the rule a function was compiled from."""
+    if isinstance(rule, Rule):
+        return rule
+    if type(rule) is UncompiledRule:
+        return rule.rule
+    if type(rule) is types.FunctionType and rule.__code__ in RuleCompiler.codes:
+        return rule.rule
+    return Call(rule)
+
+
+class UncompiledRule:
+    """
+    Stands in for the access rule of spot until it's first evaluated, then compiles rule and takes its place, so a
+    chain of add_rule calls only compiles once.
+    """
+    __slots__ = ("spot", "rule", "compiled")
+
+    spot: typing.Union["BaseClasses.Location", "BaseClasses.Entrance"]
+    rule: Rule
+    compiled: typing.Optional[CollectionRule]
+
+    def __init__(self, spot: typing.Union["BaseClasses.Location", "BaseClasses.Entrance"], rule: Rule) -> None:
+        self.spot = spot
+        self.rule = rule
+        self.compiled = None
+
+    def __call__(self, state: "BaseClasses.CollectionState") -> bool:
+        compiled = self.compiled
+        if compiled is None:
+            compiled = self.compiled = compile_rule(self.rule)
+            if self.spot.access_rule is self:
+                self.spot.access_rule = compiled
+        return compiled(state)
+
+
+def set_rule(spot: typing.Union["BaseClasses.Location", "BaseClasses.Entrance"],
+             rule: typing.Union[Rule, CollectionRule]):
+    if isinstance(rule, Rule):
+        spot.access_rule = UncompiledRule(spot, rule)
+    else:
+        spot.access_rule = rule
+
+
+def add_rule(spot: typing.Union["BaseClasses.Location", "BaseClasses.Entrance"],
+             rule: typing.Union[Rule, CollectionRule], combine="and"):
     old_rule = spot.access_rule
     # empty rule, replace instead of add
     if old_rule is Location.access_rule or old_rule is Entrance.access_rule:
-        spot.access_rule = rule if combine == "and" else old_rule
+        if combine == "and":
+            set_rule(spot, rule)
     else:
+        # one flat function, instead of a closure around the previous rule for each added rule
         if combine == "and":
-            spot.access_rule = lambda state: rule(state) and old_rule(state)
+            spot.access_rule = UncompiledRule(spot, And(as_rule(rule), as_rule(old_rule)))
         else:
-            spot.access_rule = lambda state: rule(state) or old_rule(state)
+            spot.access_rule = UncompiledRule(spot, Or(as_rule(rule), as_rule(old_rule)))
 
 
 def forbid_item(location: "BaseClasses.Location", item: str, player: int):
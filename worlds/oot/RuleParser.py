@@ -10,7 +10,7 @@ from .Regions import TimeOfDay, OOTRegion
 from BaseClasses import CollectionState as State
 from .Utils import data_path, read_json
 
-from worlds.generic.Rules import set_rule
+from worlds.generic.Rules import set_rule, compile_rule, And, Call, Constant, Has, HasAll, HasAny, Or, StateMethod
 
 
 escaped_items = {}
@@ -403,28 +403,69 @@ class Rule_AST_Transformer(ast.NodeTransformer):
     def make_access_rule(self, body):
         rule_str = ast.dump(body, False)
         if rule_str not in self.rule_cache:
-            # requires consistent iteration on dicts
-            kwargs = [ast.arg(arg=k) for k in self.kwarg_defaults.keys()]
-            kwd = list(map(ast.Constant, self.kwarg_defaults.values()))
-            try:
-                self.rule_cache[rule_str] = eval(compile(
-                    ast.fix_missing_locations(
-                        ast.Expression(ast.Lambda(
-                            args=ast.arguments(
-                                posonlyargs=[],
-                                args=[ast.arg(arg='state')],
-                                defaults=[],
-                                kwonlyargs=kwargs,
-                                kw_defaults=kwd),
-                            body=body))),
-                    '<string>', 'eval'),
-                    # globals/locals. if undefined, everything in the namespace *now* would be allowed
-                    allowed_globals)
-            except TypeError as e:
-                raise Exception('Parse Error: %s' % e, self.current_spot.name, ast.dump(body, False))
+            self.rule_cache[rule_str] = compile_rule(self.make_rule(body))
         return self.rule_cache[rule_str]
 
 
+    # Turns the transformed ast into a Rule, so that each access rule compiles into a single function
+    # with its item checks inlined.
+    def make_rule(self, node):
+        if isinstance(node, ast.BoolOp):
+            rules = [self.make_rule(value) for value in node.values]
+            return And(*rules) if isinstance(node.op, ast.And) else Or(*rules)
+        if isinstance(node, ast.Constant):
+            return Constant(node.value)
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and isinstance(node.func.value, ast.Name) and node.func.value.id == 'state'):
+            try:
+                args = [self.make_argument(arg) for arg in node.args]
+                kwargs = {keyword.arg: self.make_argument(keyword.value) for keyword in node.keywords}
+            except (NameError, TypeError):
+                pass
+            else:
+                name = node.func.attr
+                if name == 'has' and not kwargs:
+                    return Has(*args)
+                if name == 'has_all' and len(args) == 2 and not kwargs:
+                    return HasAll(*args)
+                if name == 'has_any' and len(args) == 2 and not kwargs:
+                    return HasAny(*args)
+                return StateMethod(name, *args, **kwargs)
+        # anything else, like comparisons of settings, keeps a function of its own
+        return Call(self.make_lambda(node))
+
+
+    # Evaluates an argument of a State method call. Raises NameError if it depends on the state,
+    # and TypeError if it's mutable, as the value is shared by all evaluations.
+    def make_argument(self, node):
+        value = eval(compile(ast.fix_missing_locations(ast.Expression(node)), '<string>', 'eval'),
+                     allowed_globals, self.kwarg_defaults)
+        hash(value)
+        return value
+
+
+    def make_lambda(self, body):
+        # requires consistent iteration on dicts
+        kwargs = [ast.arg(arg=k) for k in self.kwarg_defaults.keys()]
+        kwd = list(map(ast.Constant, self.kwarg_defaults.values()))
+        try:
+            return eval(compile(
+                ast.fix_missing_locations(
+                    ast.Expression(ast.Lambda(
+                        args=ast.arguments(
+                            posonlyargs=[],
+                            args=[ast.arg(arg='state')],
+                            defaults=[],
+                            kwonlyargs=kwargs,
+                            kw_defaults=kwd),
+                        body=body))),
+                '<string>', 'eval'),
+                # globals/locals. if undefined, everything in the namespace *now* would be allowed
+                allowed_globals)
+        except TypeError as e:
+            raise Exception('Parse Error: %s' % e, self.current_spot.name, ast.dump(body, False))
+
+
     ## Handlers for specific internal functions used in the json logic.
 
     # at(region_name, rule)